@@ -6,23 +6,34 @@ Pipeline: PDF/Image → OCR → Text Simplification → Text-to-Speech
 import streamlit as st
 import sys
 import os
+import hashlib
 from pathlib import Path
 import logging
+import time
 from io import BytesIO
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
+from modules.confidence_gate import estimate_time_saved, gate_results
+from modules.model_registry import get_model_registry
 from modules.ocr_extractor import OCRExtractor
+from modules.ocr_cache import OCRCache
+from modules.ocr_profiles import OCR_PROFILES, load_profile_benchmarks
+from modules.pdf_document import parse_page_range
+from modules.simplification_cache import SimplificationCache
 from modules.text_simplifier import TextSimplifier
 from modules.text_simplifier import TextSimplifier
 from modules.text_to_speech import TextToSpeech
-from config import OCR_CONFIG
+from config import OCR_CONFIG, PERFORMANCE_CONFIG, SIMPLIFICATION_CONFIG
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Loaded models are shared by every session and rerun in this process
+get_model_registry().set_budget(PERFORMANCE_CONFIG["model_memory_mb"])
+
 # Page configuration
 st.set_page_config(
     page_title="Reading Aid for Dyslexic People",
@@ -53,6 +64,26 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
+@st.cache_resource
+def get_ocr_cache():
+    """One OCR result cache shared by every session in this process"""
+    if not OCR_CONFIG["cache_enabled"]:
+        return None
+    return OCRCache(OCR_CONFIG["cache_path"], max_size_mb=OCR_CONFIG["cache_max_mb"])
+
+
+@st.cache_resource
+def get_simplification_cache():
+    """One cache of simplified sentences shared by every session in this process"""
+    if not SIMPLIFICATION_CONFIG["cache_enabled"]:
+        return None
+    return SimplificationCache(
+        SIMPLIFICATION_CONFIG["cache_path"],
+        max_size_mb=SIMPLIFICATION_CONFIG["cache_max_mb"],
+        memory_entries=SIMPLIFICATION_CONFIG["cache_memory_entries"],
+    )
+
+
 # Initialize session state
 if 'extracted_text' not in st.session_state:
     st.session_state.extracted_text = ""
@@ -62,6 +93,60 @@ if 'reading_level' not in st.session_state:
     st.session_state.reading_level = None
 if 'tts_engine' not in st.session_state:
     st.session_state.tts_engine = None
+if 'ocr_gate' not in st.session_state:
+    # OCR text split into what goes to the models and what was too unreliable
+    st.session_state.ocr_gate = None
+
+
+def model_input_text() -> str:
+    """The extracted text minus OCR lines left out by the confidence gate"""
+    if st.session_state.ocr_gate is not None:
+        return st.session_state.ocr_gate["text"]
+    return st.session_state.extracted_text
+
+
+def gate_ocr_results(results):
+    """Run the confidence gate over fresh OCR results"""
+    if OCR_CONFIG["min_line_confidence"] is None:
+        st.session_state.ocr_gate = None
+        return
+    st.session_state.ocr_gate = gate_results(
+        results, OCR_CONFIG["min_line_confidence"], OCR_CONFIG["min_page_confidence"]
+    )
+
+
+def save_upload(uploaded_file):
+    """
+    Save an uploaded file under a name derived from its contents
+    
+    Uploads with the same name but different contents (an edited file,
+    another session's "scan.pdf") get files of their own, and a saved file
+    is never rewritten while a background extraction may be reading it.
+    
+    The script reruns every few seconds while a progressive extraction
+    runs, so the saved file is remembered per upload (Streamlit's file_id)
+    and the contents are only hashed when a new file arrives.
+    
+    Returns:
+        Tuple of (path, content hash)
+    """
+    saved = st.session_state.get("saved_upload")
+    if saved is not None and saved["file_id"] == uploaded_file.file_id and saved["path"].exists():
+        return saved["path"], saved["digest"]
+    
+    data = uploaded_file.getbuffer()
+    digest = hashlib.sha256(data).hexdigest()
+    upload_dir = Path("uploads")
+    upload_dir.mkdir(exist_ok=True)
+    path = upload_dir / f"{digest[:32]}{Path(uploaded_file.name).suffix.lower()}"
+    if not path.exists():
+        # Write under a private name first so nobody sees a partial file
+        partial = path.with_name(f"{path.name}.{os.getpid()}.{time.monotonic_ns()}.part")
+        with open(partial, "wb") as f:
+            f.write(data)
+        os.replace(partial, path)
+    st.session_state.saved_upload = {"file_id": uploaded_file.file_id, "path": path, "digest": digest}
+    return path, digest
 
 # Sidebar configuration
 with st.sidebar:
@@ -97,6 +182,25 @@ with st.sidebar:
         help="Select preferred voice"
     )
     
+    # OCR settings
+    st.subheader("Text Extraction Settings")
+    profile_names = list(OCR_PROFILES) + ["custom"]
+    ocr_profile = st.selectbox(
+        "OCR Speed:",
+        options=profile_names,
+        index=profile_names.index(OCR_CONFIG["profile"]),
+        help="fast: kiosks and clean pages. accurate: exam papers and poor scans. custom: settings from config.py"
+    )
+    if ocr_profile in OCR_PROFILES:
+        profile_note = OCR_PROFILES[ocr_profile]["description"]
+        measured = load_profile_benchmarks(OCR_CONFIG["profile_benchmark_path"]).get(ocr_profile)
+        if measured:
+            profile_note += (
+                f" — {measured['pages_per_minute']:.0f} pages/min, "
+                f"{measured['accuracy']:.1%} accuracy on the test corpus"
+            )
+        st.caption(profile_note)
+    
     # Simplification settings
     st.subheader("Simplification Settings")
     target_reading_level = st.selectbox(
@@ -162,7 +266,41 @@ with tab1:
         st.info("💡 Tip: Use high-quality images for better text extraction")
     
     # Initialize OCR extractor
-    ocr = OCRExtractor(tesseract_path=OCR_CONFIG["tesseract_path"])
+    ocr_settings = dict(
+        tesseract_path=OCR_CONFIG["tesseract_path"],
+        num_workers=OCR_CONFIG["num_workers"],
+        tesseract_threads=OCR_CONFIG["tesseract_threads"],
+        batch_size=OCR_CONFIG["batch_size"],
+        target_x_height=OCR_CONFIG["target_x_height"],
+        tile_megapixels=OCR_CONFIG["tile_megapixels"],
+        worker_transport=OCR_CONFIG["worker_transport"],
+        duplicate_distance=OCR_CONFIG["duplicate_distance"],
+        native_images=OCR_CONFIG["native_images"],
+        use_text_layer=OCR_CONFIG["use_text_layer"],
+        min_text_layer_chars=OCR_CONFIG["min_text_layer_chars"],
+        min_confidence=OCR_CONFIG["min_confidence"],
+        tesseract_transport=OCR_CONFIG["tesseract_transport"],
+        skip_non_text=OCR_CONFIG["skip_non_text"],
+        max_rss_mb=OCR_CONFIG["max_rss_mb"],
+        line_confidence=OCR_CONFIG["min_line_confidence"] is not None,
+        checkpoint_dir=OCR_CONFIG["checkpoint_dir"],
+        cache=get_ocr_cache()
+    )
+    if ocr_profile == "custom":
+        ocr = OCRExtractor(
+            lang="+".join(OCR_CONFIG["languages"]),
+            dpi=OCR_CONFIG["pdf_dpi"],
+            draft_dpi=OCR_CONFIG["pdf_draft_dpi"],
+            preprocessing=OCR_CONFIG["preprocessing"] if OCR_CONFIG["enable_preprocessing"] else None,
+            **ocr_settings
+        )
+    else:
+        ocr = OCRExtractor.from_profile(
+            ocr_profile,
+            languages=OCR_CONFIG["languages"],
+            tessdata_dirs=OCR_CONFIG["tessdata_dirs"],
+            **ocr_settings
+        )
     
     if input_method == "Upload PDF":
         st.subheader("Upload PDF File")
@@ -171,22 +309,93 @@ with tab1:
         if pdf_file is not None:
             with st.spinner("📄 Extracting text from PDF..."):
                 try:
-                    # Save uploaded file temporarily
-                    temp_path = Path("uploads") / pdf_file.name
-                    Path("uploads").mkdir(exist_ok=True)
-                    with open(temp_path, "wb") as f:
-                        f.write(pdf_file.getbuffer())
+                    temp_path, content_hash = save_upload(pdf_file)
+                    
+                    # Keep one lazy document per upload (and OCR profile) so
+                    # pages extracted on earlier reruns are not extracted again
+                    document_id = (content_hash, ocr_profile)
+                    if st.session_state.get("pdf_document_id") != document_id:
+                        st.session_state.pdf_document = ocr.open_pdf(str(temp_path))
+                        st.session_state.pdf_document_id = document_id
+                        st.session_state.pdf_pages_shown = OCR_CONFIG["initial_pages"]
+                    document = st.session_state.pdf_document
                     
-                    # Extract text
-                    st.session_state.extracted_text = ocr.extract_from_pdf(str(temp_path))
-                    st.success("✅ Text extracted successfully!")
+                    page_range = st.text_input(
+                        f"Pages to read (1-{len(document)}, e.g. 1-3, 7; leave empty to read from the start)",
+                        key="pdf_page_range"
+                    )
+                    if page_range.strip():
+                        pages = parse_page_range(page_range, len(document))
+                    else:
+                        pages = range(min(st.session_state.pdf_pages_shown, len(document)))
+                    
+                    progressive = None
+                    if OCR_CONFIG["progressive"]:
+                        # Show a quick preview now; a background pass improves it
+                        progressive_id = (document_id, tuple(pages))
+                        if st.session_state.get("pdf_progressive_id") != progressive_id:
+                            if st.session_state.get("pdf_progressive") is not None:
+                                st.session_state.pdf_progressive.cancel()
+                            st.session_state.pdf_progressive = ocr.extract_progressive(
+                                str(temp_path), pages=pages, preview_dpi=OCR_CONFIG["preview_dpi"]
+                            )
+                            st.session_state.pdf_progressive_id = progressive_id
+                        progressive = st.session_state.pdf_progressive
+                        # Wait for the first page so there is something to show
+                        seen_version = progressive.wait_for_update(0)
+                        if progressive.error is not None:
+                            raise progressive.error
+                        page_results = progressive.results()
+                        st.session_state.extracted_text = progressive.text()
+                    else:
+                        # Extract new pages in one run (worker pool, batches) and
+                        # show progress as each page comes in
+                        progress_text = st.empty()
+                        missing = [i for i in pages if i not in document.loaded_pages]
+                        for done, result in enumerate(document.iter_load(pages), start=1):
+                            progress_text.caption(f"Page {result['page'] + 1} done ({done} of {len(missing)})")
+                        progress_text.empty()
+                        
+                        st.session_state.extracted_text = document.text(pages)
+                        page_results = document.load(pages)
+                    gate_ocr_results(page_results)
+                    
+                    if progressive is not None and not progressive.done:
+                        st.info(
+                            f"⏳ Showing a quick preview of {len(page_results)} of {len(pages)} pages; "
+                            f"{progressive.pending_pages} pages are being improved in the background"
+                        )
+                    else:
+                        st.success(f"✅ Text extracted from {len(pages)} of {len(document)} pages!")
+                    
+                    blank_pages = sum(1 for r in page_results if r.get("skipped") == "blank")
+                    image_pages = sum(1 for r in page_results if r.get("skipped") == "image")
+                    regions = sum(r.get("regions_skipped", 0) for r in page_results)
+                    if blank_pages or image_pages or regions:
+                        st.caption(
+                            f"Skipped {blank_pages} blank and {image_pages} picture-only pages, "
+                            f"and {regions} pictures on text pages"
+                        )
+                    duplicate_pages = sum(1 for r in page_results if r.get("duplicate") and not r.get("cached"))
+                    if duplicate_pages:
+                        st.caption(f"Reused the text of {duplicate_pages} repeated pages instead of running OCR again")
+                    
+                    if not page_range.strip() and len(pages) < len(document):
+                        if st.button(f"📄 Load next {OCR_CONFIG['initial_pages']} pages"):
+                            st.session_state.pdf_pages_shown += OCR_CONFIG["initial_pages"]
+                            st.rerun()
+                    
+                    if progressive is not None and not progressive.done:
+                        # Redraw as soon as better pages arrive
+                        progressive.wait_for_update(seen_version, timeout=OCR_CONFIG["progressive_poll_seconds"])
+                        st.rerun()
                     
                 except Exception as e:
                     st.error(f"❌ Error extracting text: {str(e)}")
     
     elif input_method == "Upload Image":
         st.subheader("Upload Image File")
-        image_file = st.file_uploader("Choose an image file", type=["jpg", "jpeg", "png", "bmp", "tiff"])
+        image_file = st.file_uploader("Choose an image file", type=["jpg", "jpeg", "png", "bmp", "tif", "tiff"])
         
         if image_file is not None:
             col1, col2 = st.columns(2)
@@ -197,14 +406,13 @@ with tab1:
             with col2:
                 with st.spinner("🖼️ Extracting text from image..."):
                     try:
-                        # Save uploaded file temporarily
-                        temp_path = Path("uploads") / image_file.name
-                        Path("uploads").mkdir(exist_ok=True)
-                        with open(temp_path, "wb") as f:
-                            f.write(image_file.getbuffer())
+                        temp_path, _ = save_upload(image_file)
                         
                         # Extract text
-                        st.session_state.extracted_text = ocr.extract_from_image(str(temp_path))
+                        result = ocr.extract_image_result(str(temp_path))
+                        st.session_state.extracted_text = result["text"]
+                        # Gate multi-frame TIFFs frame by frame, like PDF pages
+                        gate_ocr_results(result["pages"] or [result])
                         st.success("✅ Text extracted successfully!")
                         
                     except Exception as e:
@@ -220,6 +428,7 @@ with tab1:
         
         if st.button("Use This Text", type="primary"):
             st.session_state.extracted_text = text_input
+            st.session_state.ocr_gate = None
             st.success("✅ Text loaded successfully!")
     
     # Display extracted text
@@ -233,9 +442,18 @@ with tab1:
             label_visibility="collapsed"
         )
         
+        gate = st.session_state.ocr_gate
+        if gate is not None and gate["dropped"]:
+            with st.expander(
+                f"⚠️ {len(gate['dropped'])} lines were read with low confidence and won't be simplified or read aloud"
+            ):
+                for line in gate["dropped"]:
+                    st.text(f"Page {line['page'] + 1} ({line['confidence']:.0f}%): {line['text']}")
+        
         # Option to clear
         if st.button("Clear Text"):
             st.session_state.extracted_text = ""
+            st.session_state.ocr_gate = None
             st.rerun()
 
 
@@ -255,7 +473,12 @@ with tab2:
                 try:
                     # Initialize simplifier
                     st.info(f"Initializing {model_type} model...")
-                    simplifier = TextSimplifier(model_type=selected_model)
+                    simplifier = TextSimplifier(
+                        model_type=selected_model,
+                        batch_size=PERFORMANCE_CONFIG["batch_size"],
+                        dtype="float16" if PERFORMANCE_CONFIG["use_fp16"] else None,
+                        cache=get_simplification_cache(),
+                    )
                     
                     # Check if model actually loaded
                     if simplifier.model_type == "basic" and selected_model != "basic":
@@ -266,10 +489,27 @@ with tab2:
                     
                     # Split and simplify
                     st.info("Processing text...")
+                    simplify_start = time.perf_counter()
                     st.session_state.simplified_text = simplifier.split_and_simplify(
-                        st.session_state.extracted_text,
+                        model_input_text(),
                         chunk_size=max_length
                     )
+                    simplify_seconds = time.perf_counter() - simplify_start
+                    
+                    if simplifier.cache is not None:
+                        cache_stats = simplifier.cache.stats()
+                        st.caption(
+                            f"Simplification cache: {cache_stats['hit_rate']:.0%} hit rate, "
+                            f"{cache_stats['entries']} sentences stored"
+                        )
+                    
+                    gate = st.session_state.ocr_gate
+                    if gate is not None and gate["dropped_chars"]:
+                        saved = estimate_time_saved(simplify_seconds, gate["kept_chars"], gate["dropped_chars"])
+                        st.caption(
+                            f"Left out {gate['dropped_chars']} characters of low-confidence OCR text, "
+                            f"saving about {saved:.1f}s of model time"
+                        )
                     
                     # Calculate reading level
                     st.session_state.reading_level = simplifier.calculate_flesch_kincaid_level(
@@ -331,7 +571,7 @@ with tab3:
     if not st.session_state.simplified_text and not st.session_state.extracted_text:
         st.warning("⚠️ Please extract and simplify text first!")
     else:
-        text_to_speak = st.session_state.simplified_text if st.session_state.simplified_text else st.session_state.extracted_text
+        text_to_speak = st.session_state.simplified_text if st.session_state.simplified_text else model_input_text()
         
         # Initialize session state for audio path if not exists
         if 'audio_path' not in st.session_state:
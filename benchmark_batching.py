@@ -0,0 +1,94 @@
+"""
+Benchmark multi-page Tesseract batches against one Tesseract run per page
+
+For documents of 10, 100 and 500 pages, times sequential OCR with
+batch_size=1 (a new tesseract process, and a fresh load of the language
+model, for every page) and with larger batches (one process per batch,
+pages sent as a multi-page TIFF over stdin). Also measures the fixed cost
+of a single tesseract run on a tiny image, which is what batching saves
+per page.
+
+Usage: python benchmark_batching.py [page counts...] [--batch N ...] [--dpi N]
+Defaults: 10 100 500 pages, batches of 16 and 64, 150 dpi.
+"""
+
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+import numpy as np
+import pytesseract
+
+from modules.ocr_extractor import OCRExtractor, _run_tesseract_pipe
+from ocr_test_utils import make_pdf
+
+A4 = (595, 842)
+SAMPLE_LINE = "The quick brown fox jumps over the lazy dog while reading aids help everyone."
+
+
+def parse_args(argv):
+    """Split the command line into page counts, batch sizes and dpi"""
+    page_counts, batch_sizes, dpi = [], [], 150
+    target = page_counts
+    args = iter(argv)
+    for arg in args:
+        if arg == "--batch":
+            target = batch_sizes
+        elif arg == "--dpi":
+            dpi = int(next(args))
+        else:
+            target.append(int(arg))
+    return page_counts or [10, 100, 500], batch_sizes or [16, 64], dpi
+
+
+def tesseract_startup_ms(runs=10):
+    """Mean wall time of a tesseract run on a tiny blank image"""
+    options = {"lang": None, "tesseract_config": ""}
+    blank = np.full((32, 32), 255, dtype=np.uint8)
+    start = time.perf_counter()
+    for _ in range(runs):
+        _run_tesseract_pipe(blank, 72, options)
+    return (time.perf_counter() - start) / runs * 1000
+
+
+def time_extraction(pdf_path, num_pages, batch_size, dpi):
+    """Sequential extraction time per page, in ms"""
+    ocr = OCRExtractor(
+        dpi=dpi, use_text_layer=False, tesseract_transport="pipe", batch_size=batch_size
+    )
+    start = time.perf_counter()
+    ocr.extract_from_pdf(pdf_path)
+    return (time.perf_counter() - start) / num_pages * 1000
+
+
+def main():
+    page_counts, batch_sizes, dpi = parse_args(sys.argv[1:])
+    if not shutil.which(pytesseract.pytesseract.tesseract_cmd):
+        print("tesseract not found, nothing to benchmark")
+        return
+
+    print(f"tesseract start-up + model load: {tesseract_startup_ms():.1f} ms per run\n")
+
+    columns = [1] + batch_sizes
+    header = "".join(f"{f'batch={size}':>12}" for size in columns)
+    print(f"{dpi} dpi, ms per page (sequential)")
+    print(f"{'pages':<8}{header}{'speed-up':>10}")
+    for num_pages in page_counts:
+        # Short pages keep the 500-page run manageable; the per-process
+        # overhead being measured doesn't depend on page content
+        pdf_path = make_pdf(["\n".join([SAMPLE_LINE] * 5)] * num_pages, page_size=A4)
+        try:
+            timings = [time_extraction(pdf_path, num_pages, size, dpi) for size in columns]
+        finally:
+            os.remove(pdf_path)
+        cells = "".join(f"{ms:>12.1f}" for ms in timings)
+        print(f"{num_pages:<8}{cells}{timings[0] / min(timings[1:]):>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
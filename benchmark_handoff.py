@@ -0,0 +1,154 @@
+"""
+Benchmark the page hand-off from pdfium to Tesseract
+
+Compares, per page:
+  before - RGB render -> PIL copy -> PNG temp file (what pytesseract does)
+  after  - grayscale render -> raw PGM payload for tesseract's stdin
+
+Usage: python benchmark_handoff.py [file.pdf] [dpi]
+Without a PDF, a synthetic A4 document is generated. Peak memory is the
+highest RSS sampled above the starting RSS while the pages run, with each
+hand-off in a fresh process. If tesseract is installed, full OCR time is
+measured for both transports as well.
+"""
+
+import gc
+import multiprocessing
+import os
+import shutil
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+import numpy as np
+import pypdfium2 as pdfium
+import pytesseract
+
+from modules.memory_limits import MB, current_rss
+from modules.ocr_extractor import OCRExtractor, PDF_POINTS_PER_INCH, _render_page
+from ocr_test_utils import make_pdf
+
+A4 = (595, 842)
+SAMPLE_LINE = "The quick brown fox jumps over the lazy dog while reading aids help everyone."
+
+
+def handoff_before(page, dpi):
+    """Old path: returns bytes written to disk"""
+    bitmap = page.render(scale=dpi / PDF_POINTS_PER_INCH)
+    image = bitmap.to_pil()  # BGR -> RGB conversion copies the whole bitmap
+    with pytesseract.pytesseract.save(image) as (_, input_file_name):
+        disk_bytes = os.path.getsize(input_file_name)
+    return disk_bytes
+
+
+def handoff_after(page, dpi):
+    """New path: returns bytes written to disk"""
+    image = _render_page(page, dpi)
+    height, width = image.shape
+    header = f"P5\n{width} {height}\n255\n".encode("ascii")
+    payload = bytearray(len(header) + image.size)
+    payload[:len(header)] = header
+    np.frombuffer(payload, dtype=np.uint8, offset=len(header)).reshape(height, width)[:] = image
+    return 0
+
+
+HANDOFFS = {"before": handoff_before, "after": handoff_after}
+
+
+class RSSSampler:
+    """Background thread recording the highest RSS seen while it runs"""
+
+    def __init__(self, interval: float = 0.0005):
+        self.interval = interval
+        self.peak = current_rss() or 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, current_rss() or 0)
+            time.sleep(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, current_rss() or 0)
+
+
+def time_handoff(pdf_path, name, dpi):
+    """
+    Run a hand-off over every page in this process
+
+    Returns:
+        Tuple of (ms per page, peak RSS growth in MB, disk MB per page)
+    """
+    handoff = HANDOFFS[name]
+    pdf = pdfium.PdfDocument(pdf_path)
+    # Warm up pdfium's font and page caches so they don't count as hand-off memory
+    handoff(pdf[0], dpi)
+    gc.collect()
+    baseline = current_rss() or 0
+    disk = 0
+    start = time.perf_counter()
+    with RSSSampler() as sampler:
+        for i in range(len(pdf)):
+            disk += handoff(pdf[i], dpi)
+    per_page_ms = (time.perf_counter() - start) / len(pdf) * 1000
+    num_pages = len(pdf)
+    pdf.close()
+    return per_page_ms, (sampler.peak - baseline) / MB, disk / num_pages / 1e6
+
+
+def measure_handoff(pdf_path, name, dpi):
+    """Run time_handoff() in a fresh process, so memory freed by one hand-off can't hide the other's"""
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+        return executor.submit(time_handoff, pdf_path, name, dpi).result()
+
+
+def time_ocr(pdf_path, transport, dpi, num_pages):
+    """Full extraction time per page for a transport"""
+    ocr = OCRExtractor(dpi=dpi, use_text_layer=False, tesseract_transport=transport)
+    start = time.perf_counter()
+    ocr.extract_from_pdf(pdf_path)
+    return (time.perf_counter() - start) / num_pages * 1000
+
+
+def main():
+    dpi = int(sys.argv[2]) if len(sys.argv) > 2 else 216
+    generated = len(sys.argv) < 2
+    if generated:
+        pdf_path = make_pdf(["\n".join([SAMPLE_LINE] * 40)] * 10, page_size=A4)
+    else:
+        pdf_path = sys.argv[1]
+
+    pdf = pdfium.PdfDocument(pdf_path)
+    num_pages = len(pdf)
+    print(f"{num_pages} pages at {dpi} dpi")
+    pdf.close()
+    print(f"{'hand-off':<10}{'ms/page':>10}{'peak RSS MB':>15}{'disk MB/page':>15}")
+    for name in HANDOFFS:
+        per_page_ms, peak_mb, disk_mb = measure_handoff(pdf_path, name, dpi)
+        print(f"{name:<10}{per_page_ms:>10.1f}{peak_mb:>15.1f}{disk_mb:>15.2f}")
+
+    if shutil.which(pytesseract.pytesseract.tesseract_cmd):
+        print(f"\n{'transport':<12}{'OCR ms/page':>12}")
+        for transport in ("pytesseract", "pipe"):
+            print(f"{transport:<12}{time_ocr(pdf_path, transport, dpi, num_pages):>12.1f}")
+    else:
+        print("\ntesseract not found, skipping full OCR timings")
+
+    if generated:
+        os.remove(pdf_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark Tesseract time per page with and without image preprocessing
+
+Pages are rendered from a PDF and degraded to look like phone photos
+(uneven lighting, sensor noise, skew, a dark scanner edge) unless
+--clean is given.
+
+Usage: python benchmark_preprocessing.py [file.pdf] [--clean]
+Without a PDF, a synthetic A4 document is generated. Preprocessing time is
+always reported; OCR time needs tesseract to be installed.
+"""
+
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+import numpy as np
+import pypdfium2 as pdfium
+import pytesseract
+from PIL import Image
+
+from modules.image_preprocessing import DEFAULT_PREPROCESSING, preprocess_image
+from modules.ocr_extractor import _render_page, _tesseract_to_string
+from ocr_test_utils import make_pdf
+
+A4 = (595, 842)
+DPI = 216
+SAMPLE_LINE = "The quick brown fox jumps over the lazy dog while reading aids help everyone."
+
+
+def degrade(image: np.ndarray, rng) -> np.ndarray:
+    """Make a clean render look like a phone photo of the page"""
+    tilted = np.asarray(Image.fromarray(image).rotate(2.0, expand=True, fillcolor=255)).astype(np.float32)
+    lighting = np.linspace(1.0, 0.55, tilted.shape[1], dtype=np.float32)[None, :]
+    noisy = tilted * 0.75 * lighting + 35 + rng.normal(0, 10, tilted.shape).astype(np.float32)
+    noisy[:, :40] = 15
+    return np.clip(noisy, 0, 255).astype(np.uint8)
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    clean = "--clean" in sys.argv
+    generated = not args
+    pdf_path = make_pdf(["\n".join([SAMPLE_LINE] * 40)] * 5, page_size=A4) if generated else args[0]
+
+    rng = np.random.default_rng(0)
+    pdf = pdfium.PdfDocument(pdf_path)
+    pages = []
+    for i in range(len(pdf)):
+        image = _render_page(pdf[i], DPI).copy()
+        pages.append(image if clean else degrade(image, rng))
+    pdf.close()
+    if generated:
+        os.remove(pdf_path)
+
+    variants = {
+        "raw": None,
+        "otsu": DEFAULT_PREPROCESSING,
+        "sauvola": {**DEFAULT_PREPROCESSING, "binarize": "sauvola"},
+    }
+    have_tesseract = shutil.which(pytesseract.pytesseract.tesseract_cmd) is not None
+    options = {"lang": None, "tesseract_config": "", "tesseract_transport": "pipe"}
+
+    print(f"{len(pages)} {'clean' if clean else 'degraded'} pages at {DPI} dpi")
+    print(f"{'variant':<10}{'prep ms/page':>14}{'OCR ms/page':>14}{'words/page':>12}")
+    for name, preprocessing in variants.items():
+        prep_time = 0.0
+        ocr_time = 0.0
+        words = 0
+        for image in pages:
+            start = time.perf_counter()
+            prepared = preprocess_image(image, preprocessing) if preprocessing else image
+            prep_time += time.perf_counter() - start
+
+            if have_tesseract:
+                start = time.perf_counter()
+                words += len(_tesseract_to_string(prepared, DPI, options).split())
+                ocr_time += time.perf_counter() - start
+
+        ocr_column = f"{ocr_time / len(pages) * 1000:>14.1f}" if have_tesseract else f"{'n/a':>14}"
+        words_column = f"{words / len(pages):>12.0f}" if have_tesseract else f"{'n/a':>12}"
+        print(f"{name:<10}{prep_time / len(pages) * 1000:>14.1f}{ocr_column}{words_column}")
+
+    if not have_tesseract:
+        print("\ntesseract not found, OCR timings skipped")
+
+
+if __name__ == "__main__":
+    main()
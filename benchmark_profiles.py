@@ -0,0 +1,85 @@
+"""
+Benchmark the OCR speed profiles on the bundled synthetic corpus
+
+Runs every profile in OCR_PROFILES over the corpus from ocr_corpus.py
+(clean, skewed, blurred, noisy and faded scans with known text) and
+reports throughput and character accuracy, overall and per kind of damage.
+
+Usage: python benchmark_profiles.py [--pages-per-kind N] [--save]
+With --save, results are written to OCR_CONFIG["profile_benchmark_path"]
+so the app can show them next to the profile picker.
+"""
+
+import json
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+import pytesseract
+
+from config import OCR_CONFIG
+from modules.ocr_extractor import OCRExtractor
+from modules.ocr_profiles import OCR_PROFILES
+from ocr_corpus import DEGRADATIONS, character_accuracy, make_corpus
+
+
+def run_profile(name, pdf_path, truths, kinds):
+    """OCR the corpus with one profile, returning pages/min and accuracy overall and per kind"""
+    ocr = OCRExtractor.from_profile(
+        name,
+        languages=OCR_CONFIG["languages"],
+        tessdata_dirs=OCR_CONFIG["tessdata_dirs"],
+        tesseract_transport=OCR_CONFIG["tesseract_transport"],
+        use_text_layer=False,
+    )
+    start = time.perf_counter()
+    results = list(ocr.iter_pdf_pages(pdf_path))
+    elapsed = time.perf_counter() - start
+
+    accuracies = [character_accuracy(r["text"], truth) for r, truth in zip(results, truths)]
+    per_kind = {}
+    for kind, accuracy in zip(kinds, accuracies):
+        per_kind.setdefault(kind, []).append(accuracy)
+    return {
+        "pages_per_minute": len(results) / elapsed * 60,
+        "accuracy": sum(accuracies) / len(accuracies),
+        "accuracy_by_kind": {kind: sum(v) / len(v) for kind, v in per_kind.items()},
+    }
+
+
+def main():
+    pages_per_kind = 4
+    if "--pages-per-kind" in sys.argv:
+        pages_per_kind = int(sys.argv[sys.argv.index("--pages-per-kind") + 1])
+
+    if not shutil.which(pytesseract.pytesseract.tesseract_cmd):
+        print("tesseract not found, nothing to benchmark")
+        return
+
+    pdf_path, truths, kinds = make_corpus(pages_per_kind)
+    try:
+        results = {name: run_profile(name, pdf_path, truths, kinds) for name in OCR_PROFILES}
+    finally:
+        os.remove(pdf_path)
+
+    kind_names = [kind[0] for kind in DEGRADATIONS]
+    print(f"{len(truths)} pages, single process")
+    print(f"{'profile':<10}{'pages/min':>10}{'accuracy':>10}" + "".join(f"{k:>9}" for k in kind_names))
+    for name, result in results.items():
+        by_kind = "".join(f"{result['accuracy_by_kind'][k]:>9.1%}" for k in kind_names)
+        print(f"{name:<10}{result['pages_per_minute']:>10.1f}{result['accuracy']:>10.1%}{by_kind}")
+
+    if "--save" in sys.argv:
+        path = Path(OCR_CONFIG["profile_benchmark_path"])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"\nSaved to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,7 @@ from pathlib import Path
 BASE_DIR = Path(__file__).parent
 UPLOAD_DIR = BASE_DIR / "uploads"
 OUTPUT_DIR = BASE_DIR / "output"
+CACHE_DIR = BASE_DIR / "cache"
 MODELS_CACHE_DIR = os.path.expanduser("~/.cache/huggingface/")
 
 # Create directories if they don't exist
@@ -28,8 +29,111 @@ OCR_CONFIG = {
     # PDF conversion DPI (higher = better quality but slower)
     "pdf_dpi": 200,
     
+    # How page images reach Tesseract: "pipe" streams raw grayscale pixels
+    # over stdin, "pytesseract" goes through PNG temp files
+    "tesseract_transport": "pipe",
+    
+    # Image cleanup before OCR (helps phone photos and noisy scans)
+    "enable_preprocessing": False,
+    "preprocessing": {
+        "normalize_contrast": True,
+        "crop_borders": True,
+        "deskew": True,
+        "max_skew_angle": 5.0,
+        "binarize": "otsu",  # "otsu", "sauvola" (uneven lighting) or None
+    },
+    
+    # Skip blank and figure-only pages, and cut figures out of text pages
+    "skip_non_text": True,
+    
+    # Memory PDF extraction may add in MB (None = no cap), on top of what the
+    # process already holds (such as loaded simplification models); pages are
+    # rendered at lower DPI and pdfium caches are dropped to stay under it
+    "max_rss_mb": 2048,
+    
+    # Cheap first OCR pass; pages whose mean word confidence (0-100) falls
+    # below min_confidence are re-rendered at pdf_dpi (None = single pass)
+    "pdf_draft_dpi": 150,
+    "min_confidence": 80,
+    
     # Language for OCR (ISO 639-1 codes)
     "languages": ["eng"],  # "eng", "fra", "deu", etc.
+    
+    # Speed profile: "fast", "balanced", "accurate" (see
+    # modules/ocr_profiles.py) or "custom" to use pdf_dpi, pdf_draft_dpi and
+    # the preprocessing settings above
+    "profile": "balanced",
+    
+    # Downloaded tessdata_fast / tessdata_best models used by the fast and
+    # accurate profiles (missing directories fall back to the installed models)
+    "tessdata_dirs": {
+        "fast": BASE_DIR / "tessdata" / "fast",
+        "best": BASE_DIR / "tessdata" / "best",
+    },
+    
+    # Profile throughput/accuracy measured by benchmark_profiles.py --save
+    "profile_benchmark_path": CACHE_DIR / "ocr_profiles.json",
+    
+    # Pages of a PDF extracted straight away; the rest load on request
+    "initial_pages": 5,
+    
+    # Show a quick low-resolution preview of PDF pages first and replace it
+    # page by page as full-quality OCR finishes in the background
+    "progressive": True,
+    "preview_dpi": 100,
+    "progressive_poll_seconds": 2,
+    
+    # Worker processes for PDF pages (1 = sequential, 0 = one per CPU core)
+    "num_workers": 0,
+    
+    # OpenMP threads per tesseract process when running in parallel
+    "tesseract_threads": 1,
+    
+    # PDF pages per tesseract process; batching pays process start-up and
+    # language model loading once per batch instead of once per page
+    "batch_size": 8,
+    
+    # Shrink image uploads whose lowercase letters are taller than this many
+    # pixels (capitals then come out around 30 px); Tesseract gets no more
+    # accurate beyond it, only slower. None keeps images at full size
+    "target_x_height": 20,
+    
+    # Images of at least this many megapixels (large scans, phone photos)
+    # are split into tiles along whitespace and recognized by all workers
+    "tile_megapixels": 8,
+    
+    # How tiles reach the worker processes: "shared_memory" (recycled
+    # buffers, only a handle is sent) or "pickle" (copied through a pipe)
+    "worker_transport": "shared_memory",
+    
+    # OCR scanned PDF pages straight from their embedded image at its own
+    # resolution instead of rendering (and resampling) the whole page
+    "native_images": True,
+    
+    # Repeated pages (cover sheets, blank forms) are recognized once; pages
+    # whose 512-bit perceptual fingerprints differ by at most this many bits
+    # share their text (None = OCR every page)
+    "duplicate_distance": 4,
+    
+    # Read born-digital PDF pages from their text layer instead of OCR
+    "use_text_layer": True,
+    "min_text_layer_chars": 20,
+    
+    # Persistent cache of OCR results (keyed by file content and settings)
+    "cache_enabled": True,
+    "cache_path": CACHE_DIR / "ocr_cache.sqlite3",
+    "cache_max_mb": 200,
+    
+    # OCR lines whose mean word confidence is below this (tables,
+    # handwriting, diagrams read as text) are kept away from simplification
+    # and speech; pages below min_page_confidence are left out whole.
+    # None sends all OCR text on
+    "min_line_confidence": 60,
+    "min_page_confidence": 40,
+    
+    # Page checkpoints of PDF runs in progress; an interrupted run (rerun,
+    # crash, restart) picks up with only the pages it hadn't finished
+    "checkpoint_dir": CACHE_DIR / "ocr_checkpoints",
 }
 
 # ============================================================================
@@ -62,6 +166,13 @@ SIMPLIFICATION_CONFIG = {
     # Chunk size for processing large texts
     "chunk_size": 512,
     
+    # Reuse simplified sentences (boilerplate, repeated handouts, reruns):
+    # an in-memory LRU of this many sentences in front of a SQLite file
+    "cache_enabled": True,
+    "cache_path": CACHE_DIR / "simplification_cache.sqlite3",
+    "cache_max_mb": 50,
+    "cache_memory_entries": 2048,
+    
     # Target reading levels
     "reading_levels": {
         "easy": {"min": 0, "max": 6},
@@ -113,14 +224,19 @@ PERFORMANCE_CONFIG = {
     # Model caching
     "use_cache": True,
     "cache_dir": MODELS_CACHE_DIR,
+    # Simplification models stay loaded across requests up to this much
+    # weight memory; beyond it the least recently used one is unloaded
+    # (None = no limit)
+    "model_memory_mb": 2048,
     
     # Processing optimization
-    "batch_size": 1,
+    # Sentences simplified per generate() call (grouped by length)
+    "batch_size": 8,
     "num_workers": 0,
     
     # Memory management
     "offload_to_cpu": False,
-    "use_fp16": False,  # Half precision (faster but less accurate)
+    "use_fp16": False,  # Half precision on CUDA (faster but less accurate); float32 on CPU
     
     # Logging
     "log_level": "INFO",
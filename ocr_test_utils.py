@@ -0,0 +1,106 @@
+"""
+Shared helpers for the OCR tests: build small PDFs on the fly
+"""
+
+import ctypes
+import os
+import tempfile
+
+import numpy as np
+import pypdfium2 as pdfium
+import pypdfium2.raw as pdfium_c
+from PIL import Image
+
+
+def _add_text(pdf, page, text: str, x: float = 20, y: float = 360, font_size: float = 12.0):
+    """Add a line of real (selectable) text to a page"""
+    text_obj = pdfium_c.FPDFPageObj_NewTextObj(pdf.raw, b"Helvetica", font_size)
+    buffer = ctypes.create_string_buffer((text + "\x00").encode("utf-16-le"))
+    pdfium_c.FPDFText_SetText(text_obj, ctypes.cast(buffer, ctypes.POINTER(pdfium_c.FPDF_WCHAR)))
+    pdfium_c.FPDFPageObj_Transform(text_obj, 1, 0, 0, 1, x, y)
+    pdfium_c.FPDFPage_InsertObject(page.raw, text_obj)
+
+
+def _add_figure(page, box):
+    """Add a solid black rectangle (a stand-in for a picture) to a page"""
+    x, y, width, height = box
+    rect = pdfium_c.FPDFPageObj_CreateNewRect(x, y, width, height)
+    pdfium_c.FPDFPageObj_SetFillColor(rect, 0, 0, 0, 255)
+    pdfium_c.FPDFPath_SetDrawMode(rect, pdfium_c.FPDF_FILLMODE_ALTERNATE, False)
+    pdfium_c.FPDFPage_InsertObject(page.raw, rect)
+
+
+def make_pdf(page_texts, page_size=(300, 400), figures=None) -> str:
+    """
+    Write a PDF to a temp file and return its path
+    
+    Args:
+        page_texts: One entry per page; a string adds it as a text layer
+                    (one line per newline), None leaves the page blank
+        page_size: Page width and height in points
+        figures: Optional {page index: (x, y, width, height)} of solid
+                 rectangles to draw as pictures
+    """
+    figures = figures or {}
+    pdf = pdfium.PdfDocument.new()
+    width, height = page_size
+    for index, text in enumerate(page_texts):
+        page = pdf.new_page(width, height)
+        if text:
+            for i, line in enumerate(text.split("\n")):
+                _add_text(pdf, page, line, y=height - 40 - i * 16)
+        if index in figures:
+            _add_figure(page, figures[index])
+        if text or index in figures:
+            page.gen_content()
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    os.close(fd)
+    pdf.save(path)
+    pdf.close()
+    return path
+
+
+def make_blank_pdf(num_pages: int) -> str:
+    """Write a PDF with blank pages to a temp file and return its path"""
+    return make_pdf([None] * num_pages)
+
+
+def make_scanned_pdf(images, page_size=(300, 400), boxes=None, texts=None, rotation=0) -> str:
+    """
+    Write a PDF whose pages are embedded images, like a scanned book
+
+    Args:
+        images: One 2-D uint8 array per page
+        page_size: Page width and height in points
+        boxes: Optional {page index: (x, y, width, height)} placing the image
+               (default: the whole page)
+        texts: Optional {page index: text} of real text to add on top
+               (one line per newline), making a mixed-content page
+        rotation: Page rotation in degrees applied to every page
+
+    Returns:
+        Path of the PDF
+    """
+    boxes = boxes or {}
+    texts = texts or {}
+    pdf = pdfium.PdfDocument.new()
+    width, height = page_size
+    for index, pixels in enumerate(images):
+        page = pdf.new_page(width, height)
+        image = pdfium.PdfImage.new(pdf)
+        bitmap = pdfium.PdfBitmap.from_pil(Image.fromarray(np.asarray(pixels, dtype=np.uint8)))
+        image.set_bitmap(bitmap)
+        x, y, w, h = boxes.get(index, (0, 0, width, height))
+        image.set_matrix(pdfium.PdfMatrix().scale(w, h).translate(x, y))
+        page.insert_obj(image)
+        if index in texts:
+            for i, line in enumerate(texts[index].split("\n")):
+                _add_text(pdf, page, line, y=360 - i * 16)
+        if rotation:
+            page.set_rotation(rotation)
+        page.gen_content()
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    os.close(fd)
+    pdf.save(path)
+    pdf.close()
+    return path
@@ -0,0 +1,87 @@
+"""
+Confidence Gate Module
+Keep OCR output Tesseract wasn't sure about (tables, handwriting, diagrams
+read as text) away from the simplification and speech models
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Lines whose mean word confidence is below this are dropped
+DEFAULT_MIN_LINE_CONFIDENCE = 60
+
+
+def gate_results(results, min_line_confidence: float = DEFAULT_MIN_LINE_CONFIDENCE,
+                 min_page_confidence: float = None) -> dict:
+    """
+    Split OCR results into text worth processing and text to leave out
+
+    Results without line confidences (text layers, pasted text, OCR run
+    with line_confidence off) are passed through whole.
+
+    Args:
+        results: Page results from OCRExtractor.iter_pdf_pages() or
+                 results of OCRExtractor.extract_image_result()
+        min_line_confidence: Lowest mean word confidence a line needs
+        min_page_confidence: Drop whole pages whose mean confidence is below
+                             this (None = judge pages line by line only)
+
+    Returns:
+        Dictionary with keys:
+            text: The kept text, pages joined with spaces
+            dropped: Left-out lines as {"page", "text", "confidence"}
+                     dictionaries, in document order
+            kept_chars: Characters of kept text
+            dropped_chars: Characters of left-out text
+    """
+    kept = []
+    dropped = []
+    for index, result in enumerate(results):
+        page = result.get("page", index)
+        lines = result.get("lines")
+        if lines is None:
+            if result["text"]:
+                kept.append(result["text"])
+            continue
+
+        page_confidence = result.get("confidence")
+        if min_page_confidence is not None and page_confidence is not None and page_confidence < min_page_confidence:
+            dropped.extend({"page": page, **line} for line in lines)
+            continue
+        for line in lines:
+            if line["confidence"] < min_line_confidence:
+                dropped.append({"page": page, **line})
+            else:
+                kept.append(line["text"])
+
+    text = " ".join(kept)
+    dropped_chars = sum(len(line["text"]) for line in dropped)
+    if dropped:
+        logger.info(f"Left out {len(dropped)} low-confidence OCR lines ({dropped_chars} characters)")
+    return {
+        "text": text,
+        "dropped": dropped,
+        "kept_chars": len(text),
+        "dropped_chars": dropped_chars,
+    }
+
+
+def estimate_time_saved(seconds: float, kept_chars: int, dropped_chars: int) -> float:
+    """
+    Estimate the model time spared by leaving text out
+
+    Model time grows about linearly with input length, so the time spent
+    on the kept text is scaled by how much was dropped.
+
+    Args:
+        seconds: Time a model stage spent on the kept text
+        kept_chars: Characters it processed
+        dropped_chars: Characters that were left out
+
+    Returns:
+        Estimated seconds saved (0 if nothing was processed)
+    """
+    if kept_chars <= 0:
+        return 0.0
+    return seconds * dropped_chars / kept_chars
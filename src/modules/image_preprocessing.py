@@ -0,0 +1,243 @@
+"""
+Image Preprocessing Module
+Vectorized cleanup of page images before OCR: contrast normalization,
+border cropping, deskewing and binarization
+"""
+
+import logging
+
+import numpy as np
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+# Default preprocessing steps; any of them can be switched off
+DEFAULT_PREPROCESSING = {
+    # Stretch the darkest/lightest percentiles to the full 0-255 range
+    "normalize_contrast": True,
+    "contrast_percentiles": (0.5, 99.5),
+
+    # Trim scanner borders and empty margins
+    "crop_borders": True,
+    "crop_padding": 16,
+
+    # Straighten rotated scans and photos
+    "deskew": True,
+    "max_skew_angle": 5.0,
+
+    # "otsu" (global threshold), "sauvola" (local threshold, handles uneven
+    # lighting in phone photos) or None to leave the image grayscale
+    "binarize": "otsu",
+    "sauvola_window": 31,
+    "sauvola_k": 0.2,
+}
+
+
+def normalize_contrast(image: np.ndarray, percentiles=(0.5, 99.5)) -> np.ndarray:
+    """
+    Stretch contrast so the given percentiles map to black and white
+
+    Args:
+        image: 2-D uint8 grayscale array
+        percentiles: Low/high percentiles to map to 0 and 255
+
+    Returns:
+        Contrast-normalized image
+    """
+    histogram = np.bincount(image.ravel(), minlength=256)
+    cumulative = np.cumsum(histogram) / image.size * 100
+    low = int(np.searchsorted(cumulative, percentiles[0]))
+    high = int(np.searchsorted(cumulative, percentiles[1]))
+    if high <= low:
+        return image
+
+    # A 256-entry lookup table keeps this to one pass over the pixels
+    levels = np.arange(256, dtype=np.float32)
+    lut = np.clip((levels - low) * (255.0 / (high - low)), 0, 255).astype(np.uint8)
+    return lut[image]
+
+
+def otsu_threshold(image: np.ndarray) -> int:
+    """
+    Find the global threshold that best separates ink from paper
+
+    Args:
+        image: 2-D uint8 grayscale array
+
+    Returns:
+        Threshold level (pixels above it are background)
+    """
+    histogram = np.bincount(image.ravel(), minlength=256).astype(np.float64)
+    levels = np.arange(256)
+
+    weight_dark = np.cumsum(histogram)
+    weight_light = weight_dark[-1] - weight_dark
+    sum_dark = np.cumsum(histogram * levels)
+    mean_dark = sum_dark / np.maximum(weight_dark, 1)
+    mean_light = (sum_dark[-1] - sum_dark) / np.maximum(weight_light, 1)
+
+    between_class_variance = weight_dark * weight_light * (mean_dark - mean_light) ** 2
+    return int(np.argmax(between_class_variance))
+
+
+def binarize_otsu(image: np.ndarray) -> np.ndarray:
+    """Binarize with a single global Otsu threshold"""
+    threshold = otsu_threshold(image)
+    return np.where(image > threshold, 255, 0).astype(np.uint8)
+
+
+def binarize_sauvola(image: np.ndarray, window: int = 31, k: float = 0.2) -> np.ndarray:
+    """
+    Binarize with Sauvola's local threshold, computed from integral images
+
+    Args:
+        image: 2-D uint8 grayscale array
+        window: Side of the square neighbourhood in pixels (odd)
+        k: Sensitivity to local contrast
+
+    Returns:
+        Binarized image (0 = ink, 255 = background)
+    """
+    half = window // 2
+    padded = np.pad(image.astype(np.float64), half + 1, mode="edge")
+    integral = padded.cumsum(axis=0).cumsum(axis=1)
+    integral_sq = (padded ** 2).cumsum(axis=0).cumsum(axis=1)
+
+    height, width = image.shape
+    y0, y1 = slice(0, height), slice(window, window + height)
+    x0, x1 = slice(0, width), slice(window, window + width)
+
+    def window_sum(table):
+        return table[y1, x1] - table[y0, x1] - table[y1, x0] + table[y0, x0]
+
+    area = window * window
+    mean = window_sum(integral) / area
+    variance = np.maximum(window_sum(integral_sq) / area - mean ** 2, 0)
+    threshold = mean * (1 + k * (np.sqrt(variance) / 128 - 1))
+    return np.where(image > threshold, 255, 0).astype(np.uint8)
+
+
+def crop_borders(image: np.ndarray, padding: int = 16, dark_fraction: float = 0.8) -> np.ndarray:
+    """
+    Crop dark scanner borders and empty margins around the content
+
+    Args:
+        image: 2-D uint8 grayscale array
+        padding: Pixels of margin to keep around the content
+        dark_fraction: Rows/columns with more ink than this are treated as
+                       scanner border rather than content
+
+    Returns:
+        Cropped image (unchanged if no content was found)
+    """
+    ink = image <= otsu_threshold(image)
+
+    # Blank out near-solid border bands first so they don't count as content
+    border_cols = ink.mean(axis=0) >= dark_fraction
+    border_rows = ink.mean(axis=1) >= dark_fraction
+    ink[:, border_cols] = False
+    ink[border_rows, :] = False
+
+    rows = np.flatnonzero(ink.any(axis=1))
+    cols = np.flatnonzero(ink.any(axis=0))
+    if rows.size == 0 or cols.size == 0:
+        return image
+
+    top = max(rows[0] - padding, 0)
+    bottom = min(rows[-1] + padding + 1, image.shape[0])
+    left = max(cols[0] - padding, 0)
+    right = min(cols[-1] + padding + 1, image.shape[1])
+    return image[top:bottom, left:right]
+
+
+def estimate_skew(image: np.ndarray, max_angle: float = 5.0, max_side: int = 1000) -> float:
+    """
+    Estimate the rotation of text lines with a projection profile search
+
+    For each candidate angle, ink pixels are sheared onto rows; the angle
+    that straightens text lines gives the sharpest row histogram.
+
+    Args:
+        image: 2-D uint8 grayscale array
+        max_angle: Largest skew to look for, in degrees
+        max_side: Images are subsampled to about this size for the search
+
+    Returns:
+        Skew angle in degrees; positive when text lines rise to the right
+    """
+    step = max(1, max(image.shape) // max_side)
+    small = image[::step, ::step]
+    ys, xs = np.nonzero(small <= otsu_threshold(small))
+    if ys.size == 0:
+        return 0.0
+
+    xs = xs - small.shape[1] / 2
+    height = small.shape[0]
+
+    def score(angles):
+        scores = []
+        for angle in angles:
+            rows = np.round(ys + xs * np.tan(np.radians(angle))).astype(np.int64)
+            rows = rows[(rows >= 0) & (rows < height)]
+            profile = np.bincount(rows, minlength=height).astype(np.float64)
+            scores.append(np.sum(np.diff(profile) ** 2))
+        return np.array(scores)
+
+    # Coarse search, then refine around the best coarse angle
+    coarse = np.arange(-max_angle, max_angle + 0.5, 0.5)
+    best = coarse[np.argmax(score(coarse))]
+    fine = np.arange(best - 0.5, best + 0.55, 0.1)
+    return round(float(fine[np.argmax(score(fine))]), 2)
+
+
+def deskew(image: np.ndarray, max_angle: float = 5.0) -> np.ndarray:
+    """
+    Rotate an image so its text lines are horizontal
+
+    Args:
+        image: 2-D uint8 grayscale array
+        max_angle: Largest skew to correct, in degrees
+
+    Returns:
+        Deskewed image (unchanged if the skew is negligible)
+    """
+    angle = estimate_skew(image, max_angle)
+    if abs(angle) < 0.1:
+        return image
+    logger.info(f"Deskewing page by {angle:.1f} degrees")
+    # PIL rotates counter-clockwise, so turn the page back the other way
+    rotated = Image.fromarray(image).rotate(
+        -angle, resample=Image.BILINEAR, expand=True, fillcolor=255
+    )
+    return np.asarray(rotated)
+
+
+def preprocess_image(image: np.ndarray, options: dict = None) -> np.ndarray:
+    """
+    Run the configured preprocessing steps on a page image
+
+    Args:
+        image: 2-D uint8 grayscale array
+        options: Preprocessing options (see DEFAULT_PREPROCESSING); missing
+                 keys fall back to the defaults
+
+    Returns:
+        Preprocessed 2-D uint8 array
+    """
+    options = {**DEFAULT_PREPROCESSING, **(options or {})}
+
+    if options["normalize_contrast"]:
+        image = normalize_contrast(image, options["contrast_percentiles"])
+    if options["crop_borders"]:
+        image = crop_borders(image, options["crop_padding"])
+    if options["deskew"]:
+        image = deskew(image, options["max_skew_angle"])
+
+    if options["binarize"] == "otsu":
+        image = binarize_otsu(image)
+    elif options["binarize"] == "sauvola":
+        image = binarize_sauvola(image, options["sauvola_window"], options["sauvola_k"])
+    elif options["binarize"]:
+        raise ValueError(f"Unsupported binarization method: {options['binarize']}")
+
+    return image
@@ -0,0 +1,129 @@
+"""
+Image Tiling Module
+Split very large page images into overlapping tiles along whitespace
+gutters, and merge the per-tile OCR words back without duplicates
+"""
+
+import numpy as np
+
+from .page_layout import _split_on_gaps, ink_mask
+from .word_boxes import WordBoxes
+
+# Tiles smaller than this aren't worth a Tesseract process of their own
+MIN_TILE_PIXELS = 2_000_000
+
+
+def _nearest_blank_row(occupied: np.ndarray, target: int, window: int):
+    """
+    Find the middle of the whitespace band closest to a target row
+
+    Returns:
+        Row index, or None if every row within the window has ink
+    """
+    low = max(target - window, 1)
+    high = min(target + window, len(occupied) - 1)
+    blank = np.flatnonzero(~occupied[low:high]) + low
+    if blank.size == 0:
+        return None
+
+    row = blank[np.argmin(np.abs(blank - target))]
+    # Move to the middle of that band so the cut stays clear of both lines
+    top = bottom = row
+    while top > low and not occupied[top - 1]:
+        top -= 1
+    while bottom < high - 1 and not occupied[bottom + 1]:
+        bottom += 1
+    return int((top + bottom) // 2)
+
+
+def plan_tiles(image: np.ndarray, num_tiles: int, min_gap_x: int, overlap: int = None) -> list:
+    """
+    Plan how to cut a page image into tiles for parallel OCR
+
+    The page is first split into columns at full-height vertical gutters, so
+    that reading order survives, then each column into horizontal strips.
+    Strips are cut in the blank band between text lines nearest to an even
+    split. Where no such band exists the cut goes through the text, and the
+    tiles on both sides reach `overlap` pixels past it so every line is seen
+    whole by at least one tile.
+
+    Args:
+        image: 2-D uint8 grayscale array
+        num_tiles: Rough number of tiles wanted
+        min_gap_x: Narrowest vertical gutter (pixels) that separates columns
+        overlap: Pixels tiles extend past a cut through text (default: about
+                 two text lines for the image size)
+
+    Returns:
+        List of dicts in reading order with "box" (the pixels to OCR) and
+        "core" (the part of the page this tile is responsible for), both
+        (top, bottom, left, right)
+    """
+    height, width = image.shape
+    if overlap is None:
+        overlap = max(64, height // 40)
+    whole = [{"box": (0, height, 0, width), "core": (0, height, 0, width)}]
+    if num_tiles <= 1:
+        return whole
+
+    ink, _ = ink_mask(image)
+    column_runs = _split_on_gaps(ink.any(axis=0), min_gap_x)
+    if not column_runs:
+        return whole
+
+    # Columns meet halfway across the gutters between them
+    gutters = [(a_end + b_start) // 2 for (_, a_end), (b_start, _) in zip(column_runs, column_runs[1:])]
+    edges = [0] + gutters + [width]
+
+    tiles = []
+    for left, right in zip(edges, edges[1:]):
+        strips = max(1, round(num_tiles * (right - left) / width))
+        occupied = ink[:, left:right].any(axis=1)
+        window = height // (2 * strips)
+
+        cuts = [(0, True)]
+        for k in range(1, strips):
+            target = k * height // strips
+            row = _nearest_blank_row(occupied, target, window)
+            cuts.append((target, False) if row is None else (row, True))
+        cuts.append((height, True))
+
+        for (top, top_clean), (bottom, bottom_clean) in zip(cuts, cuts[1:]):
+            box_top = top if top_clean else max(top - overlap, 0)
+            box_bottom = bottom if bottom_clean else min(bottom + overlap, height)
+            tiles.append({"box": (box_top, box_bottom, left, right), "core": (top, bottom, left, right)})
+    return tiles
+
+
+def merge_tile_words(tiles: list, tile_words: list) -> WordBoxes:
+    """
+    Merge the words recognized in each tile, dropping duplicates at seams
+
+    A word belongs to the tile whose core contains the centre of its box,
+    so words seen by two overlapping tiles are kept once, and fragments cut
+    at a tile's outer edge are dropped in favour of the neighbour's whole
+    word.
+
+    Args:
+        tiles: Tiles from plan_tiles()
+        tile_words: WordBoxes per tile, in page pixel coordinates
+
+    Returns:
+        WordBoxes of the whole page in reading order
+    """
+    kept = []
+    next_line = 0
+    for tile, words in zip(tiles, tile_words):
+        if not len(words):
+            continue
+        top, bottom, left, right = tile["core"]
+        centre_x = words.bbox[:, 0] + words.bbox[:, 2] / 2
+        centre_y = words.bbox[:, 1] + words.bbox[:, 3] / 2
+        inside = (centre_y >= top) & (centre_y < bottom) & (centre_x >= left) & (centre_x < right)
+        words = words.take(np.flatnonzero(inside))
+        if len(words):
+            # Every tile numbers its lines from 0; keep them distinct on the page
+            words.line += next_line - words.line[0]
+            next_line = int(words.line[-1]) + 1
+            kept.append(words)
+    return WordBoxes.concat(kept)
@@ -0,0 +1,103 @@
+"""
+Memory Limits Module
+Process memory measurement and enforcement for bounded-memory extraction
+"""
+
+import ctypes
+import logging
+import os
+import sys
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+
+class MemoryLimitExceeded(MemoryError):
+    """Raised when work can't continue without going over the memory cap"""
+
+
+def current_rss():
+    """
+    Get the resident set size of this process
+
+    Returns:
+        RSS in bytes, or None if it can't be measured on this platform
+    """
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+
+    if sys.platform == "win32":
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [
+                ("cb", ctypes.c_ulong),
+                ("PageFaultCount", ctypes.c_ulong),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        handle = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+            return counters.WorkingSetSize
+        return None
+
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def fit_render_dpi(dpi: float, page_size, max_rss_mb, min_dpi: float, overhead: float = 4.0,
+                   baseline: int = 0):
+    """
+    Pick a render resolution that keeps the process under its memory cap
+
+    Args:
+        dpi: Wanted resolution
+        page_size: Page (width, height) in inches
+        max_rss_mb: Memory cap in MB (None = no cap)
+        min_dpi: Lowest resolution worth OCRing at
+        overhead: Working copies per rendered pixel byte (preprocessing,
+                  Tesseract hand-off, ...)
+        baseline: RSS in bytes not counted against the cap (what a forked
+                  pool worker already shared with its parent when it started)
+
+    Returns:
+        Resolution to render at (dpi itself if it fits)
+
+    Raises:
+        MemoryLimitExceeded: If not even min_dpi fits under the cap
+    """
+    if max_rss_mb is None:
+        return dpi
+    rss = current_rss()
+    if rss is None:
+        return dpi
+
+    width, height = page_size
+    headroom = max_rss_mb * MB - (rss - baseline)
+    needed = width * height * dpi * dpi * overhead
+    if needed <= headroom:
+        return dpi
+
+    # Bytes scale with dpi squared
+    fitted = int(dpi * (max(headroom, 0) / needed) ** 0.5)
+    if fitted < min_dpi:
+        raise MemoryLimitExceeded(
+            f"Rendering a {width:.1f}x{height:.1f} inch page needs about {needed / MB:.0f} MB "
+            f"but only {max(headroom, 0) / MB:.0f} MB of the {max_rss_mb} MB limit is left"
+        )
+    logger.warning(f"Memory limit: rendering at {fitted} dpi instead of {dpi:.0f} dpi")
+    return fitted
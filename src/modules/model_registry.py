@@ -0,0 +1,170 @@
+"""
+Model Registry Module
+Process-wide cache of loaded tokenizers and models, so every simplifier
+(and every Streamlit rerun) shares one copy instead of reloading from disk
+"""
+
+import gc
+import itertools
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+
+def model_nbytes(model) -> int:
+    """Memory held by a model's parameters and buffers, in bytes (0 if unknown)"""
+    if not hasattr(model, "parameters"):
+        return 0
+    buffers = model.buffers() if hasattr(model, "buffers") else []
+    return sum(t.numel() * t.element_size() for t in itertools.chain(model.parameters(), buffers))
+
+
+class ModelRegistry:
+    """
+    Loaded (tokenizer, model) pairs keyed by model name, dtype and device
+
+    Lookups are thread-safe, and a model requested by several threads at
+    once is loaded only once. When the models together exceed the memory
+    budget, the least recently used ones are dropped (the one just loaded
+    always stays).
+    """
+
+    def __init__(self, max_memory_mb: float = None):
+        """
+        Create an empty registry
+
+        Args:
+            max_memory_mb: Memory budget for model weights in MB
+                           (None = keep every model loaded)
+        """
+        self.max_memory_mb = max_memory_mb
+        # {(name, dtype, device): {"tokenizer", "model", "nbytes"}}, oldest first
+        self._entries = OrderedDict()
+        # One lock per model being loaded, so loads of different models
+        # don't wait for each other
+        self._loading = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def make_key(name: str, dtype=None, device: str = "cpu") -> tuple:
+        """Registry key of a model ("default" stands for the checkpoint's own dtype)"""
+        return (name, str(dtype) if dtype is not None else "default", str(device))
+
+    def get(self, name: str, loader, dtype=None, device: str = "cpu") -> tuple:
+        """
+        Get a loaded model, loading it on first use
+
+        Args:
+            name: Model name, e.g. "t5-small"
+            loader: Called as loader(name, dtype, device) to load the model
+                    when it isn't in the registry; returns (tokenizer, model)
+            dtype: Weight dtype, e.g. "float16" (None = as saved)
+            device: Device the model runs on
+
+        Returns:
+            Tuple of (tokenizer, model)
+        """
+        key = self.make_key(name, dtype, device)
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None:
+                return entry["tokenizer"], entry["model"]
+            key_lock = self._loading.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                # Another thread may have loaded it while we waited
+                entry = self._lookup(key)
+                if entry is not None:
+                    return entry["tokenizer"], entry["model"]
+
+            tokenizer, model = loader(name, dtype, device)
+            nbytes = model_nbytes(model)
+            logger.info(f"Loaded model {name} ({nbytes / MB:.0f} MB, {key[1]}, {key[2]})")
+
+            with self._lock:
+                self._misses += 1
+                self._entries[key] = {"tokenizer": tokenizer, "model": model, "nbytes": nbytes}
+                self._loading.pop(key, None)
+                evicted = self._evict()
+
+        if evicted:
+            # Free the weights now rather than whenever the collector runs
+            gc.collect()
+        return tokenizer, model
+
+    def _lookup(self, key: tuple):
+        """Find an entry and mark it most recently used (lock held)"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self._hits += 1
+        return entry
+
+    def _evict(self) -> int:
+        """Drop least recently used models until within budget (lock held)"""
+        if self.max_memory_mb is None:
+            return 0
+        evicted = 0
+        while len(self._entries) > 1 and self._nbytes_locked() > self.max_memory_mb * MB:
+            key, _ = self._entries.popitem(last=False)
+            self._evictions += 1
+            evicted += 1
+            logger.info(f"Unloaded model {key[0]} ({key[1]}, {key[2]}) to stay within the memory budget")
+        return evicted
+
+    def _nbytes_locked(self) -> int:
+        """Memory held by loaded models (lock held)"""
+        return sum(entry["nbytes"] for entry in self._entries.values())
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by loaded models, in bytes"""
+        with self._lock:
+            return self._nbytes_locked()
+
+    def set_budget(self, max_memory_mb: float = None):
+        """Change the memory budget, unloading models that no longer fit"""
+        with self._lock:
+            self.max_memory_mb = max_memory_mb
+            evicted = self._evict()
+        if evicted:
+            gc.collect()
+
+    def clear(self):
+        """Unload every model"""
+        with self._lock:
+            self._entries.clear()
+        gc.collect()
+
+    def stats(self) -> dict:
+        """
+        Get registry statistics
+
+        Returns:
+            Dictionary with models (loaded keys, least recently used first),
+            memory_mb, hits, misses and evictions
+        """
+        with self._lock:
+            return {
+                "models": list(self._entries),
+                "memory_mb": self._nbytes_locked() / MB,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+            }
+
+
+_REGISTRY = ModelRegistry()
+
+
+def get_model_registry() -> ModelRegistry:
+    """The registry shared by the whole process"""
+    return _REGISTRY
@@ -0,0 +1,144 @@
+"""
+OCR Result Cache Module
+Persistent, content-addressed cache of per-page OCR results
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from pathlib import Path
+
+from .sqlite_lru import SQLiteLRUStore
+
+logger = logging.getLogger(__name__)
+
+# Bump when the stored result format or the extraction pipeline changes in a
+# way that makes older entries wrong
+CACHE_FORMAT_VERSION = 1
+
+
+def hash_file(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """
+    Hash a file's contents
+
+    Args:
+        file_path: Path to the file
+        chunk_size: Bytes read at a time (keeps memory flat for large files)
+
+    Returns:
+        SHA-256 hex digest of the file contents
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class OCRCache:
+    """SQLite-backed LRU cache of OCR results keyed by document content and settings"""
+
+    def __init__(self, cache_path: str, max_size_mb: float = 200):
+        """
+        Open (or create) an OCR cache
+
+        Args:
+            cache_path: Path to the SQLite database file
+            max_size_mb: Size limit for stored results; the least recently
+                        used entries are evicted beyond it
+        """
+        self.cache_path = Path(cache_path)
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._store = SQLiteLRUStore(self.cache_path, "ocr_pages", self.max_size_bytes, name="OCR cache")
+
+    @staticmethod
+    def make_key(document_hash: str, page_index: int, settings: dict) -> str:
+        """
+        Build the cache key for one page
+
+        Args:
+            document_hash: Content hash of the source file (see hash_file)
+            page_index: Zero-based page index
+            settings: Everything that affects the result (render scale,
+                     language, Tesseract config, ...)
+
+        Returns:
+            Hex digest identifying the page result
+        """
+        payload = json.dumps(
+            {
+                "version": CACHE_FORMAT_VERSION,
+                "document": document_hash,
+                "page": page_index,
+                "settings": settings,
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str):
+        """
+        Look up a cached result
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            The stored result dictionary, or None on a miss
+        """
+        blob = self._store.get_many([key]).get(key)
+        with self._lock:
+            if blob is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(blob)
+
+    def put(self, key: str, result: dict):
+        """
+        Store a result and evict least recently used entries if over the limit
+
+        Args:
+            key: Cache key from make_key()
+            result: JSON-serializable result dictionary
+        """
+        blob = json.dumps(result)
+        size = len(blob.encode("utf-8"))
+        if size > self.max_size_bytes:
+            logger.warning(f"OCR result of {size} bytes is larger than the whole cache, not storing it")
+            return
+        self._store.put_many({key: blob})
+
+    def stats(self) -> dict:
+        """
+        Get cache statistics
+
+        Returns:
+            Dictionary with hits, misses, hit rate, entry count and size
+        """
+        entries, size = self._store.totals()
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": entries,
+                "size_bytes": size,
+            }
+
+    def clear(self):
+        """Remove every entry and reset the counters"""
+        self._store.clear()
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def close(self):
+        """Close the database connection"""
+        self._store.close()
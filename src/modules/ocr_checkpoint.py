@@ -0,0 +1,139 @@
+"""
+OCR Checkpoint Module
+Append-only files of finished page results, one per document and
+settings, so an interrupted extraction resumes where it stopped
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Checkpoints of runs nobody came back to are removed after this long
+CHECKPOINT_MAX_AGE_DAYS = 7
+
+
+def remove_stale_checkpoints(directory, max_age_days: float = CHECKPOINT_MAX_AGE_DAYS) -> int:
+    """
+    Delete checkpoint files that haven't been written to for a while
+
+    Args:
+        directory: Checkpoint directory
+        max_age_days: Age after which a checkpoint is abandoned
+
+    Returns:
+        Number of files removed
+    """
+    cutoff = time.time() - max_age_days * 24 * 3600
+    removed = 0
+    for path in Path(directory).glob("*.jsonl"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except OSError:
+            # Another process got there first
+            continue
+    if removed:
+        logger.info(f"Removed {removed} stale OCR checkpoints from {directory}")
+    return removed
+
+
+class PageCheckpoint:
+    """
+    Durable record of the pages of one document extracted so far
+
+    Each finished page is appended to the file as one JSON line and
+    flushed to disk straight away, so a crash loses at most the page being
+    written (a torn last line is ignored when loading).
+    """
+
+    def __init__(self, directory, document_hash: str, settings: dict):
+        """
+        Open (but don't create) the checkpoint of a document
+
+        Args:
+            directory: Checkpoint directory
+            document_hash: Content hash of the document (see hash_file)
+            settings: Everything that affects the results; runs with other
+                     settings get a checkpoint of their own
+        """
+        payload = json.dumps({"document": document_hash, "settings": settings}, sort_keys=True, default=str)
+        digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        self.path = Path(directory) / f"{digest}.jsonl"
+        self._file = None
+        self._pages = set()
+        self._lock = threading.Lock()
+
+    def load(self) -> dict:
+        """
+        Read the pages finished by earlier runs
+
+        Returns:
+            {page index: result dictionary}
+        """
+        results = {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        result = json.loads(line)
+                    except ValueError:
+                        # Torn write from a run that died mid-line
+                        continue
+                    results[result["page"]] = result
+        except FileNotFoundError:
+            return {}
+        with self._lock:
+            self._pages.update(results)
+        return results
+
+    def record(self, result: dict):
+        """
+        Append a finished page (pages already recorded are skipped)
+
+        Args:
+            result: JSON-serializable page result with a "page" key
+        """
+        line = json.dumps(result) + "\n"
+        with self._lock:
+            if result["page"] in self._pages:
+                return
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, "a+", encoding="utf-8")
+                if self._file.tell() > 0:
+                    # Don't glue the first new page onto a torn last line
+                    self._file.seek(self._file.tell() - 1)
+                    if self._file.read(1) != "\n":
+                        self._file.write("\n")
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._pages.add(result["page"])
+
+    @property
+    def pages(self) -> set:
+        """Page indices recorded so far"""
+        with self._lock:
+            return set(self._pages)
+
+    def close(self):
+        """Close the file, keeping the checkpoint for a later run"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def discard(self):
+        """Close and delete the checkpoint (the run is complete)"""
+        self.close()
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
@@ -3,91 +3,1629 @@ OCR and Text Extraction Module
 Handles extraction of text from PDF and image files
 """
 
+import numpy as np
 import pytesseract
 from PIL import Image
 try:
     import pypdfium2 as pdfium
+    import pypdfium2.raw as pdfium_c
 except ImportError:
     pdfium = None
     
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterator
+import copy
+import functools
+import gc
+import io
+import itertools
 import logging
+import os
+import shlex
+import subprocess
+import tempfile
+import time
+
+from .image_preprocessing import preprocess_image
+from .image_tiling import MIN_TILE_PIXELS, merge_tile_words, plan_tiles
+from .memory_limits import MB, current_rss, fit_render_dpi
+from .ocr_cache import OCRCache, hash_file
+from .ocr_checkpoint import PageCheckpoint, remove_stale_checkpoints
+from .ocr_profiles import profile_settings
+from .page_fingerprints import PageFingerprints, fingerprint_distance, page_fingerprint
+from .page_layout import BLOCK_GAP_HORIZONTAL, analyze_page, crop_to_text, text_box
+from .pdf_document import LazyPDFDocument, ProgressivePDFDocument
+from .shared_images import SharedImagePool, attach_image
+from .text_scale import load_scaled_image
+from .tiff_document import TiffDocument, is_tiff, recorded_dpi
+from .word_boxes import WordBoxes
 
 logger = logging.getLogger(__name__)
 
+# PDF user space is 72 points per inch, so render scale = dpi / 72
+PDF_POINTS_PER_INCH = 72
+
+# Default resolution for rendering PDF pages (scale=3.0)
+DEFAULT_PDF_DPI = 216
+
+# Lowest resolution pages are rendered at when squeezing under a memory cap
+MIN_BOUNDED_DPI = 100
+
+# Under a memory cap, pdfium's caches are dropped (by reopening the
+# document) once RSS passes this fraction of the cap
+MEMORY_RELEASE_FRACTION = 0.8
+
+# Pages at least this much covered by images are treated as scans...
+SCAN_IMAGE_COVERAGE = 0.5
+
+# ...whose text layer only counts if it covers at least this much of the
+# page, as the hidden layer of an OCR'd scan does. A digital header,
+# footer or watermark stamped on a scan doesn't make its body readable.
+MIN_SCAN_TEXT_COVERAGE = 0.1
+
+# Resolution of the quick first pass of progressive extraction
+PREVIEW_DPI = 100
+
+# Resolution assumed for images that don't record one (typical phone photo)
+ASSUMED_IMAGE_DPI = 300
+
+# Tesseract's separator between pages of a multi-page run
+PAGE_SEPARATOR = "\f"
+
+# Page options that don't change the recognized text (left out of cache keys)
+_NON_RESULT_OPTIONS = {"max_rss_mb", "rss_baseline", "batch_size", "fingerprint_cache"}
+
+# How page images reach Tesseract:
+#   "pytesseract" - via pytesseract, which writes a PNG temp file per call
+#   "pipe"        - raw grayscale PGM over tesseract's stdin, output read from stdout
+TESSERACT_TRANSPORTS = ("pytesseract", "pipe")
+
+# How images reach worker processes (tiles of large images):
+#   "pickle"        - copied through the pool's pipe with each task
+#   "shared_memory" - written once to a recycled shared memory block; tasks
+#                     carry only its name, shape and the tile's box
+WORKER_TRANSPORTS = ("pickle", "shared_memory")
+
+# Columns of Tesseract's TSV output that hold numbers
+_TSV_INT_COLUMNS = {
+    "level", "page_num", "block_num", "par_num", "line_num", "word_num",
+    "left", "top", "width", "height",
+}
+
+# Per-process state for pool workers: the open document is reused across
+# the pages a worker handles instead of re-parsing the PDF for every page
+_WORKER_STATE = {
+    "pdf_path": None,
+    "pdf": None,
+    "fingerprints": None,
+    # RSS when the worker started; only growth beyond it counts against the
+    # worker's share of the memory cap
+    "rss_baseline": 0,
+}
+
+
+def _result_settings(options: dict) -> dict:
+    """The page options that change recognized text (used in cache keys)"""
+    return {k: v for k, v in options.items() if k not in _NON_RESULT_OPTIONS}
+
+
+def _stored_result(result: dict) -> dict:
+    """A page result in JSON-serializable form, for the cache or a checkpoint"""
+    if result.get("words") is not None:
+        return {**result, "words": result["words"].to_dict()}
+    return result
+
+
+def _restore_result(result: dict) -> dict:
+    """Undo _stored_result()"""
+    if result.get("words") is not None:
+        result["words"] = WordBoxes.from_dict(result["words"])
+    return result
+
+
+def _report_results(on_result, future):
+    """Done-callback passing a finished page (or batch of pages) to on_result"""
+    if future.cancelled() or future.exception() is not None:
+        # The failure surfaces when the future's result is read
+        return
+    results = future.result()
+    for result in (results if isinstance(results, list) else [results]):
+        on_result(result)
+
+
+def _line_results(words: WordBoxes) -> list:
+    """Lines of recognized words with their mean word confidence"""
+    return [
+        {"text": line, "confidence": round(float(confidence), 1)}
+        for line, confidence in zip(words.lines(), words.line_confidences())
+    ]
+
+
+def _clean_text(text: str) -> str:
+    """Collapse newlines and repeated whitespace into single spaces"""
+    return " ".join(text.split())
+
+
+def _init_ocr_worker(tesseract_cmd=None, tesseract_threads: int = 1):
+    """
+    Initializer for OCR pool workers
+    
+    Args:
+        tesseract_cmd: Path to tesseract executable (spawned workers do not
+                       inherit the parent's pytesseract setting)
+        tesseract_threads: OpenMP thread limit for each tesseract process
+    """
+    # Tesseract spawns its own OpenMP threads; with one worker per core that
+    # oversubscribes the machine, so cap it per worker
+    os.environ["OMP_THREAD_LIMIT"] = str(tesseract_threads)
+    if tesseract_cmd:
+        pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+    # A forked worker starts out with the parent's whole RSS (shared
+    # copy-on-write), which isn't memory it uses
+    _WORKER_STATE["rss_baseline"] = current_rss() or 0
+
+
+def _is_usable_text_layer(text: str, min_chars: int) -> bool:
+    """
+    Decide whether a page's embedded text layer can be trusted
+    
+    Pages with no text layer (scans) come back empty. Broken layers, such
+    as fonts without a usable ToUnicode map, show up as replacement
+    characters, private-use glyphs or runs of symbols instead of words.
+    """
+    chars = [c for c in text if not c.isspace()]
+    if len(chars) < min_chars:
+        return False
+    
+    garbage = sum(
+        1 for c in chars
+        if c == "\ufffd" or "\ue000" <= c <= "\uf8ff" or ord(c) < 32
+    )
+    if garbage / len(chars) > 0.05:
+        return False
+    
+    alphanumeric = sum(1 for c in chars if c.isalnum())
+    return alphanumeric / len(chars) >= 0.5
+
+
+def _is_scan_with_partial_text(page) -> bool:
+    """
+    True if a pdfium page is mostly a scanned image with only a little text on it
+    
+    Such a page's text layer (a header, footer or watermark) leaves the
+    scanned body out, so the page has to be OCR'd.
+    """
+    width, height = page.get_size()
+    page_area = width * height
+    if page_area <= 0:
+        return False
+    
+    image_area = text_area = 0.0
+    for obj in page.get_objects(max_depth=1):
+        if obj.type not in (pdfium_c.FPDF_PAGEOBJ_IMAGE, pdfium_c.FPDF_PAGEOBJ_TEXT):
+            continue
+        left, bottom, right, top = obj.get_bounds()
+        area = max(right - left, 0) * max(top - bottom, 0)
+        if obj.type == pdfium_c.FPDF_PAGEOBJ_IMAGE:
+            image_area += area
+        else:
+            text_area += area
+    return image_area / page_area >= SCAN_IMAGE_COVERAGE and text_area / page_area < MIN_SCAN_TEXT_COVERAGE
+
+
+def _read_text_layer(page) -> str:
+    """Read the embedded text of a pdfium page (empty if there is none)"""
+    textpage = page.get_textpage()
+    try:
+        return textpage.get_text_range()
+    finally:
+        textpage.close()
+
+
+def _render_page(page, dpi: float) -> np.ndarray:
+    """
+    Render a pdfium page in grayscale at the given resolution
+    
+    Returns:
+        2-D uint8 array (height x width) sharing memory with the bitmap
+    """
+    bitmap = page.render(scale=dpi / PDF_POINTS_PER_INCH, grayscale=True)
+    image = bitmap.to_numpy()
+    # The pixel buffer is owned by Python and stays alive with the array;
+    # only pdfium's bitmap handle is released here
+    bitmap.close()
+    return image
+
+
+def _embedded_scan(page, dpi: float):
+    """
+    Get the scanned image a page consists of, at its own resolution
+    
+    Scanned PDFs usually hold each page as one JPEG or CCITT image.
+    Decoding that image directly skips rendering and the resampling that
+    comes with it. Images scanned at two or more times the requested DPI
+    are reduced by a whole factor to stay close to it.
+    
+    Args:
+        page: pdfium page
+        dpi: Requested resolution
+        
+    Returns:
+        Tuple of (image, dpi, origin) with the 2-D uint8 grayscale image,
+        its resolution and the (left, top) of the image on the page in its
+        own pixels; None if the page is anything but a single upright image
+        (it has to be rendered)
+    """
+    if page.get_rotation() != 0:
+        return None
+    objects = list(itertools.islice(page.get_objects(max_depth=1), 2))
+    if len(objects) != 1 or objects[0].type != pdfium_c.FPDF_PAGEOBJ_IMAGE:
+        return None
+    
+    image_obj = objects[0]
+    matrix = image_obj.get_matrix()
+    if matrix.b or matrix.c or matrix.a <= 0 or matrix.d <= 0:
+        return None
+    # Stencil masks are painted in the fill colour; their pixels aren't the page
+    if image_obj.get_metadata().colorspace == pdfium_c.FPDF_COLORSPACE_UNKNOWN:
+        return None
+    width, height = image_obj.get_px_size()
+    native_dpi = width * PDF_POINTS_PER_INCH / matrix.a
+    # Non-square pixels would need resampling anyway
+    if abs(height * PDF_POINTS_PER_INCH / matrix.d - native_dpi) > 0.02 * native_dpi:
+        return None
+    
+    # convert() copies the pixels, so pdfium's bitmap is freed on return
+    image = image_obj.get_bitmap(render=False).to_pil().convert("L")
+    factor = int(native_dpi // dpi)
+    if factor >= 2:
+        image = image.reduce(factor)
+        native_dpi /= factor
+    
+    _, page_height = page.get_size()
+    scale = native_dpi / PDF_POINTS_PER_INCH
+    origin = (round(matrix.e * scale), round((page_height - matrix.f - matrix.d) * scale))
+    return np.asarray(image), round(native_dpi), origin
+
+
+def _prepare_image(image: np.ndarray, options: dict) -> np.ndarray:
+    """Apply the configured preprocessing (if any) to a grayscale page image"""
+    if options["preprocessing"] is not None:
+        image = preprocess_image(image, options["preprocessing"])
+    return image
+
+
+def _render_for_ocr(page, dpi: float, options: dict) -> dict:
+    """
+    Render a page and get it ready for Tesseract
+    
+    With native images on, pdfium pages that are a single scanned image
+    are decoded at the image's own resolution instead of being rendered.
+    
+    With non-text skipping on, blank and figure-only pages are detected
+    here and figures are cut out of text pages before preprocessing.
+    
+    Under a memory cap the page may be rendered below the requested DPI.
+    
+    Returns:
+        Dictionary with:
+            image: Image for Tesseract (None for pages with no text to
+                   recognize)
+            layout: Page analysis (None when skipping is off)
+            dpi: Resolution actually rendered (or scanned) at
+            origin: (left, top) of the image on the page, in its pixels
+            native_image: True if the page's embedded image was used
+    """
+    # TIFF frames are scans already, with no embedded image objects to read
+    use_embedded = options["native_images"] and pdfium is not None and isinstance(page, pdfium.PdfPage)
+    embedded = _embedded_scan(page, dpi) if use_embedded else None
+    if embedded is not None:
+        image, dpi, origin = embedded
+    else:
+        width, height = page.get_size()
+        page_inches = (width / PDF_POINTS_PER_INCH, height / PDF_POINTS_PER_INCH)
+        dpi = fit_render_dpi(
+            dpi, page_inches, options["max_rss_mb"], MIN_BOUNDED_DPI, baseline=options["rss_baseline"]
+        )
+        image = _render_page(page, dpi)
+        origin = (0, 0)
+    
+    rendered = {"image": None, "layout": None, "dpi": dpi, "origin": origin, "native_image": embedded is not None}
+    if options["skip_non_text"]:
+        layout = analyze_page(image, dpi)
+        rendered["layout"] = layout
+        if layout["kind"] != "text":
+            return rendered
+        # Remember where the crop sits on the page to place word boxes
+        top, _, left, _ = text_box(image, layout)
+        rendered["origin"] = (origin[0] + left, origin[1] + top)
+        image = crop_to_text(image, layout)
+    rendered["image"] = _prepare_image(image, options)
+    return rendered
+
+
+def _run_tesseract_stdin(payload, dpi, options: dict, tsv: bool = False, extra_args=()) -> str:
+    """
+    Run tesseract on an encoded image streamed in over stdin
+    
+    Args:
+        payload: Image file contents (PGM, multi-page TIFF, ...)
+        dpi: Image resolution (None if unknown)
+        options: Page options with "lang" and "tesseract_config"
+        tsv: Ask for TSV word data instead of plain text
+        extra_args: More command-line options for this run
+        
+    Returns:
+        Tesseract's stdout
+    """
+    cmd = [pytesseract.pytesseract.tesseract_cmd, "stdin", "stdout"]
+    if dpi:
+        cmd += ["--dpi", str(int(round(dpi)))]
+    if options["lang"]:
+        cmd += ["-l", options["lang"]]
+    if options["tesseract_config"]:
+        cmd += shlex.split(options["tesseract_config"], posix=os.name != "nt")
+    cmd += list(extra_args)
+    if tsv:
+        cmd.append("tsv")
+    
+    try:
+        proc = subprocess.run(
+            cmd,
+            input=payload,
+            capture_output=True,
+            creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
+        )
+    except FileNotFoundError:
+        raise pytesseract.TesseractNotFoundError()
+    
+    if proc.returncode:
+        raise pytesseract.TesseractError(proc.returncode, proc.stderr.decode("utf-8", "replace").strip())
+    return proc.stdout.decode("utf-8")
+
+
+def _run_tesseract_pipe(image: np.ndarray, dpi, options: dict, tsv: bool = False) -> str:
+    """
+    Run tesseract on a grayscale array, streaming it in as PGM over stdin
+    
+    Skips pytesseract's PNG encode, temp files and re-decode: the only copy
+    made is the pixel rows into the stdin payload.
+    
+    Args:
+        image: 2-D uint8 grayscale array
+        dpi: Image resolution (None if unknown)
+        options: Page options with "lang" and "tesseract_config"
+        tsv: Ask for TSV word data instead of plain text
+        
+    Returns:
+        Tesseract's stdout
+    """
+    height, width = image.shape
+    header = f"P5\n{width} {height}\n255\n".encode("ascii")
+    payload = bytearray(len(header) + image.size)
+    payload[:len(header)] = header
+    np.frombuffer(payload, dtype=np.uint8, offset=len(header)).reshape(height, width)[:] = image
+    return _run_tesseract_stdin(payload, dpi, options, tsv)
+
+
+def _multipage_tiff(images: list, dpi) -> bytes:
+    """Pack grayscale arrays into one uncompressed multi-page TIFF"""
+    frames = [Image.fromarray(image) for image in images]
+    buffer = io.BytesIO()
+    save_options = {"dpi": (dpi, dpi)} if dpi else {}
+    frames[0].save(buffer, format="TIFF", save_all=True, append_images=frames[1:], **save_options)
+    return buffer.getvalue()
+
+
+def _split_tsv_pages(data: dict, num_pages: int) -> list:
+    """Split parsed TSV output of a multi-page run into one dict of columns per page"""
+    rows = [[] for _ in range(num_pages)]
+    for row, page_num in enumerate(data.get("page_num", [])):
+        rows[page_num - 1].append(row)
+    return [{column: [values[r] for r in page_rows] for column, values in data.items()} for page_rows in rows]
+
+
+def _tesseract_batch(images: list, dpi, options: dict, tsv: bool = False) -> list:
+    """
+    Recognize several page images with a single Tesseract process
+    
+    The pages go in as one multi-page TIFF over stdin, so process start-up
+    and language model loading are paid once per batch instead of once per
+    page.
+    
+    Args:
+        images: 2-D uint8 grayscale arrays, all rendered at `dpi`
+        dpi: Resolution of the images
+        options: Page options with "lang" and "tesseract_config"
+        tsv: Return word data (dicts of columns) instead of text
+        
+    Returns:
+        One text string, or one dict of word data columns, per image
+    """
+    # Tesseract ends every page with the page separator; pin it so a custom
+    # one in tesseract_config can't break the split
+    output = _run_tesseract_stdin(
+        _multipage_tiff(images, dpi), dpi, options, tsv, extra_args=["-c", f"page_separator={PAGE_SEPARATOR}"]
+    )
+    if tsv:
+        return _split_tsv_pages(_parse_tsv(output), len(images))
+    
+    pages = output.split(PAGE_SEPARATOR)
+    if len(pages) < len(images):
+        raise pytesseract.TesseractError(0, f"Expected {len(images)} pages from Tesseract, got {len(pages)}")
+    return pages[:len(images)]
+
+
+def _parse_tsv(tsv: str) -> dict:
+    """Parse Tesseract TSV output into a dict of columns (like Output.DICT)"""
+    lines = tsv.splitlines()
+    if not lines:
+        return {"text": [], "conf": []}
+    
+    columns = lines[0].split("\t")
+    data = {column: [] for column in columns}
+    for line in lines[1:]:
+        values = line.split("\t")
+        # Rows without a word leave the trailing text column off
+        values += [""] * (len(columns) - len(values))
+        for column, value in zip(columns, values):
+            if column in _TSV_INT_COLUMNS:
+                value = int(value)
+            elif column == "conf":
+                value = float(value)
+            data[column].append(value)
+    return data
+
+
+def _tesseract_to_string(image: np.ndarray, dpi, options: dict) -> str:
+    """Recognize the text in a grayscale array with the configured transport"""
+    if options["tesseract_transport"] == "pipe":
+        return _run_tesseract_pipe(image, dpi, options)
+    return pytesseract.image_to_string(
+        Image.fromarray(image), lang=options["lang"], config=options["tesseract_config"]
+    )
+
+
+def _tesseract_to_data(image: np.ndarray, dpi, options: dict) -> dict:
+    """Get Tesseract's word-level data for a grayscale array with the configured transport"""
+    if options["tesseract_transport"] == "pipe":
+        return _parse_tsv(_run_tesseract_pipe(image, dpi, options, tsv=True))
+    return pytesseract.image_to_data(
+        Image.fromarray(image),
+        lang=options["lang"],
+        config=options["tesseract_config"],
+        output_type=pytesseract.Output.DICT,
+    )
+
+
+def _words_and_confidence(data: dict):
+    """
+    Get the recognized text and mean word confidence from Tesseract's word data
+    
+    Returns:
+        Tuple of (text, confidence); confidence is None if no words were found
+    """
+    words = []
+    confidences = []
+    for word, conf in zip(data["text"], data["conf"]):
+        # Non-word rows (blocks, lines, ...) have conf -1 and no text
+        if word.strip() and float(conf) >= 0:
+            words.append(word)
+            confidences.append(float(conf))
+    
+    confidence = sum(confidences) / len(confidences) if confidences else None
+    return " ".join(words), confidence
+
+
+def _ocr_with_confidence(image: np.ndarray, dpi, options: dict):
+    """
+    Run Tesseract and return the recognized text with its mean word confidence
+    
+    Returns:
+        Tuple of (text, confidence, data); confidence is None if no words
+        were found and data is Tesseract's word data
+    """
+    data = _tesseract_to_data(image, dpi, options)
+    text, confidence = _words_and_confidence(data)
+    return text, confidence, data
+
+
+def _start_pdf_page(page, page_index: int, options: dict) -> dict:
+    """
+    First stage of extracting a page: text layer check and render
+    
+    Returns:
+        The finished page result if the text layer was usable, otherwise
+        an OCR job (see _render_job) waiting to be recognized
+    """
+    start = time.perf_counter()
+    
+    if options["use_text_layer"]:
+        text = _read_text_layer(page)
+        # TIFF frames have no text layer, so only pdfium pages get this far
+        if _is_usable_text_layer(text, options["min_text_layer_chars"]) and not _is_scan_with_partial_text(page):
+            return {
+                "page": page_index,
+                "text": _clean_text(text),
+                "source": "text_layer",
+                "dpi": None,
+                "confidence": None,
+                "skipped": None,
+                "regions_skipped": 0,
+                "memory_limited": False,
+                "duplicate": False,
+                "native_image": False,
+                "rss_mb": None,
+                # Text layers carry no OCR word data
+                "lines": None,
+                "words": None,
+                "ocr_time": time.perf_counter() - start,
+            }
+    
+    job = {"page": page_index, "start": start, "text": "", "confidence": None, "data": None}
+    _render_job(page, job, options["draft_dpi"] or options["dpi"], options)
+    job["draft"] = bool(options["draft_dpi"])
+    return job
+
+
+def _render_job(page, job: dict, dpi, options: dict):
+    """Render a page for an OCR job, recording what the render found"""
+    # Let go of any earlier render before making a new one
+    job["image"] = None
+    rendered = _render_for_ocr(page, dpi, options)
+    image, layout = rendered["image"], rendered["layout"]
+    job["image"] = image
+    job["layout"] = layout
+    job["dpi"] = rendered["dpi"]
+    job["origin"] = rendered["origin"]
+    job["native_image"] = rendered["native_image"]
+    # Scans are used at whatever resolution they were made at
+    job["memory_limited"] = job["dpi"] < dpi and not job["native_image"]
+    job["skipped"] = layout["kind"] if image is None and layout else None
+    job["regions_skipped"] = len(layout["figure_blocks"]) if layout and image is not None else 0
+    job["draft"] = False
+    job["duplicate"] = False
+
+
+def _skip_duplicates(jobs: list, fingerprints: PageFingerprints) -> tuple:
+    """
+    Fill in jobs whose page has been recognized before
+    
+    Returns:
+        Tuple of (jobs still to recognize, [(job, original job), ...] for
+        repeats of a page earlier in this same list)
+    """
+    todo = []
+    repeats = []
+    for job in jobs:
+        job["fingerprint"] = page_fingerprint(job["image"])
+        job["shape"] = job["image"].shape
+        result = fingerprints.find(job["fingerprint"], job["dpi"], job["shape"])
+        if result is not None:
+            job.update(text=result["text"], confidence=result["confidence"], data=result["data"], duplicate=True)
+            job["image"] = None
+            continue
+        
+        original = next(
+            (
+                other for other in todo
+                if other["dpi"] == job["dpi"] and other["shape"] == job["shape"]
+                and fingerprint_distance(other["fingerprint"], job["fingerprint"]) <= fingerprints.max_distance
+            ),
+            None,
+        )
+        if original is None:
+            todo.append(job)
+        else:
+            repeats.append((job, original))
+    return todo, repeats
+
+
+def _recognize_jobs(jobs: list, options: dict, fingerprints: PageFingerprints = None):
+    """
+    Run Tesseract on the rendered images of OCR jobs
+    
+    A single job goes through the configured transport; several jobs are
+    recognized together in one Tesseract process per resolution. With
+    fingerprints given, pages that look the same as one already recognized
+    reuse its text instead of going to Tesseract.
+    """
+    jobs = [job for job in jobs if job["image"] is not None]
+    # Confidences drive the draft pass and line reports, word boxes need positions
+    with_data = bool(options["draft_dpi"]) or options["word_boxes"] or options["line_confidence"]
+    
+    repeats = []
+    if fingerprints is not None:
+        jobs, repeats = _skip_duplicates(jobs, fingerprints)
+    
+    if len(jobs) == 1:
+        job = jobs[0]
+        if with_data:
+            job["text"], job["confidence"], job["data"] = _ocr_with_confidence(job["image"], job["dpi"], options)
+        else:
+            job["text"] = _tesseract_to_string(job["image"], job["dpi"], options)
+    elif jobs:
+        by_dpi = {}
+        for job in jobs:
+            by_dpi.setdefault(job["dpi"], []).append(job)
+        for dpi, group in by_dpi.items():
+            outputs = _tesseract_batch([job["image"] for job in group], dpi, options, tsv=with_data)
+            for job, output in zip(group, outputs):
+                if with_data:
+                    job["text"], job["confidence"] = _words_and_confidence(output)
+                    job["data"] = output
+                else:
+                    job["text"] = output
+    
+    for job in jobs:
+        job["image"] = None
+        if fingerprints is not None:
+            result = {"text": job["text"], "confidence": job["confidence"], "data": job["data"]}
+            fingerprints.add(job["fingerprint"], job["dpi"], job["shape"], result)
+    for job, original in repeats:
+        job.update(text=original["text"], confidence=original["confidence"], data=original["data"], duplicate=True)
+        job["image"] = None
+
+
+def _needs_rerender(job: dict, options: dict) -> bool:
+    """True for draft renders whose OCR confidence is too low to keep"""
+    # Pages with no words at all are blank, a sharper render won't help
+    if not job["draft"] or job["confidence"] is None or job["confidence"] >= options["min_confidence"]:
+        return False
+    logger.info(
+        f"Page {job['page'] + 1} confidence {job['confidence']:.0f} at {job['dpi']:.0f} dpi, "
+        f"re-rendering at {options['dpi']} dpi"
+    )
+    return True
+
+
+def _finish_job(job: dict, options: dict) -> dict:
+    """Turn a recognized OCR job into a page result"""
+    words = None
+    if options["word_boxes"] or options["line_confidence"]:
+        words = WordBoxes.empty()
+        if job["data"] is not None:
+            words = WordBoxes.from_tesseract(
+                job["data"], job["page"], PDF_POINTS_PER_INCH / job["dpi"], job["origin"]
+            )
+    
+    rss = current_rss()
+    return {
+        "page": job["page"],
+        "text": _clean_text(job["text"]),
+        "source": "ocr",
+        "dpi": job["dpi"],
+        "confidence": job["confidence"],
+        "skipped": job["skipped"],
+        "regions_skipped": job["regions_skipped"],
+        "memory_limited": job["memory_limited"],
+        "duplicate": job["duplicate"],
+        "native_image": job["native_image"],
+        "rss_mb": rss / MB if rss is not None else None,
+        "lines": _line_results(words) if options["line_confidence"] else None,
+        "words": words if options["word_boxes"] else None,
+        "ocr_time": time.perf_counter() - job["start"],
+    }
+
+
+def _ocr_pdf_page(page, page_index: int, options: dict, fingerprints: PageFingerprints = None) -> dict:
+    """
+    Extract the text of a single pdfium page
+    
+    Born-digital pages are read straight from their text layer; pages
+    without a usable one are rendered and run through Tesseract. With a
+    draft DPI set, pages are first OCR'd at that cheaper resolution and
+    only re-rendered at full DPI if Tesseract's mean confidence is low.
+    With non-text skipping on, blank and figure-only pages never reach
+    Tesseract and figures are cut out of the pages that do. With
+    fingerprints given, repeats of an already recognized page reuse its
+    text.
+    
+    Args:
+        page: pdfium page
+        page_index: Zero-based page index
+        options: Page options from OCRExtractor._page_options()
+        fingerprints: PageFingerprints of the pages recognized so far
+                      (None = OCR every page)
+    
+    Returns:
+        Page result dictionary with the page index, cleaned text, where the
+        text came from ("text_layer" or "ocr"), the render DPI and mean OCR
+        confidence (None where not applicable), why OCR was skipped
+        ("blank", "image" or None), how many figure regions were cut out,
+        whether a memory cap forced a lower DPI, whether the text was reused
+        from a duplicate page, whether the embedded scan was used instead of
+        a render, process RSS after the page
+        (MB, if measurable), word boxes (if enabled) and the time spent on
+        this page in seconds
+    """
+    job = _start_pdf_page(page, page_index, options)
+    if "source" in job:
+        return job
+    
+    _recognize_jobs([job], options, fingerprints)
+    if _needs_rerender(job, options):
+        _render_job(page, job, options["dpi"], options)
+        _recognize_jobs([job], options, fingerprints)
+    return _finish_job(job, options)
+
+
+def _extract_page_at(pdf, page_index: int, options: dict, fingerprints: PageFingerprints = None) -> dict:
+    """Load, extract and explicitly release one page of an open document"""
+    page = pdf[page_index]
+    try:
+        return _ocr_pdf_page(page, page_index, options, fingerprints)
+    finally:
+        page.close()
+
+
+def _extract_pages_at(pdf, page_indices: list, options: dict, fingerprints: PageFingerprints = None) -> list:
+    """
+    Extract several pages of an open document with one Tesseract run
+    
+    All pages are rendered first, so a batch holds every page image in
+    memory until Tesseract has read them.
+    
+    Args:
+        pdf: Open pdfium document
+        page_indices: Zero-based indices of the pages in this batch
+        options: Page options from OCRExtractor._page_options()
+        fingerprints: PageFingerprints of the pages recognized so far
+                      (None = OCR every page)
+        
+    Returns:
+        Page result dictionaries in the order of page_indices
+    """
+    if len(page_indices) == 1:
+        return [_extract_page_at(pdf, page_indices[0], options, fingerprints)]
+    
+    results = {}
+    jobs = []
+    for i in page_indices:
+        page = pdf[i]
+        try:
+            job = _start_pdf_page(page, i, options)
+        finally:
+            page.close()
+        if "source" in job:
+            results[i] = job
+        else:
+            jobs.append(job)
+    
+    _recognize_jobs(jobs, options, fingerprints)
+    
+    redo = [job for job in jobs if _needs_rerender(job, options)]
+    for job in redo:
+        page = pdf[job["page"]]
+        try:
+            _render_job(page, job, options["dpi"], options)
+        finally:
+            page.close()
+    _recognize_jobs(redo, options, fingerprints)
+    
+    for job in jobs:
+        results[job["page"]] = _finish_job(job, options)
+    return [results[i] for i in page_indices]
+
+
+def _batches(items: list, size: int) -> list:
+    """Split a list into consecutive chunks of at most `size` items"""
+    size = max(1, size)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _should_release_memory(options: dict) -> bool:
+    """True when a memory-capped run is getting close to its cap"""
+    if options["max_rss_mb"] is None:
+        return False
+    rss = current_rss()
+    if rss is None:
+        return False
+    return rss - options["rss_baseline"] > options["max_rss_mb"] * MB * MEMORY_RELEASE_FRACTION
+
+
+def _open_document(path: str):
+    """
+    Open a document for page-by-page extraction
+    
+    Returns:
+        pdfium document, or a TiffDocument for multi-frame TIFFs (one page
+        per frame)
+    """
+    if is_tiff(path):
+        return TiffDocument(path, default_dpi=ASSUMED_IMAGE_DPI)
+    if pdfium is None:
+        raise ImportError("pypdfium2 is not installed. Please install it with 'pip install pypdfium2'")
+    return pdfium.PdfDocument(path)
+
+
+def _worker_document(pdf_path: str):
+    """Get this pool worker's open copy of a PDF, opening it if needed"""
+    if _WORKER_STATE["pdf_path"] != pdf_path:
+        if _WORKER_STATE["pdf"] is not None:
+            _WORKER_STATE["pdf"].close()
+        _WORKER_STATE["pdf"] = _open_document(pdf_path)
+        _WORKER_STATE["pdf_path"] = pdf_path
+        # Fingerprints are per document (other documents are in the cache)
+        _WORKER_STATE["fingerprints"] = None
+    return _WORKER_STATE["pdf"]
+
+
+def _worker_fingerprints(pdf_path: str, options: dict):
+    """
+    Get this pool worker's fingerprints of the pages it has recognized
+    
+    Pages recognized by other workers are found through the OCR cache,
+    which each worker opens for itself.
+    
+    Returns:
+        PageFingerprints, or None with duplicate skipping off
+    """
+    if options["duplicate_distance"] is None:
+        return None
+    if _WORKER_STATE["fingerprints"] is None:
+        cache = None
+        if options["fingerprint_cache"] is not None:
+            cache = OCRCache(*options["fingerprint_cache"])
+        _WORKER_STATE["fingerprints"] = PageFingerprints(
+            options["duplicate_distance"], cache, _result_settings(options)
+        )
+    return _WORKER_STATE["fingerprints"]
+
+
+def _ocr_shared_tile_worker(handle: dict, box: tuple, dpi, options: dict) -> dict:
+    """Process pool entry point: recognize one tile of an image in shared memory"""
+    top, bottom, left, right = box
+    return _tesseract_to_data(attach_image(handle)[top:bottom, left:right], dpi, options)
+
+
+def _release_worker_memory(pdf_path: str, options: dict):
+    """Drop the worker's pdfium caches if it is getting close to its memory cap"""
+    if _should_release_memory(options):
+        # Reopening drops everything pdfium has cached for this document
+        _WORKER_STATE["pdf"].close()
+        gc.collect()
+        _WORKER_STATE["pdf"] = _open_document(pdf_path)
+
+
+def _worker_options(options: dict) -> dict:
+    """Page options with this worker's RSS baseline filled in"""
+    return {**options, "rss_baseline": _WORKER_STATE["rss_baseline"]}
+
+
+def _ocr_pdf_page_worker(pdf_path: str, page_index: int, options: dict) -> dict:
+    """Process pool entry point: extract one page of a PDF by index"""
+    options = _worker_options(options)
+    result = _extract_page_at(_worker_document(pdf_path), page_index, options, _worker_fingerprints(pdf_path, options))
+    _release_worker_memory(pdf_path, options)
+    return result
+
+
+def _ocr_pdf_batch_worker(pdf_path: str, page_indices: list, options: dict) -> list:
+    """Process pool entry point: extract a batch of PDF pages with one Tesseract run"""
+    options = _worker_options(options)
+    results = _extract_pages_at(
+        _worker_document(pdf_path), page_indices, options, _worker_fingerprints(pdf_path, options)
+    )
+    _release_worker_memory(pdf_path, options)
+    return results
+
 
 class OCRExtractor:
     """Extract text from images and PDFs using Tesseract OCR"""
     
-    def __init__(self, tesseract_path=None):
+    def __init__(self, tesseract_path=None, num_workers: int = 1, tesseract_threads: int = 1,
+                 use_text_layer: bool = True, min_text_layer_chars: int = 20,
+                 lang: str = None, tesseract_config: str = "", cache: OCRCache = None,
+                 dpi: int = DEFAULT_PDF_DPI, draft_dpi: int = None, min_confidence: float = 80,
+                 tesseract_transport: str = "pytesseract", preprocessing: dict = None,
+                 skip_non_text: bool = False, max_rss_mb: float = None, word_boxes: bool = False,
+                 batch_size: int = 1, tile_megapixels: float = None, duplicate_distance: int = None,
+                 native_images: bool = False, worker_transport: str = "pickle", checkpoint_dir=None,
+                 target_x_height: float = None, line_confidence: bool = False):
         """
         Initialize OCR Extractor
         
         Args:
             tesseract_path: Path to tesseract executable (optional)
+            num_workers: Number of worker processes for PDF pages
+                        (1 = sequential, 0 = one per CPU core)
+            tesseract_threads: OpenMP thread limit for each tesseract process
+                              when running in parallel
+            use_text_layer: Read born-digital PDF pages from their embedded
+                           text instead of running OCR on them
+            min_text_layer_chars: Fewest non-space characters a text layer
+                                 needs before it is trusted over OCR
+            lang: Tesseract language string, e.g. "eng" or "eng+fra"
+                 (default: Tesseract's own default)
+            tesseract_config: Extra Tesseract command-line options
+            cache: OCRCache for reusing results of previously seen files
+            dpi: Resolution for rendering PDF pages to OCR
+            draft_dpi: Lower resolution for a cheap first OCR pass; pages are
+                      only re-rendered at `dpi` when it isn't good enough
+                      (None = always render at `dpi`)
+            min_confidence: Mean Tesseract word confidence (0-100) a draft
+                           pass needs to be kept
+            tesseract_transport: How images reach Tesseract: "pytesseract"
+                                (temp files) or "pipe" (raw PGM over stdin)
+            preprocessing: Image cleanup steps to run before OCR (see
+                          image_preprocessing.DEFAULT_PREPROCESSING; {} for
+                          the defaults, None to disable)
+            skip_non_text: Don't OCR blank or figure-only PDF pages, and cut
+                          figures out of text pages before OCR
+            max_rss_mb: Memory cap for PDF extraction in MB, on top of what
+                       the process uses when extraction starts; pages are
+                       rendered at lower DPI, pdfium caches are dropped and
+                       page text is spilled to disk to stay under it
+                       (None = no cap)
+            word_boxes: Keep word positions, lines and confidences of OCR'd
+                       PDF pages as WordBoxes in each page result (boxes are
+                       relative to the preprocessed image when preprocessing
+                       crops or deskews)
+            batch_size: PDF pages recognized per Tesseract process; above 1,
+                       pages are sent as one multi-page TIFF over stdin so
+                       start-up and model loading are paid once per batch
+                       (1 = one Tesseract run per page)
+            tile_megapixels: Images at least this large are cut into tiles
+                            along whitespace gutters and recognized by
+                            num_workers processes at once (None = never tile)
+            duplicate_distance: Reuse the text of pages whose perceptual
+                               fingerprint differs from an already OCR'd
+                               page (in this document or the cache) by at
+                               most this many bits (None = OCR every page,
+                               0 = only identical-looking pages)
+            native_images: OCR scanned PDF pages that are a single embedded
+                          image straight from that image at its own
+                          resolution; other pages are still rendered
+            worker_transport: How image tiles reach worker processes:
+                             "pickle" (through the pool's pipe) or
+                             "shared_memory" (recycled shared buffers; only
+                             a handle is sent)
+            checkpoint_dir: Directory for page checkpoints; each finished
+                           PDF page is written there at once, and a run
+                           interrupted part way (crash, restart, cancelled
+                           generator) resumes with only the missing pages
+                           (None = no checkpoints)
+            target_x_height: Shrink image files whose lowercase letters are
+                            taller than this many pixels before OCR (JPEGs
+                            are decoded at reduced size); accuracy doesn't
+                            improve past it, only time (None = OCR images at
+                            their own resolution)
+            line_confidence: Report every OCR'd line with its mean word
+                            confidence ("lines" in page results and
+                            extract_image_result()), so unreliable lines can
+                            be kept away from later processing
         """
+        if tesseract_transport not in TESSERACT_TRANSPORTS:
+            raise ValueError(f"Unsupported Tesseract transport: {tesseract_transport}")
+        if worker_transport not in WORKER_TRANSPORTS:
+            raise ValueError(f"Unsupported worker transport: {worker_transport}")
+        
+        self.tesseract_path = tesseract_path
+        self.num_workers = num_workers
+        self.tesseract_threads = tesseract_threads
+        self.use_text_layer = use_text_layer
+        self.min_text_layer_chars = min_text_layer_chars
+        self.lang = lang
+        self.tesseract_config = tesseract_config
+        self.cache = cache
+        self.dpi = dpi
+        self.draft_dpi = draft_dpi
+        self.min_confidence = min_confidence
+        self.tesseract_transport = tesseract_transport
+        self.preprocessing = preprocessing
+        self.skip_non_text = skip_non_text
+        self.max_rss_mb = max_rss_mb
+        self.word_boxes = word_boxes
+        self.batch_size = batch_size
+        self.tile_megapixels = tile_megapixels
+        self.duplicate_distance = duplicate_distance
+        self.native_images = native_images
+        self.worker_transport = worker_transport
+        # Shared memory blocks for worker_transport="shared_memory",
+        # created on first use and recycled across images
+        self._image_pool = None
+        self.checkpoint_dir = checkpoint_dir
+        self.target_x_height = target_x_height
+        self.line_confidence = line_confidence
+        if checkpoint_dir is not None:
+            Path(checkpoint_dir).mkdir(parents=True, exist_ok=True)
+            remove_stale_checkpoints(checkpoint_dir)
+        
+        # Summary of the most recent PDF extraction (see iter_pdf_pages)
+        self.last_stats = {}
+        
         if tesseract_path:
             pytesseract.pytesseract.tesseract_cmd = tesseract_path
     
+    @classmethod
+    def from_profile(cls, profile: str, languages=None, tessdata_dirs: dict = None, **kwargs) -> "OCRExtractor":
+        """
+        Create an extractor from a named speed profile
+        
+        Args:
+            profile: "fast", "balanced" or "accurate" (see ocr_profiles.OCR_PROFILES)
+            languages: Tesseract languages, e.g. ["eng", "fra"]
+            tessdata_dirs: Directories of the "fast" and "best" model variants
+            **kwargs: Any other OCRExtractor arguments; a tesseract_config
+                     given here is added after the profile's options
+            
+        Returns:
+            Configured OCRExtractor
+        """
+        settings = profile_settings(profile, languages, tessdata_dirs, kwargs.pop("tesseract_config", ""))
+        settings.update(kwargs)
+        logger.info(f"Using OCR profile '{profile}': {settings['tesseract_config']} at {settings['dpi']} dpi")
+        return cls(**settings)
+    
+    def with_settings(self, **changes) -> "OCRExtractor":
+        """
+        Get a copy of this extractor with some settings changed
+        
+        The copy shares the cache; this extractor is left as it is.
+        
+        Args:
+            **changes: Constructor arguments to change, e.g. dpi=100
+            
+        Returns:
+            New OCRExtractor
+        """
+        unknown = [name for name in changes if not hasattr(self, name)]
+        if unknown:
+            raise TypeError(f"Unknown OCRExtractor setting: {unknown[0]}")
+        
+        extractor = copy.copy(self)
+        for name, value in changes.items():
+            setattr(extractor, name, value)
+        extractor.last_stats = {}
+        return extractor
+    
+    def _page_options(self) -> dict:
+        """Settings for processing a single PDF page (passed to pool workers)"""
+        # A draft pass at or above full resolution would just be a second full pass
+        draft_dpi = self.draft_dpi if self.draft_dpi and self.draft_dpi < self.dpi else None
+        return {
+            "dpi": self.dpi,
+            "draft_dpi": draft_dpi,
+            "min_confidence": self.min_confidence,
+            "use_text_layer": self.use_text_layer,
+            "min_text_layer_chars": self.min_text_layer_chars,
+            "lang": self.lang,
+            "tesseract_config": self.tesseract_config,
+            "tesseract_transport": self.tesseract_transport,
+            "preprocessing": self.preprocessing,
+            "skip_non_text": self.skip_non_text,
+            "max_rss_mb": self.max_rss_mb,
+            # RSS not counted against the cap: set when extraction starts,
+            # and by pool workers to the RSS they started with
+            "rss_baseline": 0,
+            "word_boxes": self.word_boxes,
+            "line_confidence": self.line_confidence,
+            "batch_size": self.batch_size,
+            "duplicate_distance": self.duplicate_distance,
+            "native_images": self.native_images,
+            # Lets pool workers open the cache to share page fingerprints
+            "fingerprint_cache": (
+                (str(self.cache.cache_path), self.cache.max_size_bytes / MB)
+                if self.cache is not None and self.duplicate_distance is not None else None
+            ),
+        }
+    
+    def _resolve_workers(self, num_workers, num_pages: int) -> int:
+        """Work out how many worker processes to use for a document"""
+        if num_workers is None:
+            num_workers = self.num_workers
+        if num_workers <= 0:
+            num_workers = os.cpu_count() or 1
+        return min(num_workers, num_pages)
+    
     def extract_from_image(self, image_path: str) -> str:
         """
         Extract text from an image file
         
+        Multi-frame TIFFs are extracted page by page, like a PDF.
+        
         Args:
             image_path: Path to the image file
             
         Returns:
             Extracted text from the image
         """
+        return self.extract_image_result(image_path)["text"]
+    
+    def extract_image_result(self, image_path: str) -> dict:
+        """
+        Extract text from an image file, with confidences
+        
+        Multi-frame TIFFs are extracted page by page, like a PDF.
+        
+        Args:
+            image_path: Path to the image file
+            
+        Returns:
+            Dictionary with keys:
+                text: Extracted text
+                confidence: Mean Tesseract word confidence (None if not
+                            measured or no words were found)
+                lines: With line_confidence on, the OCR'd lines as
+                       {"text", "confidence"} dictionaries, else None
+                pages: For multi-frame TIFFs, the page result of every
+                       frame (see iter_pdf_pages), else None
+        """
         try:
-            image = Image.open(image_path)
-            text = pytesseract.image_to_string(image)
+            if is_tiff(image_path) and self.page_count(image_path) > 1:
+                # Every frame is a page: run them through the PDF page
+                # pipeline (workers, batching, per-page cache)
+                pages = list(self.iter_pdf_pages(image_path))
+                return {
+                    "text": " ".join(page["text"] for page in pages if page["text"]),
+                    "confidence": None,
+                    "lines": [line for page in pages for line in page["lines"] or []] if self.line_confidence else None,
+                    "pages": pages,
+                }
+            
+            cache_key = None
+            if self.cache is not None:
+                settings = {
+                    "kind": "image",
+                    "lang": self.lang,
+                    "tesseract_config": self.tesseract_config,
+                    "preprocessing": self.preprocessing,
+                    "target_x_height": self.target_x_height,
+                    "line_confidence": self.line_confidence,
+                    # Tiled text is merged and re-flowed, and only the pipe
+                    # transport passes the image's dpi to Tesseract
+                    "tile_megapixels": self.tile_megapixels,
+                    "tesseract_transport": self.tesseract_transport,
+                }
+                cache_key = self.cache.make_key(hash_file(image_path), 0, settings)
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    logger.info(f"Using cached text for {image_path}")
+                    return {"confidence": None, "lines": None, "pages": None, **cached}
+            
+            if self.target_x_height is not None:
+                # Only the header is read here; load_scaled_image() decodes
+                with Image.open(image_path) as original:
+                    dpi = (recorded_dpi(original.info) or (None,))[0]
+                image, scale = load_scaled_image(image_path, self.target_x_height)
+                if dpi and scale != 1.0:
+                    dpi = dpi * scale
+            else:
+                image = Image.open(image_path)
+                # Missing or placeholder resolutions are left for Tesseract to estimate
+                dpi = (recorded_dpi(image.info) or (None,))[0]
+            large = self.tile_megapixels is not None and image.width * image.height >= self.tile_megapixels * 1e6
+            confidence = None
+            lines = None
+            if self.tesseract_transport == "pipe" or self.preprocessing is not None or large or self.line_confidence:
+                options = self._page_options()
+                gray = _prepare_image(np.asarray(image.convert("L")), options)
+                workers = self._resolve_workers(None, gray.size // MIN_TILE_PIXELS)
+                if large and workers > 1:
+                    words = self._ocr_image_tiled(gray, dpi, options, workers)
+                    text = words.text
+                elif self.line_confidence:
+                    words = WordBoxes.from_tesseract(_tesseract_to_data(gray, dpi, options))
+                    text = words.text
+                else:
+                    words = None
+                    text = _tesseract_to_string(gray, dpi, options)
+                if words is not None and len(words):
+                    confidence = round(float(words.conf.mean()), 1)
+                if self.line_confidence:
+                    lines = _line_results(words)
+            else:
+                text = pytesseract.image_to_string(image, lang=self.lang, config=self.tesseract_config)
             
             # Clean text: replace newlines with spaces and strip
-            text = text.replace('\n', ' ').strip()
-            text = " ".join(text.split())
+            result = {"text": _clean_text(text), "confidence": confidence, "lines": lines, "pages": None}
+            
+            if cache_key is not None:
+                self.cache.put(cache_key, result)
             
             logger.info(f"Successfully extracted text from {image_path}")
-            return text
+            return result
         except Exception as e:
             logger.error(f"Error extracting text from image: {str(e)}")
             raise
     
-    def extract_from_pdf(self, pdf_path: str) -> str:
+    def _ocr_image_tiled(self, image: np.ndarray, dpi, options: dict, workers: int) -> WordBoxes:
+        """
+        Recognize one large image as tiles spread over worker processes
+        
+        Images that can't be cut into more than one tile are recognized
+        whole in this process.
+        
+        Args:
+            image: 2-D uint8 grayscale array
+            dpi: Image resolution (None if unknown)
+            options: Page options from _page_options()
+            workers: Number of worker processes (and roughly of tiles)
+            
+        Returns:
+            WordBoxes of the recognized words (in pixels), with words
+            duplicated at tile seams removed
+        """
+        min_gap_x = int(BLOCK_GAP_HORIZONTAL * (dpi or ASSUMED_IMAGE_DPI))
+        tiles = plan_tiles(image, workers, min_gap_x)
+        if len(tiles) == 1:
+            return WordBoxes.from_tesseract(_tesseract_to_data(image, dpi, options))
+        
+        logger.info(f"Recognizing {image.shape[1]}x{image.shape[0]} image as {len(tiles)} tiles")
+        handle = None
+        if self.worker_transport == "shared_memory":
+            if self._image_pool is None:
+                self._image_pool = SharedImagePool()
+            try:
+                handle = self._image_pool.put(image)
+            except OSError as e:
+                logger.warning(f"Shared memory unavailable ({str(e)}), sending tiles through the pipe")
+        
+        executor = ProcessPoolExecutor(
+            max_workers=min(workers, len(tiles)),
+            initializer=_init_ocr_worker,
+            initargs=(self.tesseract_path, self.tesseract_threads),
+        )
+        try:
+            futures = []
+            for tile in tiles:
+                if handle is not None:
+                    futures.append(executor.submit(_ocr_shared_tile_worker, handle, tile["box"], dpi, options))
+                else:
+                    top, bottom, left, right = tile["box"]
+                    futures.append(executor.submit(_tesseract_to_data, image[top:bottom, left:right], dpi, options))
+            tile_words = [
+                WordBoxes.from_tesseract(future.result(), origin=(tile["box"][2], tile["box"][0]))
+                for tile, future in zip(tiles, futures)
+            ]
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            # No worker is reading the block any more
+            if handle is not None:
+                self._image_pool.release(handle)
+        
+        return merge_tile_words(tiles, tile_words)
+    
+    def page_count(self, pdf_path: str) -> int:
         """
-        Extract text from a PDF file
+        Count the pages of a PDF (or frames of a TIFF) without extracting anything
+        
+        Args:
+            pdf_path: Path to the PDF or TIFF file
+            
+        Returns:
+            Number of pages
+        """
+        pdf = _open_document(pdf_path)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+    
+    def open_pdf(self, pdf_path: str) -> LazyPDFDocument:
+        """
+        Open a PDF for on-demand extraction
+        
+        Pages are only extracted when first accessed, and each page's result
+        is kept so it is never extracted twice.
         
         Args:
             pdf_path: Path to the PDF file
             
         Returns:
-            Extracted text from all pages of the PDF
+            LazyPDFDocument backed by this extractor
+        """
+        return LazyPDFDocument(self, pdf_path)
+    
+    def extract_progressive(self, pdf_path: str, pages=None, preview_dpi: int = PREVIEW_DPI) -> ProgressivePDFDocument:
+        """
+        Start extracting a PDF in the background, preview first
+        
+        Returns straight away. A quick pass at preview_dpi gives readable
+        text early, then pages that needed OCR are redone with this
+        extractor's settings and replace their previews as they finish.
+        
+        Args:
+            pdf_path: Path to the PDF (or multi-frame TIFF) file
+            pages: Zero-based indices of the pages to extract
+                   (default: every page)
+            preview_dpi: Render resolution of the first pass
+            
+        Returns:
+            ProgressivePDFDocument to poll or wait on for versioned results
         """
-        if pdfium is None:
-            raise ImportError("pypdfium2 is not installed. Please install it with 'pip install pypdfium2'")
+        return ProgressivePDFDocument(self, pdf_path, pages, preview_dpi)
+    
+    def iter_pdf_pages(self, pdf_path: str, num_workers: int = None, ordered: bool = True,
+                       pages=None) -> Iterator[dict]:
+        """
+        Extract text from a PDF one page at a time
+        
+        Pages are yielded as soon as they are recognized, so callers can
+        start simplifying or speaking page 1 while later pages are still
+        being processed. Running totals for the document (pages per source,
+        pages and regions skipped) are kept in self.last_stats.
+        
+        Multi-frame TIFFs (fax and scanner batches) are read the same way,
+        one page per frame.
+        
+        Args:
+            pdf_path: Path to the PDF or TIFF file
+            num_workers: Worker processes to use for this call
+                        (default: the value given to the constructor)
+            ordered: Yield pages in document order; if False, pages are
+                     yielded in the order the workers finish them
+            pages: Zero-based indices of the pages to extract, e.g.
+                   range(40, 60) (default: every page)
             
+        Yields:
+            Dictionary per page with keys:
+                page: Zero-based page index
+                text: Cleaned page text
+                source: "text_layer" or "ocr"
+                dpi: Resolution the page was OCR'd at (None for text layers)
+                confidence: Mean Tesseract word confidence, if measured
+                skipped: "blank" or "image" if OCR was skipped, else None
+                regions_skipped: Figure regions cut out before OCR
+                memory_limited: True if the memory cap forced a lower DPI
+                duplicate: True if the text was reused from an earlier page
+                           that looks the same, skipping Tesseract
+                native_image: True if the page's embedded scan was OCR'd
+                              directly instead of rendering the page
+                rss_mb: Process RSS after the page, in MB (None if unknown)
+                lines: With line_confidence on, the page's OCR'd lines as
+                       {"text", "confidence"} dictionaries (None for text
+                       layers or with line_confidence off)
+                words: WordBoxes of the page with word_boxes on (None for
+                       text-layer pages or with word_boxes off)
+                cached: True if the result came from the OCR cache or the
+                        checkpoint of an interrupted run
+                ocr_time: Seconds spent rendering and recognizing the page
+                elapsed: Seconds since extraction started
+        """
+        start = time.perf_counter()
+        options = self._page_options()
+        if options["max_rss_mb"] is not None:
+            # The cap is on what extraction adds: memory the process already
+            # holds (loaded models, other sessions' documents) doesn't count
+            options["rss_baseline"] = current_rss() or 0
+        # Page work opens its own handle (per worker, or in _iter_pages_serial)
+        num_pages = self.page_count(pdf_path)
+        
+        if pages is None:
+            selected = list(range(num_pages))
+        else:
+            selected = sorted(set(pages))
+            out_of_range = [i for i in selected if not 0 <= i < num_pages]
+            if out_of_range:
+                raise ValueError(
+                    f"Page index {out_of_range[0]} is out of range for a {num_pages}-page document"
+                )
+        
+        stats = {
+            "pages": len(selected),
+            "document_pages": num_pages,
+            "text_layer_pages": 0,
+            "ocr_pages": 0,
+            "cached_pages": 0,
+            "blank_pages_skipped": 0,
+            "image_pages_skipped": 0,
+            "regions_skipped": 0,
+            "memory_limit_mb": self.max_rss_mb,
+            "memory_limited_pages": 0,
+            "duplicate_pages": 0,
+            "native_image_pages": 0,
+            "resumed_pages": 0,
+            "peak_rss_mb": None,
+        }
+        self.last_stats = stats
+        
+        # Pages of a file we have seen before come straight from the cache
+        cached = {}
+        cache_keys = {}
+        if self.cache is not None or self.checkpoint_dir is not None:
+            document_hash = hash_file(pdf_path)
+            settings = _result_settings(options)
+        if self.cache is not None:
+            for i in selected:
+                cache_keys[i] = self.cache.make_key(document_hash, i, settings)
+                result = self.cache.get(cache_keys[i])
+                if result is not None:
+                    result["page"] = i
+                    cached[i] = _restore_result(result)
+            if cached:
+                logger.info(f"{len(cached)} of {len(selected)} pages found in OCR cache")
+        
+        # ...and so do the pages an interrupted run got through
+        checkpoint = None
+        if self.checkpoint_dir is not None:
+            checkpoint = PageCheckpoint(self.checkpoint_dir, document_hash, settings)
+            resumed = {i: result for i, result in checkpoint.load().items() if i in selected and i not in cached}
+            if resumed:
+                logger.info(f"Resuming {pdf_path}: {len(resumed)} of {len(selected)} pages already done")
+                stats["resumed_pages"] = len(resumed)
+                for i, result in resumed.items():
+                    cached[i] = _restore_result(result)
+        
+        pending = [i for i in selected if i not in cached]
+        workers = self._resolve_workers(num_workers, len(pending))
+        
+        if workers > 1:
+            # Checkpoint pages as workers finish them, not when their turn to
+            # be yielded comes, so a crash loses nothing that was done
+            on_result = None if checkpoint is None else (lambda result: checkpoint.record(_stored_result(result)))
+            fresh = self._iter_pages_parallel(pdf_path, pending, workers, ordered, options, on_result)
+        else:
+            fresh = self._iter_pages_serial(pdf_path, pending, options)
+        
+        if ordered:
+            # Fresh results arrive in page order too, so interleave the two
+            results = (cached[i] if i in cached else next(fresh) for i in selected)
+        else:
+            results = itertools.chain(cached.values(), fresh)
+        
         try:
-            pdf = pdfium.PdfDocument(pdf_path)
-            text_parts = []
-            
-            for i in range(len(pdf)):
-                page = pdf[i]
-                # Render page to image (scale=2.0 for better quality ~144dpi, scale=3.0 ~216dpi)
-                bitmap = page.render(scale=3.0)
-                pil_image = bitmap.to_pil()
+            for result in results:
+                if result["page"] in cached:
+                    result["cached"] = True
+                    result["ocr_time"] = 0.0
+                else:
+                    result["cached"] = False
+                    if checkpoint is not None:
+                        checkpoint.record(_stored_result(result))
+                    # Pages squeezed to a lower DPI by the memory cap aren't
+                    # what the settings promise, so don't keep them
+                    if self.cache is not None and not result.get("memory_limited"):
+                        self.cache.put(cache_keys[result["page"]], _stored_result(result))
                 
-                page_text = pytesseract.image_to_string(pil_image)
+                if result["cached"]:
+                    stats["cached_pages"] += 1
+                if result.get("skipped"):
+                    stats[f"{result['skipped']}_pages_skipped"] += 1
+                elif result["source"] == "text_layer":
+                    stats["text_layer_pages"] += 1
+                else:
+                    stats["ocr_pages"] += 1
+                stats["regions_skipped"] += result.get("regions_skipped", 0)
+                if result.get("memory_limited"):
+                    stats["memory_limited_pages"] += 1
+                if not result["cached"] and result.get("duplicate"):
+                    stats["duplicate_pages"] += 1
+                if result.get("native_image"):
+                    stats["native_image_pages"] += 1
+                if not result["cached"] and result.get("rss_mb") is not None:
+                    stats["peak_rss_mb"] = max(stats["peak_rss_mb"] or 0.0, result["rss_mb"])
                 
-                # Clean text: replace newlines with spaces and strip
-                cleaned_text = page_text.replace('\n', ' ').strip()
-                if cleaned_text:
-                    text_parts.append(cleaned_text)
-                
-                logger.info(f"Extracted text from page {i + 1}")
+                result["elapsed"] = time.perf_counter() - start
+                logger.info(f"Extracted text from page {result['page'] + 1} ({result['source']})")
+                yield result
+            
+            # Finished: a whole-document run needs no checkpoint any more,
+            # while one for a page range is kept for the rest of the document
+            if checkpoint is not None and len(selected) == num_pages:
+                checkpoint.discard()
+        finally:
+            # Release the document or worker pool now rather than at garbage collection
+            fresh.close()
+            if checkpoint is not None:
+                checkpoint.close()
+            if stats["duplicate_pages"]:
+                logger.info(f"Skipped Tesseract for {stats['duplicate_pages']} duplicate pages")
+    
+    def _iter_pages_serial(self, pdf_path: str, page_indices: list, options: dict) -> Iterator[dict]:
+        """
+        Extract the pages of a PDF one after another in this process
+        
+        Pages go to Tesseract options["batch_size"] at a time and are
+        closed as soon as they are rendered. Under a memory cap the
+        document is reopened whenever RSS gets close to the cap, which drops
+        the fonts and images pdfium keeps cached for it. Repeated pages are
+        recognized once when duplicate skipping is on.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            page_indices: Zero-based indices of the pages to process, ascending
+            options: Page options from _page_options()
+            
+        Yields:
+            Page result dictionaries
+        """
+        fingerprints = None
+        if options["duplicate_distance"] is not None:
+            fingerprints = PageFingerprints(options["duplicate_distance"], self.cache, _result_settings(options))
+        
+        pdf = _open_document(pdf_path)
+        try:
+            for n, batch in enumerate(_batches(page_indices, options["batch_size"])):
+                # A freshly opened document has nothing cached yet
+                if n and _should_release_memory(options):
+                    logger.info(f"Near the {options['max_rss_mb']} MB memory limit, reopening {pdf_path}")
+                    pdf.close()
+                    gc.collect()
+                    pdf = _open_document(pdf_path)
+                yield from _extract_pages_at(pdf, batch, options, fingerprints)
+        finally:
+            pdf.close()
+    
+    def _iter_pages_parallel(self, pdf_path: str, page_indices: list, workers: int, ordered: bool,
+                             options: dict, on_result=None) -> Iterator[dict]:
+        """
+        OCR the pages of a PDF across a pool of worker processes
+        
+        Args:
+            pdf_path: Path to the PDF file
+            page_indices: Zero-based indices of the pages to process, ascending
+            workers: Number of worker processes
+            ordered: Yield in page order rather than completion order
+            options: Page options from _page_options()
+            on_result: Called with each page result as soon as its worker
+                      finishes, whatever order results are yielded in
+                      (runs on the pool's result thread)
+            
+        Yields:
+            Page result dictionaries
+        """
+        logger.info(f"Extracting {len(page_indices)} pages with {workers} worker processes")
+        
+        if options["max_rss_mb"] is not None:
+            # Workers, like the parent, are held to their growth from the RSS
+            # they start with; the cap is shared between the workers and the
+            # parent (which holds the results)
+            options = {**options, "max_rss_mb": options["max_rss_mb"] / (workers + 1)}
+        
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_ocr_worker,
+            initargs=(self.tesseract_path, self.tesseract_threads),
+        )
+        try:
+            if options["batch_size"] > 1:
+                # Keep every worker busy even when there are few pages
+                batch_size = min(options["batch_size"], -(-len(page_indices) // workers))
+                futures = [
+                    executor.submit(_ocr_pdf_batch_worker, pdf_path, batch, options)
+                    for batch in _batches(page_indices, batch_size)
+                ]
+            else:
+                futures = [executor.submit(_ocr_pdf_page_worker, pdf_path, i, options) for i in page_indices]
+            if on_result is not None:
+                for future in futures:
+                    future.add_done_callback(functools.partial(_report_results, on_result))
+            # Waiting on futures in submission order keeps pages in sequence
+            # while still handing page 1 over as soon as it is done
+            for future in (futures if ordered else as_completed(futures)):
+                if options["batch_size"] > 1:
+                    yield from future.result()
+                else:
+                    yield future.result()
+        finally:
+            # Don't keep recognizing pages nobody will read if the caller stops early
+            executor.shutdown(wait=True, cancel_futures=True)
+    
+    def extract_from_pdf(self, pdf_path: str, num_workers: int = None, pages=None) -> str:
+        """
+        Extract text from a PDF file (or a multi-frame TIFF)
+        
+        Args:
+            pdf_path: Path to the PDF or TIFF file
+            num_workers: Worker processes to use for this call
+                        (default: the value given to the constructor)
+            pages: Zero-based indices of the pages to extract
+                   (default: every page)
             
-            # Join all parts with a single space and remove extra whitespace
-            full_text = " ".join(text_parts)
-            full_text = " ".join(full_text.split())
+        Returns:
+            Extracted text from the selected pages of the PDF
+        """
+        try:
+            page_results = self.iter_pdf_pages(pdf_path, num_workers, pages=pages)
+            if self.max_rss_mb is None:
+                # Join all non-empty pages with a single space
+                text_parts = [result["text"] for result in page_results]
+                full_text = " ".join(part for part in text_parts if part)
+            else:
+                full_text = self._join_pages_spooled(page_results)
             
             logger.info(f"Successfully extracted text from {pdf_path}")
             return full_text
@@ -95,21 +1633,67 @@ class OCRExtractor:
             logger.error(f"Error extracting text from PDF: {str(e)}")
             raise
     
-    def extract_text(self, file_path: str) -> str:
+    def extract_word_boxes(self, pdf_path: str, num_workers: int = None, pages=None) -> WordBoxes:
+        """
+        Extract a PDF's OCR'd words with their positions and confidences
+        
+        Args:
+            pdf_path: Path to the PDF file
+            num_workers: Worker processes to use for this call
+                        (default: the value given to the constructor)
+            pages: Zero-based indices of the pages to extract
+                   (default: every page)
+            
+        Returns:
+            WordBoxes for all OCR'd pages, in page order
+        """
+        if not self.word_boxes:
+            raise ValueError("Word boxes are off; create the OCRExtractor with word_boxes=True")
+        
+        try:
+            results = self.iter_pdf_pages(pdf_path, num_workers, pages=pages)
+            words = WordBoxes.concat(result["words"] for result in results)
+            logger.info(f"Extracted {len(words)} word boxes from {pdf_path}")
+            return words
+        except Exception as e:
+            logger.error(f"Error extracting word boxes from PDF: {str(e)}")
+            raise
+    
+    def _join_pages_spooled(self, page_results: Iterator[dict]) -> str:
+        """
+        Join page texts through a spooled temp file
+        
+        Page results (and their texts) can be freed as soon as they are
+        written, so only the final string is held in memory at the end.
+        Small documents never leave memory; past 1 MB of text the spool
+        moves to disk.
+        """
+        with tempfile.SpooledTemporaryFile(max_size=MB, mode="w+", encoding="utf-8") as spool:
+            separator = ""
+            for result in page_results:
+                if result["text"]:
+                    spool.write(separator + result["text"])
+                    separator = " "
+            spool.seek(0)
+            return spool.read()
+    
+    def extract_text(self, file_path: str, pages=None) -> str:
         """
         Automatically detect file type and extract text
         
         Args:
             file_path: Path to the file (PDF or image)
+            pages: Zero-based indices of the PDF pages or TIFF frames to
+                   extract (default: every page; ignored for other images)
             
         Returns:
             Extracted text
         """
         file_extension = Path(file_path).suffix.lower()
         
-        if file_extension == ".pdf":
-            return self.extract_from_pdf(file_path)
-        elif file_extension in [".jpg", ".jpeg", ".png", ".bmp", ".tiff"]:
+        if file_extension == ".pdf" or (is_tiff(file_path) and self.page_count(file_path) > 1):
+            return self.extract_from_pdf(file_path, pages=pages)
+        elif file_extension in [".jpg", ".jpeg", ".png", ".bmp", ".tif", ".tiff"]:
             return self.extract_from_image(file_path)
         else:
             raise ValueError(f"Unsupported file type: {file_extension}")
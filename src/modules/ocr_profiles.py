@@ -0,0 +1,145 @@
+"""
+OCR Profiles Module
+Named speed/accuracy presets that pick Tesseract's engine and page
+segmentation modes, the tessdata model variant, the languages and the
+render resolution together
+"""
+
+import json
+import logging
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# oem: Tesseract engine mode (1 = LSTM only; the fast and best model
+#      variants ship no legacy models)
+# psm: Page segmentation mode (6 = one uniform block of text, skips layout
+#      analysis; 3 = full automatic layout analysis)
+# tessdata: Model variant - "fast" (integer LSTM, several times quicker),
+#           "standard" (what Tesseract installs by default) or "best"
+#           (float LSTM, slowest and most accurate)
+# max_languages: Languages actually loaded, from the front of the
+#                configured list (None = all; every extra language costs
+#                about as much as the first)
+# dpi / draft_dpi: PDF render resolution and optional cheap first pass
+# preprocessing: Image cleanup (see image_preprocessing; None = off)
+OCR_PROFILES = {
+    "fast": {
+        "description": "Quickest; clean single-column pages at low resolution (kiosks)",
+        "oem": 1,
+        "psm": 6,
+        "tessdata": "fast",
+        "max_languages": 1,
+        "dpi": 150,
+        "draft_dpi": None,
+        "preprocessing": None,
+    },
+    "balanced": {
+        "description": "Good default; draft pass at low resolution, full layout analysis",
+        "oem": 1,
+        "psm": 3,
+        "tessdata": "standard",
+        "max_languages": None,
+        "dpi": 216,
+        "draft_dpi": 150,
+        "preprocessing": None,
+    },
+    "accurate": {
+        "description": "Slowest; best models, high resolution and cleanup (exam papers)",
+        "oem": 1,
+        "psm": 3,
+        "tessdata": "best",
+        "max_languages": None,
+        "dpi": 300,
+        "draft_dpi": None,
+        # LSTM models read grayscale better than a hard threshold
+        "preprocessing": {"binarize": None},
+    },
+}
+
+
+def _tessdata_dir(variant: str, tessdata_dirs: dict, languages: list):
+    """
+    Find the directory holding a tessdata variant's models
+
+    Returns:
+        Directory path, or None to use Tesseract's installed models
+    """
+    if variant == "standard":
+        return None
+
+    directory = (tessdata_dirs or {}).get(variant)
+    if not directory:
+        logger.warning(f"No directory configured for tessdata_{variant}, using the installed models")
+        return None
+
+    missing = [lang for lang in languages if not (Path(directory) / f"{lang}.traineddata").exists()]
+    if missing:
+        logger.warning(
+            f"tessdata_{variant} in {directory} has no model for {', '.join(missing)}, "
+            f"using the installed models"
+        )
+        return None
+    return str(directory)
+
+
+def profile_settings(name: str, languages=None, tessdata_dirs: dict = None, tesseract_config: str = "") -> dict:
+    """
+    Resolve a profile into OCRExtractor settings
+
+    Args:
+        name: Profile name (see OCR_PROFILES)
+        languages: Configured Tesseract languages, e.g. ["eng", "fra"]
+                   (None = Tesseract's default)
+        tessdata_dirs: {"fast": path, "best": path} of downloaded model
+                       variants; variants that aren't there fall back to
+                       the installed models
+        tesseract_config: Extra Tesseract options appended after the
+                          profile's own
+
+    Returns:
+        Dictionary of OCRExtractor keyword arguments (lang,
+        tesseract_config, dpi, draft_dpi, preprocessing)
+    """
+    if name not in OCR_PROFILES:
+        raise ValueError(f"Unknown OCR profile: {name} (choose from {', '.join(OCR_PROFILES)})")
+    profile = OCR_PROFILES[name]
+
+    languages = list(languages or [])
+    if profile["max_languages"] and len(languages) > profile["max_languages"]:
+        logger.info(f"OCR profile '{name}' only loads {', '.join(languages[:profile['max_languages']])}")
+        languages = languages[:profile["max_languages"]]
+
+    config = [f"--oem {profile['oem']}", f"--psm {profile['psm']}"]
+    directory = _tessdata_dir(profile["tessdata"], tessdata_dirs, languages or ["eng"])
+    if directory:
+        # Double-quoted, as pytesseract documents for paths with spaces
+        config.append(f'--tessdata-dir "{directory}"')
+    if tesseract_config:
+        config.append(tesseract_config)
+
+    return {
+        "lang": "+".join(languages) or None,
+        "tesseract_config": " ".join(config),
+        "dpi": profile["dpi"],
+        "draft_dpi": profile["draft_dpi"],
+        "preprocessing": profile["preprocessing"],
+    }
+
+
+def load_profile_benchmarks(path) -> dict:
+    """
+    Load measured throughput and accuracy per profile
+
+    Args:
+        path: JSON file written by benchmark_profiles.py --save
+
+    Returns:
+        {profile name: {"pages_per_minute": ..., "accuracy": ...}}, empty
+        if the benchmark hasn't been run on this machine
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
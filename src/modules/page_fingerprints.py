@@ -0,0 +1,111 @@
+"""
+Page Fingerprints Module
+Perceptual hashes of rendered pages, used to recognize repeated pages
+(cover sheets, blank forms, repeated appendices) once and reuse the text
+"""
+
+import numpy as np
+from PIL import Image
+
+from .ocr_cache import OCRCache
+
+# Fingerprints compare neighbouring cells of a FINGERPRINT_SIZE x
+# FINGERPRINT_SIZE grid, two bits per pair
+FINGERPRINT_SIZE = 16
+
+# Grey levels two cells must differ by to set a bit; pages are mostly
+# white, and without a margin noise decides every blank-vs-blank bit
+FINGERPRINT_MARGIN = 2
+
+
+def page_fingerprint(image: np.ndarray) -> str:
+    """
+    Difference hash of a page image
+
+    The page is shrunk to a small grid and each pair of bits records
+    whether a cell is clearly brighter or clearly darker than its left-hand
+    neighbour, so re-encoding, slight blur or scanner noise leave most bits
+    unchanged.
+
+    Args:
+        image: 2-D uint8 grayscale array
+
+    Returns:
+        Hex string of 2 * FINGERPRINT_SIZE ** 2 bits
+    """
+    small = Image.fromarray(image).resize((FINGERPRINT_SIZE + 1, FINGERPRINT_SIZE), Image.Resampling.BOX)
+    cells = np.asarray(small, dtype=np.int16)
+    step = cells[:, 1:] - cells[:, :-1]
+    bits = np.packbits(np.concatenate([step > FINGERPRINT_MARGIN, step < -FINGERPRINT_MARGIN]))
+    return bits.tobytes().hex()
+
+
+def fingerprint_distance(a: str, b: str) -> int:
+    """Number of bits two fingerprints differ in"""
+    return (int(a, 16) ^ int(b, 16)).bit_count()
+
+
+class PageFingerprints:
+    """
+    Pages recognized so far, looked up by fingerprint
+
+    Lookups first check the pages of the current document, allowing a few
+    bits of difference, then the OCR cache for an identical fingerprint
+    from any earlier document.
+    """
+
+    def __init__(self, max_distance: int = 0, cache: OCRCache = None, settings: dict = None):
+        """
+        Create an empty index
+
+        Args:
+            max_distance: Bits two fingerprints may differ by and still
+                          count as the same page
+            cache: OCRCache to share fingerprints across documents and
+                   processes (None = this document only)
+            settings: Extraction settings the stored text depends on (part
+                      of the cache key)
+        """
+        self.max_distance = max_distance
+        self.cache = cache
+        self.settings = settings or {}
+        # {(dpi, image shape): [(fingerprint as int, result), ...]}
+        self._pages = {}
+
+    def _cache_key(self, fingerprint: str, dpi, shape) -> str:
+        return OCRCache.make_key(
+            f"fingerprint:{fingerprint}", 0, {**self.settings, "dpi": dpi, "shape": list(shape)}
+        )
+
+    def find(self, fingerprint: str, dpi, shape):
+        """
+        Look up a page rendered at `dpi` to an image of `shape`
+
+        Returns:
+            The stored result dictionary, or None if no page matches
+        """
+        value = int(fingerprint, 16)
+        for seen, result in self._pages.get((dpi, tuple(shape)), []):
+            if (seen ^ value).bit_count() <= self.max_distance:
+                return result
+
+        if self.cache is not None:
+            result = self.cache.get(self._cache_key(fingerprint, dpi, shape))
+            if result is not None:
+                self._pages.setdefault((dpi, tuple(shape)), []).append((value, result))
+                return result
+        return None
+
+    def add(self, fingerprint: str, dpi, shape, result: dict):
+        """
+        Remember a recognized page
+
+        Args:
+            fingerprint: page_fingerprint() of the page image
+            dpi: Resolution the page was rendered at
+            shape: Shape of the page image
+            result: JSON-serializable recognition result
+        """
+        self._pages.setdefault((dpi, tuple(shape)), []).append((int(fingerprint, 16), result))
+        if self.cache is not None:
+            self.cache.put(self._cache_key(fingerprint, dpi, shape), result)
@@ -0,0 +1,210 @@
+"""
+Page Layout Module
+Cheap ink-density and layout checks on rendered pages, used to skip blank
+pages, full-page figures and non-text regions before OCR
+"""
+
+import numpy as np
+
+from .image_preprocessing import otsu_threshold
+
+# Pages with less ink than this fraction of their area count as blank
+BLANK_INK_FRACTION = 0.0005
+
+# Pages whose ink and paper levels differ by less than this are blank too
+# (paper texture, show-through from the other side of a scanned leaf)
+BLANK_MIN_CONTRAST = 48
+
+# Whitespace gaps (in inches) that separate layout blocks
+BLOCK_GAP_VERTICAL = 0.12
+BLOCK_GAP_HORIZONTAL = 0.15
+
+# Blocks at least this tall (fraction of the page) are checked for being figures
+MIN_FIGURE_HEIGHT = 0.05
+
+
+def ink_mask(image: np.ndarray):
+    """
+    Separate ink from paper with Otsu's threshold
+
+    Returns:
+        Tuple of (boolean ink mask, contrast between ink and paper levels)
+    """
+    threshold = otsu_threshold(image)
+    ink = image <= threshold
+
+    histogram = np.bincount(image.ravel(), minlength=256).astype(np.float64)
+    levels = np.arange(256)
+    dark, light = histogram[:threshold + 1], histogram[threshold + 1:]
+    if dark.sum() == 0 or light.sum() == 0:
+        return ink, 0.0
+    contrast = (light * levels[threshold + 1:]).sum() / light.sum() - (dark * levels[:threshold + 1]).sum() / dark.sum()
+    return ink, float(contrast)
+
+
+def _split_on_gaps(occupied: np.ndarray, min_gap: int):
+    """Split a 1-D occupancy profile into (start, end) runs separated by gaps of at least min_gap"""
+    indices = np.flatnonzero(occupied)
+    if indices.size == 0:
+        return []
+    breaks = np.flatnonzero(np.diff(indices) > min_gap)
+    starts = np.concatenate(([indices[0]], indices[breaks + 1]))
+    ends = np.concatenate((indices[breaks], [indices[-1]])) + 1
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+def find_blocks(ink: np.ndarray, min_gap_y: int, min_gap_x: int, max_depth: int = 8):
+    """
+    Split a page into content blocks with a recursive XY-cut
+
+    The page is cut along horizontal whitespace bands, then each band along
+    vertical gutters, and so on until neither direction has a gap left.
+    Blocks come out in reading order (top to bottom, columns left to right).
+
+    Args:
+        ink: Boolean ink mask
+        min_gap_y: Smallest horizontal whitespace band (pixels) to cut at
+        min_gap_x: Smallest vertical gutter (pixels) to cut at
+        max_depth: Recursion limit
+
+    Returns:
+        List of (top, bottom, left, right) pixel boxes
+    """
+    blocks = []
+
+    def cut(box, horizontal, depth, other_failed):
+        top, bottom, left, right = box
+        region = ink[top:bottom, left:right]
+        if horizontal:
+            runs = _split_on_gaps(region.any(axis=1), min_gap_y)
+            pieces = [(top + a, top + b, left, right) for a, b in runs]
+        else:
+            runs = _split_on_gaps(region.any(axis=0), min_gap_x)
+            pieces = [(top, bottom, left + a, left + b) for a, b in runs]
+
+        if len(pieces) == 1 and (other_failed or depth >= max_depth):
+            # Neither direction splits any further: this is a block
+            blocks.append(pieces[0])
+        elif len(pieces) == 1:
+            cut(pieces[0], not horizontal, depth + 1, True)
+        elif depth >= max_depth:
+            blocks.extend(pieces)
+        else:
+            for piece in pieces:
+                cut(piece, not horizontal, depth + 1, False)
+
+    if ink.any():
+        cut((0, ink.shape[0], 0, ink.shape[1]), True, 0, False)
+    return blocks
+
+
+def _is_figure(ink: np.ndarray, block, page_height: int) -> bool:
+    """
+    Guess whether a block is a figure or photo rather than text
+
+    Text blocks have modest ink coverage and blank rows between their lines;
+    photos and filled figures are dense and have no such gaps. Small blocks
+    are always treated as text to stay on the safe side.
+    """
+    top, bottom, left, right = block
+    if bottom - top < page_height * MIN_FIGURE_HEIGHT:
+        return False
+
+    region = ink[top:bottom, left:right]
+    density = region.mean()
+    row_coverage = region.mean(axis=1)
+    gap_rows = np.mean(row_coverage < 0.01)
+    return density > 0.45 or gap_rows < 0.05
+
+
+def analyze_page(image: np.ndarray, dpi: float) -> dict:
+    """
+    Classify a rendered page and locate its text blocks
+
+    Args:
+        image: 2-D uint8 grayscale array
+        dpi: Resolution the page was rendered at
+
+    Returns:
+        Dictionary with keys:
+            kind: "blank", "image" (no text blocks) or "text"
+            ink_fraction: Share of the page covered by ink
+            text_blocks: (top, bottom, left, right) boxes of text blocks
+            figure_blocks: Boxes of blocks that look like figures
+    """
+    ink, contrast = ink_mask(image)
+    ink_fraction = float(ink.mean())
+    if ink_fraction < BLANK_INK_FRACTION or contrast < BLANK_MIN_CONTRAST:
+        return {"kind": "blank", "ink_fraction": ink_fraction, "text_blocks": [], "figure_blocks": []}
+
+    blocks = find_blocks(
+        ink,
+        min_gap_y=max(1, int(BLOCK_GAP_VERTICAL * dpi)),
+        min_gap_x=max(1, int(BLOCK_GAP_HORIZONTAL * dpi)),
+    )
+    text_blocks = []
+    figure_blocks = []
+    for block in blocks:
+        if _is_figure(ink, block, image.shape[0]):
+            figure_blocks.append(block)
+        else:
+            text_blocks.append(block)
+
+    return {
+        "kind": "text" if text_blocks else "image",
+        "ink_fraction": ink_fraction,
+        "text_blocks": text_blocks,
+        "figure_blocks": figure_blocks,
+    }
+
+
+def text_box(image: np.ndarray, layout: dict, padding: int = 16):
+    """
+    Get the box around all text blocks of a page, plus some margin
+
+    Args:
+        image: 2-D uint8 grayscale array
+        layout: Result of analyze_page() for this image
+        padding: Pixels of margin to keep around the text
+
+    Returns:
+        (top, bottom, left, right) pixel box (the whole image if there is no text)
+    """
+    text_blocks = layout["text_blocks"]
+    if not text_blocks:
+        return 0, image.shape[0], 0, image.shape[1]
+
+    top = max(min(b[0] for b in text_blocks) - padding, 0)
+    bottom = min(max(b[1] for b in text_blocks) + padding, image.shape[0])
+    left = max(min(b[2] for b in text_blocks) - padding, 0)
+    right = min(max(b[3] for b in text_blocks) + padding, image.shape[1])
+    return top, bottom, left, right
+
+
+def crop_to_text(image: np.ndarray, layout: dict, padding: int = 16) -> np.ndarray:
+    """
+    Keep only the text blocks of a page for OCR
+
+    Figure blocks are painted white and the page is cropped to the box
+    around all text blocks, so Tesseract sees one smaller image instead of
+    being started once per block.
+
+    Args:
+        image: 2-D uint8 grayscale array
+        layout: Result of analyze_page() for this image
+        padding: Pixels of margin to keep around the text
+
+    Returns:
+        Cropped image (a copy if any figures were painted out); its top-left
+        corner is at text_box()'s (top, left) in the original
+    """
+    if not layout["text_blocks"]:
+        return image
+
+    if layout["figure_blocks"]:
+        image = image.copy()
+        for top, bottom, left, right in layout["figure_blocks"]:
+            image[top:bottom, left:right] = 255
+
+    top, bottom, left, right = text_box(image, layout, padding)
+    return image[top:bottom, left:right]
@@ -0,0 +1,312 @@
+"""
+PDF Document Module
+Lazy, page-addressable access to a PDF's extracted text
+"""
+
+import logging
+import re
+import threading
+from typing import Iterator
+
+logger = logging.getLogger(__name__)
+
+
+def parse_page_range(spec: str, num_pages: int) -> list:
+    """
+    Parse a human page range such as "1-3, 7, 10-"
+
+    Page numbers are one-based and inclusive; an open end ("10-") runs to
+    the last page and an open start ("-5") from the first.
+
+    Args:
+        spec: Page range text (empty for every page)
+        num_pages: Number of pages in the document
+
+    Returns:
+        Sorted list of zero-based page indices
+
+    Raises:
+        ValueError: If the range is malformed or outside the document
+    """
+    if not spec or not spec.strip():
+        return list(range(num_pages))
+
+    pages = set()
+    for part in spec.split(","):
+        part = part.strip()
+        match = re.fullmatch(r"(\d*)\s*-\s*(\d*)|(\d+)", part)
+        if not match or part == "-":
+            raise ValueError(f"Invalid page range: '{part}'")
+
+        if match.group(3):
+            first = last = int(match.group(3))
+        else:
+            first = int(match.group(1)) if match.group(1) else 1
+            last = int(match.group(2)) if match.group(2) else num_pages
+
+        if first < 1 or last > num_pages or first > last:
+            raise ValueError(f"Page range '{part}' is outside pages 1-{num_pages}")
+        pages.update(range(first - 1, last))
+
+    return sorted(pages)
+
+
+class LazyPDFDocument:
+    """A PDF whose pages are extracted on first access and then remembered"""
+
+    def __init__(self, extractor, pdf_path: str):
+        """
+        Open a PDF for lazy extraction
+
+        Nothing is rendered or recognized until pages are asked for.
+
+        Args:
+            extractor: OCRExtractor that does the actual page extraction
+            pdf_path: Path to the PDF file
+        """
+        self.extractor = extractor
+        self.pdf_path = pdf_path
+        self.num_pages = extractor.page_count(pdf_path)
+        self._results = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self.num_pages
+
+    def __getitem__(self, page_index: int) -> dict:
+        """
+        Get one page's result, extracting it if needed
+
+        Args:
+            page_index: Zero-based page index (negative counts from the end)
+
+        Returns:
+            Page result dictionary (see OCRExtractor.iter_pdf_pages)
+        """
+        if page_index < 0:
+            page_index += self.num_pages
+        if not 0 <= page_index < self.num_pages:
+            raise IndexError(f"Page index {page_index} is out of range for a {self.num_pages}-page document")
+        return self.load([page_index])[0]
+
+    def __iter__(self):
+        """Iterate over every page, extracting each one only when reached"""
+        for page_index in range(self.num_pages):
+            yield self[page_index]
+
+    @property
+    def loaded_pages(self) -> list:
+        """Zero-based indices of the pages extracted so far"""
+        with self._lock:
+            return sorted(self._results)
+
+    def iter_load(self, pages=None) -> Iterator[dict]:
+        """
+        Extract the given pages not seen yet, yielding each one as it is done
+
+        The missing pages go through one iter_pdf_pages() run, so they share
+        the extractor's worker pool, Tesseract batches and a single hash of
+        the file; each result is remembered as soon as it arrives.
+
+        Args:
+            pages: Zero-based page indices (default: every page)
+
+        Yields:
+            Result dictionaries of the newly extracted pages, in page order
+        """
+        pages = range(self.num_pages) if pages is None else sorted(set(pages))
+
+        # The lock only guards the result table; two callers asking for the
+        # same missing page at once may both extract it, which is harmless
+        with self._lock:
+            missing = [i for i in pages if i not in self._results]
+        if not missing:
+            return
+
+        logger.info(f"Extracting {len(missing)} more pages of {self.pdf_path}")
+        for result in self.extractor.iter_pdf_pages(self.pdf_path, pages=missing):
+            with self._lock:
+                self._results[result["page"]] = result
+            yield result
+
+    def load(self, pages=None) -> list:
+        """
+        Make sure the given pages are extracted
+
+        Pages not seen before are extracted together, so they can use the
+        extractor's worker pool; pages already extracted are not touched.
+
+        Args:
+            pages: Zero-based page indices (default: every page)
+
+        Returns:
+            Page result dictionaries in page order
+        """
+        pages = range(self.num_pages) if pages is None else sorted(set(pages))
+        for _ in self.iter_load(pages):
+            pass
+
+        with self._lock:
+            return [self._results[i] for i in pages]
+
+    def page_text(self, page_index: int) -> str:
+        """Get one page's text, extracting the page if needed"""
+        return self[page_index]["text"]
+
+    def text(self, pages=None) -> str:
+        """
+        Get the joined text of some pages, extracting any not seen yet
+
+        Args:
+            pages: Zero-based page indices (default: every page)
+
+        Returns:
+            Text of the non-empty pages joined with single spaces
+        """
+        return " ".join(result["text"] for result in self.load(pages) if result["text"])
+
+
+class ProgressivePDFDocument:
+    """
+    A PDF extracted in two passes on a background thread
+
+    A quick low-resolution pass over the pages comes first, so there is
+    something to read almost straight away; then the pages that pass had to
+    OCR are extracted again at full quality and replace their previews one
+    by one. Text-layer, blank and picture-only pages are final after the
+    first pass.
+
+    Every change bumps `version`, and each page result records the version
+    it arrived in and its "quality" ("preview" or "final"), so a UI can ask
+    for just the pages that changed since it last looked.
+    """
+
+    def __init__(self, extractor, pdf_path: str, pages=None, preview_dpi: int = 100):
+        """
+        Start extracting a PDF progressively
+
+        Args:
+            extractor: OCRExtractor whose settings give the final quality
+            pdf_path: Path to the PDF file
+            pages: Zero-based page indices to extract (default: every page)
+            preview_dpi: Render resolution for the quick first pass
+        """
+        self.extractor = extractor
+        self.pdf_path = pdf_path
+        num_pages = extractor.page_count(pdf_path)
+        self.pages = list(range(num_pages)) if pages is None else sorted(set(pages))
+        if self.pages and not 0 <= self.pages[0] <= self.pages[-1] < num_pages:
+            raise ValueError(f"Page indices must be within 0-{num_pages - 1}")
+        self.preview = extractor.with_settings(dpi=preview_dpi, draft_dpi=None)
+        self.version = 0
+        self.error = None
+        self._results = {}
+        self._changed = threading.Condition()
+        self._cancelled = threading.Event()
+        self._done = False
+        self._thread = threading.Thread(target=self._run, name=f"progressive-ocr-{pdf_path}", daemon=True)
+        self._thread.start()
+
+    def __len__(self) -> int:
+        return len(self.pages)
+
+    @property
+    def done(self) -> bool:
+        """True once the final pass has finished (or failed, or was cancelled)"""
+        with self._changed:
+            return self._done
+
+    @property
+    def pending_pages(self) -> int:
+        """Pages that don't have their final result yet"""
+        with self._changed:
+            return sum(1 for i in self.pages if self._results.get(i, {}).get("quality") != "final")
+
+    def _store(self, result: dict, quality: str):
+        """Record a page result as a new version and wake up waiters"""
+        with self._changed:
+            self.version += 1
+            self._results[result["page"]] = {**result, "quality": quality, "version": self.version}
+            self._changed.notify_all()
+
+    def _is_final(self, result: dict) -> bool:
+        """True for preview results that a full-quality pass would not change"""
+        return (
+            result["source"] == "text_layer"
+            or bool(result.get("skipped"))
+            or (result["dpi"] or 0) >= self.extractor.dpi
+        )
+
+    def _run(self):
+        """Background thread: the preview pass, then the final pass"""
+        try:
+            for result in self.preview.iter_pdf_pages(self.pdf_path, pages=self.pages):
+                if self._cancelled.is_set():
+                    return
+                self._store(result, "final" if self._is_final(result) else "preview")
+
+            with self._changed:
+                refine = [i for i in self.pages if self._results[i]["quality"] == "preview"]
+            if refine:
+                logger.info(f"Preview of {self.pdf_path} ready, refining {len(refine)} pages")
+                for result in self.extractor.iter_pdf_pages(self.pdf_path, pages=refine):
+                    if self._cancelled.is_set():
+                        return
+                    self._store(result, "final")
+        except Exception as e:
+            logger.error(f"Error extracting {self.pdf_path} progressively: {str(e)}")
+            self.error = e
+        finally:
+            with self._changed:
+                self._done = True
+                self._changed.notify_all()
+
+    def wait_for_update(self, since: int, timeout: float = None) -> int:
+        """
+        Block until something changes after version `since`, or until done
+
+        Args:
+            since: Version the caller has already seen (0 for none)
+            timeout: Longest wait in seconds (None = no limit)
+
+        Returns:
+            The current version
+        """
+        with self._changed:
+            self._changed.wait_for(lambda: self.version > since or self._done, timeout)
+            return self.version
+
+    def wait(self, timeout: float = None) -> bool:
+        """
+        Block until the final pass is finished
+
+        Returns:
+            True if it finished, False on timeout
+        """
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def results(self) -> list:
+        """Latest result of every page extracted so far, in page order"""
+        with self._changed:
+            return [self._results[i] for i in self.pages if i in self._results]
+
+    def updates(self, since: int) -> list:
+        """
+        Get the pages that changed after a version
+
+        Args:
+            since: Version the caller has already seen (0 for everything)
+
+        Returns:
+            Page results newer than `since`, in page order
+        """
+        return [result for result in self.results() if result["version"] > since]
+
+    def text(self) -> str:
+        """Joined text of the pages available so far, best version of each"""
+        return " ".join(result["text"] for result in self.results() if result["text"])
+
+    def cancel(self):
+        """Stop after the page being processed now (results so far are kept)"""
+        self._cancelled.set()
@@ -0,0 +1,146 @@
+"""
+Shared Images Module
+Hand images to worker processes through shared memory instead of pickling
+them through a pipe; only a small handle crosses the process boundary
+"""
+
+import logging
+import threading
+import weakref
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Blocks are sized in whole pages of this many bytes so that slightly
+# different images can reuse the same block
+BLOCK_GRANULARITY = 1024 * 1024
+
+# Blocks created in this process, by name: handles pointing at them are
+# read without attaching a second mapping
+_OWNED_BLOCKS = {}
+
+# Blocks this (worker) process has attached to, by name
+_ATTACHED_BLOCKS = {}
+
+
+def _release_blocks(blocks: list):
+    """Close and unlink blocks (pool finalizer)"""
+    for block in blocks:
+        _OWNED_BLOCKS.pop(block.name, None)
+        try:
+            block.close()
+            block.unlink()
+        except (OSError, BufferError) as e:
+            logger.warning(f"Could not release shared memory block {block.name}: {str(e)}")
+    blocks.clear()
+
+
+class SharedImagePool:
+    """
+    Recycled shared-memory blocks for passing images to worker processes
+
+    put() copies an image into a free block (creating one only when none
+    is big enough) and returns a handle; workers turn the handle back into
+    an array with attach_image() without copying. Blocks go back to the
+    pool with release() and are reused by later images.
+    """
+
+    def __init__(self, max_free_blocks: int = 4):
+        """
+        Create an empty pool
+
+        Args:
+            max_free_blocks: Released blocks kept for reuse; blocks beyond
+                            this are freed straight away
+        """
+        self.max_free_blocks = max_free_blocks
+        self._blocks = []
+        self._free = []
+        self._lock = threading.Lock()
+        # Unlink everything when the pool is garbage collected or at exit
+        self._finalizer = weakref.finalize(self, _release_blocks, self._blocks)
+
+    def _acquire(self, nbytes: int) -> shared_memory.SharedMemory:
+        """Get the smallest free block of at least nbytes, or a new one"""
+        with self._lock:
+            fitting = [block for block in self._free if block.size >= nbytes]
+            if fitting:
+                block = min(fitting, key=lambda b: b.size)
+                self._free.remove(block)
+                return block
+
+        size = max(BLOCK_GRANULARITY, -(-nbytes // BLOCK_GRANULARITY) * BLOCK_GRANULARITY)
+        block = shared_memory.SharedMemory(create=True, size=size)
+        _OWNED_BLOCKS[block.name] = block
+        with self._lock:
+            self._blocks.append(block)
+        logger.debug(f"Created shared memory block {block.name} of {size} bytes")
+        return block
+
+    def put(self, image: np.ndarray) -> dict:
+        """
+        Copy an image into shared memory
+
+        Args:
+            image: NumPy array
+
+        Returns:
+            Picklable handle with the block name, shape and dtype
+        """
+        block = self._acquire(image.nbytes)
+        np.ndarray(image.shape, dtype=image.dtype, buffer=block.buf)[...] = image
+        return {"name": block.name, "shape": image.shape, "dtype": image.dtype.str}
+
+    def release(self, handle: dict):
+        """
+        Give a handle's block back to the pool
+
+        Only release once no worker is reading the image any more.
+        """
+        with self._lock:
+            block = next((b for b in self._blocks if b.name == handle["name"]), None)
+            if block is None or block in self._free:
+                return
+            if len(self._free) < self.max_free_blocks:
+                self._free.append(block)
+                return
+            self._blocks.remove(block)
+        _release_blocks([block])
+
+    @property
+    def nbytes(self) -> int:
+        """Shared memory held by the pool, in bytes"""
+        with self._lock:
+            return sum(block.size for block in self._blocks)
+
+    def close(self):
+        """Free every block (handles must no longer be in use)"""
+        self._finalizer()
+
+
+def attach_image(handle: dict) -> np.ndarray:
+    """
+    Get the image behind a handle from SharedImagePool.put()
+
+    The array is a view of the shared block, not a copy; each process
+    attaches to a block once and keeps the mapping for later images.
+
+    Args:
+        handle: Handle returned by put()
+
+    Returns:
+        Read-only NumPy array
+    """
+    name = handle["name"]
+    block = _OWNED_BLOCKS.get(name) or _ATTACHED_BLOCKS.get(name)
+    if block is None:
+        block = shared_memory.SharedMemory(name=name)
+        # Only the creating process may unlink the block; stop this
+        # process's attachment from being tracked as a leak of its own
+        resource_tracker.unregister(block._name, "shared_memory")
+        _ATTACHED_BLOCKS[name] = block
+    image = np.ndarray(handle["shape"], dtype=np.dtype(handle["dtype"]), buffer=block.buf)
+    image.flags.writeable = False
+    return image
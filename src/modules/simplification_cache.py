@@ -0,0 +1,193 @@
+"""
+Simplification Cache Module
+Two-tier memo of model simplifications: an in-memory LRU in front of a
+persistent SQLite table, keyed by model, sentence and generation settings
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from .sqlite_lru import SQLiteLRUStore
+
+logger = logging.getLogger(__name__)
+
+# Bump when prompts or output clean-up change in a way that makes older
+# entries wrong
+CACHE_FORMAT_VERSION = 1
+
+
+class SimplificationCache:
+    """
+    Cache of simplified sentences
+
+    Lookups check a bounded in-memory LRU first and the SQLite database
+    second; database hits are copied into memory. Both tiers evict their
+    least recently used entries when over their limits.
+    """
+
+    def __init__(self, cache_path: str = None, max_size_mb: float = 50, memory_entries: int = 2048):
+        """
+        Open (or create) a simplification cache
+
+        Args:
+            cache_path: Path to the SQLite database file (None = memory only)
+            max_size_mb: Size limit for the database; the least recently
+                        used entries are evicted beyond it
+            memory_entries: Sentences kept in the in-memory tier
+        """
+        self.cache_path = Path(cache_path) if cache_path is not None else None
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.memory_entries = memory_entries
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._store = None
+        if self.cache_path is not None:
+            self._store = SQLiteLRUStore(
+                self.cache_path, "simplifications", self.max_size_bytes, name="simplification cache"
+            )
+
+    @staticmethod
+    def make_key(model_name: str, sentence: str, max_length: int, num_beams: int) -> str:
+        """
+        Build the cache key for one sentence
+
+        Args:
+            model_name: Model that simplifies the sentence
+            sentence: Input sentence
+            max_length: Generation length limit
+            num_beams: Beam search width
+
+        Returns:
+            Hex digest identifying the simplification
+        """
+        payload = json.dumps(
+            {
+                "version": CACHE_FORMAT_VERSION,
+                "model": model_name,
+                "sentence": sentence,
+                "max_length": max_length,
+                "num_beams": num_beams,
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _remember(self, key: str, result: str):
+        """Put an entry in the memory tier, evicting the oldest (lock held)"""
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str):
+        """
+        Look up a cached simplification
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            The simplified sentence, or None on a miss
+        """
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: list) -> dict:
+        """
+        Look up several simplifications at once (one database round trip)
+
+        Args:
+            keys: Cache keys from make_key()
+
+        Returns:
+            {key: simplified sentence} for the keys that were found
+        """
+        found = {}
+        with self._lock:
+            missing = []
+            for key in dict.fromkeys(keys):
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[key] = self._memory[key]
+                else:
+                    missing.append(key)
+            self.memory_hits += len(found)
+
+            if missing and self._store is not None:
+                stored = self._store.get_many(missing)
+                for key, result in stored.items():
+                    found[key] = result
+                    self._remember(key, result)
+                self.disk_hits += len(stored)
+
+            self.misses += sum(1 for key in missing if key not in found)
+        return found
+
+    def put(self, key: str, result: str):
+        """
+        Store a simplification
+
+        Args:
+            key: Cache key from make_key()
+            result: Simplified sentence
+        """
+        self.put_many({key: result})
+
+    def put_many(self, results: dict):
+        """
+        Store several simplifications in one transaction
+
+        Args:
+            results: {cache key: simplified sentence}
+        """
+        with self._lock:
+            for key, result in results.items():
+                self._remember(key, result)
+            if self._store is not None:
+                self._store.put_many(results)
+
+    def stats(self) -> dict:
+        """
+        Get cache statistics
+
+        Returns:
+            Dictionary with memory_hits, disk_hits, misses, hit_rate,
+            memory_entries, entries (in the database) and size_bytes
+        """
+        with self._lock:
+            entries, size = self._store.totals() if self._store is not None else (0, 0)
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "entries": entries,
+                "size_bytes": size,
+            }
+
+    def clear(self):
+        """Remove every entry and reset the counters"""
+        with self._lock:
+            self._memory.clear()
+            if self._store is not None:
+                self._store.clear()
+            self.memory_hits = 0
+            self.disk_hits = 0
+            self.misses = 0
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            if self._store is not None:
+                self._store.close()
+                self._store = None
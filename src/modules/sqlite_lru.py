@@ -0,0 +1,140 @@
+"""
+SQLite LRU Store Module
+Size-bounded SQLite table of text values with least-recently-used eviction,
+shared by the OCR and simplification caches
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# SQLite limits the number of parameters in one statement
+_QUERY_CHUNK = 500
+
+
+class SQLiteLRUStore:
+    """
+    Key/value table in a SQLite database, evicting least recently used rows
+
+    Every lookup refreshes the rows it finds; writes evict the oldest rows
+    until the stored values fit the size limit. All methods are thread-safe.
+    """
+
+    def __init__(self, db_path, table: str, max_size_bytes: int, name: str = None):
+        """
+        Open (or create) a store
+
+        Args:
+            db_path: Path to the SQLite database file
+            table: Table holding the entries
+            max_size_bytes: Size limit for stored values
+            name: What the store holds, for log messages (default: table)
+        """
+        self.db_path = Path(db_path)
+        self.table = table
+        self.max_size_bytes = max_size_bytes
+        self.name = name or table
+        self._lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # One connection shared by Streamlit's script threads, guarded by the lock
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                key TEXT PRIMARY KEY,
+                result TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_access ON {table} (last_access)")
+        self._conn.commit()
+
+    def get_many(self, keys: list) -> dict:
+        """
+        Look up several keys at once, marking the ones found as just used
+
+        Args:
+            keys: Keys to look up
+
+        Returns:
+            {key: stored value} for the keys that were found
+        """
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        with self._lock:
+            for first in range(0, len(keys), _QUERY_CHUNK):
+                chunk = keys[first:first + _QUERY_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, result FROM {self.table} WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                if rows:
+                    now = time.time()
+                    self._conn.executemany(
+                        f"UPDATE {self.table} SET last_access = ? WHERE key = ?",
+                        [(now, key) for key, _ in rows],
+                    )
+                found.update(rows)
+            if found:
+                self._conn.commit()
+        return found
+
+    def put_many(self, values: dict):
+        """
+        Store several values in one transaction, evicting old rows if over the limit
+
+        Args:
+            values: {key: text value}
+        """
+        if not values:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO {self.table} (key, result, size, last_access) VALUES (?, ?, ?, ?)",
+                [(key, value, len(value.encode("utf-8")), now) for key, value in values.items()],
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop least recently used rows until the table fits its size limit (lock held)"""
+        total = self._conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM {self.table}").fetchone()[0]
+        if total <= self.max_size_bytes:
+            return
+
+        evicted = 0
+        rows = self._conn.execute(f"SELECT key, size FROM {self.table} ORDER BY last_access ASC").fetchall()
+        for key, size in rows:
+            if total <= self.max_size_bytes:
+                break
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        logger.info(f"Evicted {evicted} entries from {self.name}")
+
+    def totals(self) -> tuple:
+        """Number of stored entries and their total size in bytes"""
+        with self._lock:
+            return tuple(
+                self._conn.execute(f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {self.table}").fetchone()
+            )
+
+    def clear(self):
+        """Remove every entry"""
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+            self._conn.commit()
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
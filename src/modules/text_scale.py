@@ -0,0 +1,133 @@
+"""
+Text Scale Module
+Measure how tall the text in an image is and shrink oversized images
+(phone photos, 600 dpi scans) to the resolution Tesseract actually needs
+"""
+
+import logging
+import math
+
+import numpy as np
+from PIL import Image
+from scipy import ndimage
+
+from .image_preprocessing import otsu_threshold
+
+logger = logging.getLogger(__name__)
+
+# Text is measured on a copy whose longer side is at most this many pixels
+ESTIMATE_MAX_SIDE = 2000
+
+# Glyphs fewer pixels tall than this can't be told apart from noise
+MIN_GLYPH_HEIGHT = 4
+
+# Fewest glyph-like components needed to trust a measurement
+MIN_GLYPHS = 20
+
+# Downscaling by less than this isn't worth a resample
+MIN_DOWNSCALE = 0.9
+
+
+def estimate_x_height(image: np.ndarray):
+    """
+    Estimate the x-height of the text in an image from its connected components
+
+    Ink blobs are filtered down to glyph-shaped ones (no specks, rules,
+    or picture regions) and the most common blob height is taken: lowercase
+    letters without ascenders or descenders outnumber every other group.
+
+    Args:
+        image: 2-D uint8 grayscale array (dark text on a light background)
+
+    Returns:
+        x-height in pixels, or None if the image doesn't contain enough text
+    """
+    ink = image < otsu_threshold(image)
+    if not ink.any() or ink.mean() > 0.5:
+        return None
+
+    labels, count = ndimage.label(ink)
+    if count < MIN_GLYPHS:
+        return None
+    boxes = ndimage.find_objects(labels)
+    heights = np.array([rows.stop - rows.start for rows, _ in boxes])
+    widths = np.array([cols.stop - cols.start for _, cols in boxes])
+
+    glyphs = (
+        (heights >= MIN_GLYPH_HEIGHT)
+        & (heights <= image.shape[0] // 8)
+        # Underlines, table rules and words run together are wide and flat
+        & (widths <= 3 * heights)
+    )
+    if glyphs.sum() < MIN_GLYPHS:
+        return None
+
+    # Smooth the histogram so a font whose x-height falls between two
+    # pixel counts still forms one peak
+    histogram = np.convolve(np.bincount(heights[glyphs]), [1, 2, 1], mode="same")
+    return float(np.argmax(histogram))
+
+
+def _measure(image: Image.Image, full_width: int):
+    """x-height of a grayscale image in pixels of the full-size original"""
+    factor = math.ceil(max(image.size) / ESTIMATE_MAX_SIDE)
+    probe = image.reduce(factor) if factor > 1 else image
+    x_height = estimate_x_height(np.asarray(probe))
+    if factor > 1 and (x_height is None or x_height < 2 * MIN_GLYPH_HEIGHT):
+        # Small text blurs together on the reduced copy; measure it at full size
+        probe = image
+        x_height = estimate_x_height(np.asarray(probe))
+    if x_height is None:
+        return None
+    return x_height * full_width / probe.width
+
+
+def load_scaled_image(image_path, target_x_height: float):
+    """
+    Load an image as grayscale, shrunk so its text is about target_x_height tall
+
+    JPEGs are decoded at reduced size by the decoder itself (PIL draft
+    mode): once at a small size to measure the text, then at the smallest
+    power-of-two reduction still above the target. Images with text
+    already at or below the target, or without measurable text, are
+    returned at full size.
+
+    Args:
+        image_path: Path to the image file
+        target_x_height: Wanted height of lowercase letters, in pixels
+
+    Returns:
+        (grayscale PIL image, scale relative to the file's resolution)
+    """
+    with Image.open(image_path) as image:
+        full_size = image.size
+        if image.format == "JPEG":
+            ratio = min(1.0, ESTIMATE_MAX_SIDE / max(full_size))
+            image.draft("L", (math.ceil(full_size[0] * ratio), math.ceil(full_size[1] * ratio)))
+        gray = image.convert("L")
+
+    x_height = _measure(gray, full_size[0])
+    if x_height is None and gray.size != full_size:
+        # Nothing recognizable in the draft; fall back to a full decode
+        with Image.open(image_path) as image:
+            gray = image.convert("L")
+        x_height = _measure(gray, full_size[0])
+
+    scale = 1.0 if x_height is None else min(1.0, target_x_height / x_height)
+    if scale > MIN_DOWNSCALE:
+        if gray.size != full_size:
+            with Image.open(image_path) as image:
+                gray = image.convert("L")
+        return gray, 1.0
+
+    size = (max(1, round(full_size[0] * scale)), max(1, round(full_size[1] * scale)))
+    if gray.size[0] < size[0]:
+        # The measuring draft was too small; decode again at the final size
+        with Image.open(image_path) as image:
+            image.draft("L", size)
+            gray = image.convert("L")
+    logger.info(
+        f"Downscaling {full_size[0]}x{full_size[1]} image to {size[0]}x{size[1]} "
+        f"(x-height {x_height:.0f} px -> {x_height * scale:.0f} px)"
+    )
+    return gray.resize(size, Image.Resampling.LANCZOS, reducing_gap=2.0), scale
@@ -8,35 +8,75 @@ import logging
 from typing import List
 import re
 
+from .model_registry import ModelRegistry, get_model_registry
+from .simplification_cache import SimplificationCache
+
 logger = logging.getLogger(__name__)
 
 # Try to import transformers, but make it optional
 try:
+    import torch
     from transformers import T5Tokenizer, T5ForConditionalGeneration
     from transformers import BartForConditionalGeneration, BartTokenizer
     HAS_TRANSFORMERS = True
 except ImportError:
     HAS_TRANSFORMERS = False
 
+# Checkpoint used for each model type; the distilled BART is fine-tuned for
+# summarization, which simplifies much better than raw bart-base
+MODEL_NAMES = {
+    "t5": "t5-small",
+    "bart": "sshleifer/distilbart-cnn-12-6",
+}
+
+# Half-precision weights only pay off (and only generate reliably) on a GPU
+HALF_PRECISION_DTYPES = ("float16", "bfloat16")
+
 
 class TextSimplifier:
     """Simplify text using rule-based and optional AI models"""
     
-    def __init__(self, model_type: str = "basic"):
+    def __init__(self, model_type: str = "basic", batch_size: int = 1, dtype: str = None,
+                 device: str = "cpu", registry: ModelRegistry = None, cache: SimplificationCache = None):
         """
         Initialize Text Simplifier
         
         Args:
             model_type: Type of model to use ("basic", "t5", or "bart")
                        Falls back to "basic" if transformers not available
+            batch_size: Sentences generated together by simplify_sentences
+                       (1 = one generate() call per sentence)
+            dtype: Weight dtype to load the model in, e.g. "float16"
+                  (None = as saved); half precision is only used on an
+                  available CUDA device, float32 otherwise
+            device: Device to run the model on
+            registry: ModelRegistry to get the model from (default: the
+                     process-wide one, so models load once per process)
+            cache: SimplificationCache for reusing earlier model output for
+                  the same sentences (None = always generate)
         """
         self.model_type = model_type
+        self.batch_size = batch_size
+        self.dtype = self._resolve_dtype(dtype, device)
+        self.device = device
+        self.registry = registry if registry is not None else get_model_registry()
+        self.cache = cache
         self.model = None
         self.tokenizer = None
         
         if model_type != "basic":
             self._load_model()
     
+    @staticmethod
+    def _resolve_dtype(dtype: str, device: str) -> str:
+        """The dtype to actually load in: half precision falls back to float32 off CUDA"""
+        if dtype not in HALF_PRECISION_DTYPES:
+            return dtype
+        if HAS_TRANSFORMERS and str(device).startswith("cuda") and torch.cuda.is_available():
+            return dtype
+        logger.warning(f"{dtype} needs a CUDA device, loading the model in float32 on {device}")
+        return "float32"
+    
     def _load_model(self):
         """Load the selected AI model and tokenizer"""
         if not HAS_TRANSFORMERS:
@@ -45,17 +85,12 @@ class TextSimplifier:
             return
             
         try:
-            if self.model_type == "t5":
-                self.tokenizer = T5Tokenizer.from_pretrained("t5-small")
-                self.model = T5ForConditionalGeneration.from_pretrained("t5-small")
-                logger.info("T5-small model loaded successfully")
-            elif self.model_type == "bart":
-                # Use a distilled BART model fine-tuned for summarization
-                # This is much better than raw bart-base for simplification
-                model_name = "sshleifer/distilbart-cnn-12-6"
-                self.tokenizer = BartTokenizer.from_pretrained(model_name)
-                self.model = BartForConditionalGeneration.from_pretrained(model_name)
-                logger.info(f"BART model ({model_name}) loaded successfully")
+            if self.model_type in MODEL_NAMES:
+                model_name = MODEL_NAMES[self.model_type]
+                self.tokenizer, self.model = self.registry.get(
+                    model_name, self._load_pretrained, dtype=self.dtype, device=self.device
+                )
+                logger.info(f"{self.model_type.upper()} model ({model_name}) ready")
             else:
                 logger.warning(f"Unsupported model type: {self.model_type}, using basic")
                 self.model_type = "basic"
@@ -63,6 +98,23 @@ class TextSimplifier:
             logger.warning(f"Error loading AI model ({e}), falling back to basic simplification")
             self.model_type = "basic"
     
+    def _load_pretrained(self, model_name: str, dtype, device: str):
+        """Load a tokenizer and model from disk or the Hugging Face hub (registry loader)"""
+        if self.model_type == "t5":
+            tokenizer_class, model_class = T5Tokenizer, T5ForConditionalGeneration
+        else:
+            tokenizer_class, model_class = BartTokenizer, BartForConditionalGeneration
+        
+        tokenizer = tokenizer_class.from_pretrained(model_name)
+        if dtype is not None:
+            model = model_class.from_pretrained(model_name, torch_dtype=getattr(torch, dtype))
+        else:
+            model = model_class.from_pretrained(model_name)
+        # Shared models are only ever used for inference
+        model.to(device)
+        model.eval()
+        return tokenizer, model
+    
     def simplify_text(self, text: str, max_length: int = 100, num_beams: int = 4) -> str:
         """
         Simplify complex text using the loaded model or basic rules
@@ -79,14 +131,17 @@ class TextSimplifier:
             if self.model_type == "basic":
                 return self._simplify_basic(text)
             
-            if self.model_type == "t5":
-                # T5 uses "summarize: " prefix for summarization/simplification
-                input_text = f"summarize: {text}"
-            else:  # BART
-                # BART models don't need a prefix, but we need a model fine-tuned for summarization
-                input_text = text
+            cache_key = None
+            if self.cache is not None:
+                cache_key = self._cache_key(text, max_length, num_beams)
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    return cached
             
+            input_text = self._model_input(text)
             inputs = self.tokenizer.encode(input_text, return_tensors="pt", max_length=512, truncation=True)
+            # Inputs have to be on the model's device
+            inputs = inputs.to(self.device)
             
             summary_ids = self.model.generate(
                 inputs,
@@ -95,50 +150,12 @@ class TextSimplifier:
                 early_stopping=True
             )
             
-            simplified_text = self.tokenizer.decode(summary_ids[0], skip_special_tokens=True).strip()
-            
-            # Debug: Write to file and print
-            debug_file = "bart_debug.txt"
-            with open(debug_file, "a", encoding="utf-8") as f:
-                f.write(f"\n{'='*80}\n")
-                f.write(f"BART Debug Output - {__import__('datetime').datetime.now()}\n")
-                f.write(f"{'='*80}\n")
-                f.write(f"Raw BART output length: {len(simplified_text)} chars\n")
-                f.write(f"Raw BART output:\n{simplified_text}\n")
-                f.write(f"\n")
-            
-            # Check for input duplication using fuzzy matching
-            # BART sometimes repeats the input text before generating the summary
-            from difflib import SequenceMatcher
-            
-            # Use stripped text for comparison
-            clean_text = text.strip()
-            
-            matcher = SequenceMatcher(None, clean_text, simplified_text)
-            match = matcher.find_longest_match(0, len(clean_text), 0, len(simplified_text))
-            
-            # If match starts at beginning of both strings and covers > 90% of input
-            if match.a == 0 and match.b == 0 and match.size / len(clean_text) > 0.9:
-                # Check if there is significant content after the duplication
-                if len(simplified_text) > match.size + 10:
-                    logger.info(f"Detected input duplication (coverage: {match.size / len(text):.2f}). Removing it.")
-                    simplified_text = simplified_text[match.size:].strip()
-                    
-                    # Remove leading punctuation that might be left over (like " .")
-                    import string
-                    simplified_text = simplified_text.lstrip(string.punctuation + string.whitespace)
-                    
-                    with open(debug_file, "a", encoding="utf-8") as f:
-                        f.write(f"✓ Removed duplication. New output:\n{simplified_text}\n")
-            
-            # Additional check: if the simplified text is very similar to input, it might be a failed simplification
-            if len(simplified_text.strip()) == 0:
-                logger.warning("Model returned empty output, using basic simplification")
-                return self._simplify_basic(text)
-            
-            with open(debug_file, "a", encoding="utf-8") as f:
-                f.write(f"\nFinal simplified text:\n{simplified_text}\n")
-                f.write(f"{'='*80}\n\n")
+            simplified_text, fallback = self._clean_output(
+                text, self.tokenizer.decode(summary_ids[0], skip_special_tokens=True).strip()
+            )
+            # A fallback may come from a passing model hiccup; don't make it stick
+            if cache_key is not None and not fallback:
+                self.cache.put(cache_key, simplified_text)
             
             logger.info("Text simplified successfully")
             return simplified_text
@@ -146,6 +163,64 @@ class TextSimplifier:
             logger.warning(f"Error simplifying text with AI model: {str(e)}, using basic simplification")
             return self._simplify_basic(text)
     
+    def _cache_key(self, text: str, max_length: int, num_beams: int) -> str:
+        """Cache key of a sentence for the loaded model"""
+        model_name = MODEL_NAMES[self.model_type]
+        if self.dtype is not None:
+            model_name = f"{model_name}@{self.dtype}"
+        return SimplificationCache.make_key(model_name, text, max_length, num_beams)
+    
+    def _model_input(self, text: str) -> str:
+        """Prepare a sentence for the loaded model"""
+        if self.model_type == "t5":
+            # T5 uses "summarize: " prefix for summarization/simplification
+            return f"summarize: {text}"
+        # BART models don't need a prefix, but we need a model fine-tuned for summarization
+        return text
+    
+    def _clean_output(self, text: str, simplified_text: str) -> tuple:
+        """
+        Tidy up a model's output for one input
+        
+        Args:
+            text: The input text
+            simplified_text: Decoded model output
+            
+        Returns:
+            Tuple of (simplified text, fallback); fallback is True when the
+            model gave nothing and basic simplification was used instead
+        """
+        # Drop blank and whitespace-only lines the model sometimes emits
+        simplified_text = "\n".join(line.strip() for line in simplified_text.splitlines() if line.strip())
+        
+        # Check for input duplication using fuzzy matching
+        # BART sometimes repeats the input text before generating the summary
+        from difflib import SequenceMatcher
+        
+        # Use stripped text for comparison
+        clean_text = text.strip()
+        
+        matcher = SequenceMatcher(None, clean_text, simplified_text)
+        match = matcher.find_longest_match(0, len(clean_text), 0, len(simplified_text))
+        
+        # If match starts at beginning of both strings and covers > 90% of input
+        if match.a == 0 and match.b == 0 and match.size / len(clean_text) > 0.9:
+            # Check if there is significant content after the duplication
+            if len(simplified_text) > match.size + 10:
+                logger.info(f"Detected input duplication (coverage: {match.size / len(text):.2f}). Removing it.")
+                simplified_text = simplified_text[match.size:].strip()
+        
+                # Remove leading punctuation that might be left over (like " .")
+                import string
+                simplified_text = simplified_text.lstrip(string.punctuation + string.whitespace)
+        
+        # Additional check: if the simplified text is very similar to input, it might be a failed simplification
+        if len(simplified_text.strip()) == 0:
+            logger.warning("Model returned empty output, using basic simplification")
+            return self._simplify_basic(text), True
+        
+        return simplified_text, False
+    
     def _simplify_basic(self, text: str) -> str:
         """Basic rule-based text simplification"""
         # Break into sentences
@@ -167,26 +242,91 @@ class TextSimplifier:
         
         return ' '.join(simplified)
     
-    def simplify_sentences(self, sentences: List[str], max_length: int = 100) -> List[str]:
+    def simplify_sentences(self, sentences: List[str], max_length: int = 100, num_beams: int = 4) -> List[str]:
         """
         Simplify a list of sentences
         
+        With a model loaded and batch_size above 1, sentences are sorted by
+        token length and generated batch_size at a time, so each batch
+        pads to a similar length; results come back in the input order.
+        Sentences found in the cache, and repeats of a sentence, are not
+        generated again.
+        
         Args:
             sentences: List of sentences to simplify
             max_length: Maximum length of each simplified sentence
+            num_beams: Number of beams for beam search (ignored for basic mode)
             
         Returns:
             List of simplified sentences
         """
-        simplified = []
-        for sentence in sentences:
+        if self.model_type == "basic" or self.batch_size <= 1:
+            simplified = []
+            for sentence in sentences:
+                try:
+                    simple_sent = self.simplify_text(sentence, max_length, num_beams)
+                    simplified.append(simple_sent)
+                except Exception as e:
+                    logger.warning(f"Could not simplify sentence. Using basic simplification.")
+                    simplified.append(self._simplify_basic(sentence))
+            return simplified
+        
+        simplified = [None] * len(sentences)
+        keys = None
+        if self.cache is not None:
+            keys = [self._cache_key(sentence, max_length, num_beams) for sentence in sentences]
+            found = self.cache.get_many(keys)
+            simplified = [found.get(key) for key in keys]
+        
+        # Each distinct sentence still missing is generated once
+        first_seen = {}
+        for i, sentence in enumerate(sentences):
+            if simplified[i] is None:
+                first_seen.setdefault(sentence, i)
+        pending = list(first_seen.values())
+        
+        input_ids = {}
+        if pending:
+            # Tokenize once, unpadded, to bucket sentences by length
+            encoded = self.tokenizer(
+                [self._model_input(sentences[i]) for i in pending], max_length=512, truncation=True
+            )["input_ids"]
+            input_ids = dict(zip(pending, encoded))
+        order = sorted(pending, key=lambda i: len(input_ids[i]))
+        
+        for first in range(0, len(order), self.batch_size):
+            batch = order[first:first + self.batch_size]
             try:
-                simple_sent = self.simplify_text(sentence, max_length)
-                simplified.append(simple_sent)
+                inputs = self.tokenizer.pad({"input_ids": [input_ids[i] for i in batch]}, return_tensors="pt")
+                inputs = inputs.to(self.device)
+                summary_ids = self.model.generate(
+                    **inputs,
+                    max_length=max_length,
+                    num_beams=num_beams,
+                    early_stopping=True
+                )
+                outputs = self.tokenizer.batch_decode(summary_ids, skip_special_tokens=True)
             except Exception as e:
-                logger.warning(f"Could not simplify sentence. Using basic simplification.")
-                simplified.append(self._simplify_basic(sentence))
+                logger.warning(f"Batch generation failed ({str(e)}), simplifying its sentences one by one")
+                for i in batch:
+                    simplified[i] = self.simplify_text(sentences[i], max_length, num_beams)
+                continue
+            
+            generated = {}
+            for i, output in zip(batch, outputs):
+                simplified[i], fallback = self._clean_output(sentences[i], output.strip())
+                if not fallback:
+                    generated[i] = simplified[i]
+            if keys is not None:
+                self.cache.put_many({keys[i]: result for i, result in generated.items()})
+        
+        for i, sentence in enumerate(sentences):
+            if simplified[i] is None:
+                simplified[i] = simplified[first_seen[sentence]]
         
+        logger.info(
+            f"Simplified {len(sentences)} sentences ({len(pending)} generated) in batches of up to {self.batch_size}"
+        )
         return simplified
     
     def split_and_simplify(self, text: str, chunk_size: int = 100) -> str:
@@ -0,0 +1,151 @@
+"""
+TIFF Document Module
+Read multi-frame TIFFs (fax and scanner batches) page by page through the
+same interface the OCR pipeline uses for pdfium documents
+"""
+
+import threading
+
+import numpy as np
+from PIL import Image
+
+# PDF user space is 72 points per inch; frame sizes are reported in points
+POINTS_PER_INCH = 72
+
+TIFF_SUFFIXES = (".tif", ".tiff")
+
+# Recorded resolutions below this are placeholders rather than measurements
+# (PIL reports 1 dpi for TIFFs without resolution tags)
+MIN_PLAUSIBLE_DPI = 50
+
+
+def is_tiff(path) -> bool:
+    """True if a path names a TIFF file"""
+    return str(path).lower().endswith(TIFF_SUFFIXES)
+
+
+def recorded_dpi(info: dict):
+    """
+    Get the resolution an image records, if it is believable
+
+    Args:
+        info: PIL image info dictionary
+
+    Returns:
+        (x, y) dpi as floats, or None if missing or implausibly low
+    """
+    dpi = info.get("dpi")
+    if not dpi or any(not value or value < MIN_PLAUSIBLE_DPI for value in dpi):
+        return None
+    return float(dpi[0]), float(dpi[1])
+
+
+class _NoTextPage:
+    """Text layer of a scanned frame: always empty"""
+
+    def get_text_range(self) -> str:
+        return ""
+
+    def close(self):
+        pass
+
+
+class _FrameBitmap:
+    """Rendered frame, with the to_numpy()/close() of a pdfium bitmap"""
+
+    def __init__(self, image: Image.Image):
+        self._image = image
+
+    def to_numpy(self) -> np.ndarray:
+        return np.asarray(self._image)
+
+    def close(self):
+        self._image.close()
+
+
+class TiffFrame:
+    """
+    One frame of a TIFF, loaded as grayscale
+
+    Behaves like a pdfium page for the OCR pipeline: get_size() is in
+    points at the frame's own resolution, and render() resamples the scan
+    to the requested scale.
+    """
+
+    def __init__(self, image: Image.Image, dpi):
+        self._image = image
+        # Fax frames often have different horizontal and vertical resolution
+        self.dpi = dpi
+
+    def get_size(self):
+        """Frame width and height in points"""
+        width, height = self._image.size
+        return width * POINTS_PER_INCH / self.dpi[0], height * POINTS_PER_INCH / self.dpi[1]
+
+    def get_textpage(self) -> _NoTextPage:
+        return _NoTextPage()
+
+    def render(self, scale: float, grayscale: bool = True) -> _FrameBitmap:
+        """
+        Resample the frame to `scale` pixels per point
+
+        Args:
+            scale: Output pixels per point (dpi / 72)
+            grayscale: Accepted for pdfium compatibility; frames are
+                       always grayscale
+
+        Returns:
+            Bitmap with to_numpy() and close()
+        """
+        width, height = self.get_size()
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        if size == self._image.size:
+            return _FrameBitmap(self._image.copy())
+        return _FrameBitmap(self._image.resize(size, Image.Resampling.LANCZOS))
+
+    def close(self):
+        self._image.close()
+
+
+class TiffDocument:
+    """
+    A TIFF file opened for page-by-page access
+
+    Frames are decoded only when indexed, one at a time, so a long scanner
+    batch never sits in memory whole. Indexing is thread-safe.
+    """
+
+    def __init__(self, path, default_dpi: float = 300):
+        """
+        Open a TIFF file
+
+        Args:
+            path: Path to the TIFF file
+            default_dpi: Resolution assumed for frames that don't record a
+                         plausible one
+        """
+        self.path = str(path)
+        self.default_dpi = default_dpi
+        self._image = Image.open(self.path)
+        # Counting frames walks the whole file once; do it up front
+        self._num_frames = getattr(self._image, "n_frames", 1)
+        # PIL decodes whichever frame was seeked to last
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._num_frames
+
+    def __getitem__(self, index: int) -> TiffFrame:
+        if not 0 <= index < len(self):
+            raise IndexError(f"Frame {index} out of range for a {len(self)}-frame TIFF")
+        with self._lock:
+            self._image.seek(index)
+            dpi = recorded_dpi(self._image.info)
+            # convert() decodes this frame into an image of its own
+            frame = self._image.convert("L")
+        if dpi is None:
+            dpi = (float(self.default_dpi), float(self.default_dpi))
+        return TiffFrame(frame, dpi)
+
+    def close(self):
+        self._image.close()
@@ -0,0 +1,265 @@
+"""
+Word Boxes Module
+Compact, columnar storage of OCR word positions and confidences
+"""
+
+import numpy as np
+
+
+def _word_offsets(words: list):
+    """Start and end offsets of words joined with single spaces"""
+    lengths = np.fromiter(map(len, words), dtype=np.int32, count=len(words))
+    start = np.zeros(len(words), dtype=np.int32)
+    if len(words):
+        np.cumsum(lengths[:-1] + 1, out=start[1:])
+    return start, start + lengths
+
+
+class WordBoxes:
+    """
+    Recognized words stored as NumPy columns over one shared text string
+
+    Word i is text[start[i]:end[i]]. Words are separated by single spaces,
+    so `text` is the same cleaned string the extractor returns elsewhere.
+    Each column holds one value per word:
+
+        page:  Zero-based page index (int32)
+        block: Tesseract block number within the page (int32)
+        line:  Line number within the page, in reading order (int32)
+        bbox:  (left, top, width, height) in PDF points from the top-left
+               page corner, or in pixels for images (float32, shape (n, 4))
+        conf:  Tesseract word confidence, 0-100 (float32)
+        start, end: Character offsets of the word in `text` (int32)
+    """
+
+    def __init__(self, text: str, page, block, line, bbox, conf, start, end):
+        self.text = text
+        self.page = np.asarray(page, dtype=np.int32)
+        self.block = np.asarray(block, dtype=np.int32)
+        self.line = np.asarray(line, dtype=np.int32)
+        self.bbox = np.asarray(bbox, dtype=np.float32).reshape(-1, 4)
+        self.conf = np.asarray(conf, dtype=np.float32)
+        self.start = np.asarray(start, dtype=np.int32)
+        self.end = np.asarray(end, dtype=np.int32)
+
+    @classmethod
+    def empty(cls) -> "WordBoxes":
+        """Word boxes with no words"""
+        return cls("", [], [], [], [], [], [], [])
+
+    @classmethod
+    def from_tesseract(cls, data: dict, page: int = 0, scale: float = 1.0, origin=(0, 0)) -> "WordBoxes":
+        """
+        Build word boxes from Tesseract's word data
+
+        Args:
+            data: image_to_data() output as a dict of columns
+            page: Page index to record for every word
+            scale: Factor from image pixels to output units (72 / dpi
+                   gives PDF points)
+            origin: (left, top) of the OCR'd image within the full page, in
+                    pixels, for images cropped before OCR
+
+        Returns:
+            WordBoxes for the words Tesseract found
+        """
+        conf = np.asarray(data["conf"], dtype=np.float32)
+        # Non-word rows (pages, blocks, lines, ...) have conf -1 and no text
+        keep = np.flatnonzero(
+            (conf >= 0) & np.fromiter((bool(w.strip()) for w in data["text"]), dtype=bool, count=conf.size)
+        )
+        if keep.size == 0:
+            return cls.empty()
+
+        words = [data["text"][i].strip() for i in keep]
+        start, end = _word_offsets(words)
+
+        def column(name):
+            return np.asarray(data[name])[keep]
+
+        # Line numbers restart in every paragraph, so number the lines of the
+        # page in order wherever block, paragraph or line changes
+        block = column("block_num")
+        line_key = np.stack([block, column("par_num"), column("line_num")], axis=1)
+        line = np.concatenate(([0], np.cumsum(np.any(np.diff(line_key, axis=0) != 0, axis=1))))
+
+        bbox = np.stack([column("left"), column("top"), column("width"), column("height")], axis=1)
+        bbox = (bbox + [origin[0], origin[1], 0, 0]) * scale
+
+        return cls(
+            " ".join(words),
+            np.full(len(words), page),
+            block,
+            line,
+            bbox,
+            conf[keep],
+            start,
+            end,
+        )
+
+    @classmethod
+    def concat(cls, parts) -> "WordBoxes":
+        """
+        Join word boxes (e.g. one per page) into one, keeping `text` and offsets consistent
+
+        Args:
+            parts: Iterable of WordBoxes (None entries are skipped)
+
+        Returns:
+            Combined WordBoxes
+        """
+        parts = [part for part in parts if part is not None and len(part)]
+        if not parts:
+            return cls.empty()
+
+        # Shift each part's offsets past the text before it and its separator
+        shifts = np.cumsum([0] + [len(part.text) + 1 for part in parts[:-1]])
+        return cls(
+            " ".join(part.text for part in parts),
+            np.concatenate([part.page for part in parts]),
+            np.concatenate([part.block for part in parts]),
+            np.concatenate([part.line for part in parts]),
+            np.concatenate([part.bbox for part in parts]),
+            np.concatenate([part.conf for part in parts]),
+            np.concatenate([part.start + shift for part, shift in zip(parts, shifts)]),
+            np.concatenate([part.end + shift for part, shift in zip(parts, shifts)]),
+        )
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    def __repr__(self) -> str:
+        return f"WordBoxes({len(self)} words, {len(np.unique(self.page))} pages)"
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the columns and text, in bytes"""
+        columns = (self.page, self.block, self.line, self.bbox, self.conf, self.start, self.end)
+        return sum(column.nbytes for column in columns) + len(self.text.encode("utf-8"))
+
+    def word(self, index: int) -> str:
+        """Get the text of one word"""
+        return self.text[self.start[index]:self.end[index]]
+
+    def words(self) -> list:
+        """Get the text of every word"""
+        return [self.text[s:e] for s, e in zip(self.start.tolist(), self.end.tolist())]
+
+    def _slice(self, first: int, last: int) -> "WordBoxes":
+        """Words first..last-1 as their own WordBoxes, with offsets rebased"""
+        if first >= last:
+            return WordBoxes.empty()
+        offset = self.start[first]
+        return WordBoxes(
+            self.text[offset:self.end[last - 1]],
+            self.page[first:last],
+            self.block[first:last],
+            self.line[first:last],
+            self.bbox[first:last],
+            self.conf[first:last],
+            self.start[first:last] - offset,
+            self.end[first:last] - offset,
+        )
+
+    def take(self, indices) -> "WordBoxes":
+        """
+        Get a subset of the words, with `text` and offsets rebuilt
+
+        Args:
+            indices: Word indices to keep, in the order wanted
+
+        Returns:
+            New WordBoxes holding only those words
+        """
+        indices = np.asarray(indices, dtype=np.intp)
+        words = [self.text[s:e] for s, e in zip(self.start[indices].tolist(), self.end[indices].tolist())]
+        start, end = _word_offsets(words)
+        return WordBoxes(
+            " ".join(words),
+            self.page[indices],
+            self.block[indices],
+            self.line[indices],
+            self.bbox[indices],
+            self.conf[indices],
+            start,
+            end,
+        )
+
+    def for_page(self, page: int) -> "WordBoxes":
+        """
+        Get the words of one page
+
+        Args:
+            page: Zero-based page index
+
+        Returns:
+            WordBoxes of that page (empty if it has no words)
+        """
+        # Pages are stored in order, so each page is one contiguous run
+        first, last = np.searchsorted(self.page, [page, page + 1])
+        return self._slice(int(first), int(last))
+
+    def _line_runs(self):
+        """Index of the first word of each line, and one past its last word"""
+        breaks = np.flatnonzero((np.diff(self.line) != 0) | (np.diff(self.page) != 0)) + 1
+        return np.concatenate(([0], breaks)), np.concatenate((breaks, [len(self)]))
+
+    def lines(self) -> list:
+        """
+        Get the text line by line
+
+        Returns:
+            List of line strings in reading order
+        """
+        if not len(self):
+            return []
+        firsts, ends = self._line_runs()
+        return [self.text[self.start[f]:self.end[e - 1]] for f, e in zip(firsts.tolist(), ends.tolist())]
+
+    def line_confidences(self) -> np.ndarray:
+        """
+        Get the mean word confidence of each line
+
+        Returns:
+            Array of confidences (0-100), one per entry of lines()
+        """
+        if not len(self):
+            return np.zeros(0, dtype=np.float32)
+        firsts, ends = self._line_runs()
+        return np.add.reduceat(self.conf, firsts) / (ends - firsts)
+
+    def find(self, span_start: int, span_end: int) -> np.ndarray:
+        """
+        Find the words overlapping a character span of `text`
+
+        Useful for highlighting: search the text, then look up the boxes.
+
+        Args:
+            span_start: First character of the span
+            span_end: One past the last character of the span
+
+        Returns:
+            Indices of the overlapping words
+        """
+        return np.flatnonzero((self.start < span_end) & (self.end > span_start))
+
+    def to_dict(self) -> dict:
+        """Convert to plain lists (JSON-serializable, e.g. for the OCR cache)"""
+        return {
+            "text": self.text,
+            "page": self.page.tolist(),
+            "block": self.block.tolist(),
+            "line": self.line.tolist(),
+            "bbox": self.bbox.tolist(),
+            "conf": self.conf.tolist(),
+            "start": self.start.tolist(),
+            "end": self.end.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "WordBoxes":
+        """Rebuild word boxes from to_dict() output"""
+        return cls(
+            data["text"], data["page"], data["block"], data["line"],
+            data["bbox"], data["conf"], data["start"], data["end"],
+        )
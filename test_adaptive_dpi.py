@@ -0,0 +1,92 @@
+"""
+Test adaptive render resolution for PDF OCR using mocks
+"""
+
+import unittest
+from unittest.mock import patch
+import os
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from modules.ocr_extractor import OCRExtractor
+from ocr_test_utils import make_blank_pdf
+
+
+def tesseract_data(words, confidence):
+    """Build an image_to_data-style dict with one block row and the given words"""
+    return {
+        "text": [""] + words,
+        "conf": [-1] + [confidence] * len(words),
+    }
+
+
+class TestAdaptiveDPI(unittest.TestCase):
+
+    def setUp(self):
+        # Test pages are 300 points (~4.2 inches) wide
+        self.pdf_path = make_blank_pdf(1)
+
+    def tearDown(self):
+        os.remove(self.pdf_path)
+
+    @patch('modules.ocr_extractor.pytesseract')
+    def test_clean_page_keeps_draft_pass(self, mock_pytesseract):
+        """A confident draft pass is used as is"""
+        mock_pytesseract.image_to_data.return_value = tesseract_data(["Clean", "print"], 95)
+
+        ocr = OCRExtractor(dpi=300, draft_dpi=144, min_confidence=80)
+        result = next(ocr.iter_pdf_pages(self.pdf_path))
+
+        self.assertEqual(result["text"], "Clean print")
+        self.assertEqual(result["dpi"], 144)
+        self.assertEqual(result["confidence"], 95)
+        self.assertEqual(mock_pytesseract.image_to_data.call_count, 1)
+        image = mock_pytesseract.image_to_data.call_args[0][0]
+        self.assertEqual(image.width, 600)
+
+    @patch('modules.ocr_extractor.pytesseract')
+    def test_low_confidence_page_is_rerendered(self, mock_pytesseract):
+        """A low-confidence draft pass triggers a full-resolution pass"""
+        mock_pytesseract.image_to_data.side_effect = [
+            tesseract_data(["B1urry", "tcxt"], 40),
+            tesseract_data(["Blurry", "text"], 90),
+        ]
+
+        ocr = OCRExtractor(dpi=300, draft_dpi=144, min_confidence=80)
+        result = next(ocr.iter_pdf_pages(self.pdf_path))
+
+        self.assertEqual(result["text"], "Blurry text")
+        self.assertEqual(result["dpi"], 300)
+        widths = [c[0][0].width for c in mock_pytesseract.image_to_data.call_args_list]
+        self.assertEqual(widths, [600, 1250])
+
+    @patch('modules.ocr_extractor.pytesseract')
+    def test_blank_page_is_not_rerendered(self, mock_pytesseract):
+        """No words at all means nothing to gain from a sharper render"""
+        mock_pytesseract.image_to_data.return_value = tesseract_data([], 0)
+
+        ocr = OCRExtractor(dpi=300, draft_dpi=144)
+        result = next(ocr.iter_pdf_pages(self.pdf_path))
+
+        self.assertEqual(result["text"], "")
+        self.assertIsNone(result["confidence"])
+        self.assertEqual(mock_pytesseract.image_to_data.call_count, 1)
+
+    @patch('modules.ocr_extractor.pytesseract')
+    def test_single_pass_without_draft_dpi(self, mock_pytesseract):
+        """Without a draft DPI pages are rendered once at the configured DPI"""
+        mock_pytesseract.image_to_string.return_value = "text"
+
+        ocr = OCRExtractor(dpi=144)
+        result = next(ocr.iter_pdf_pages(self.pdf_path))
+
+        self.assertEqual(result["dpi"], 144)
+        mock_pytesseract.image_to_data.assert_not_called()
+        self.assertEqual(mock_pytesseract.image_to_string.call_args[0][0].width, 600)
+
+
+if __name__ == '__main__':
+    unittest.main()
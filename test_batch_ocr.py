@@ -0,0 +1,109 @@
+"""
+Test multi-page Tesseract batches using mocks
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+from PIL import Image
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from modules.ocr_cache import OCRCache
+from modules.ocr_extractor import OCRExtractor
+from ocr_test_utils import make_blank_pdf
+
+TSV_HEADER = "level\tpage_num\tblock_num\tpar_num\tline_num\tword_num\tleft\ttop\twidth\theight\tconf\ttext\n"
+
+
+def fake_tesseract(cmd, input, **kwargs):
+    """Stand-in for a multi-page tesseract run: one line of text per TIFF frame"""
+    tiff = Image.open(BytesIO(input))
+    frames = getattr(tiff, "n_frames", 1)
+    if cmd[-1] == "tsv":
+        rows = [f"5\t{p}\t1\t1\t1\t1\t10\t20\t30\t12\t{90 + p}\tFrame{p}\n" for p in range(1, frames + 1)]
+        stdout = TSV_HEADER + "".join(rows)
+    else:
+        stdout = "".join(f"Frame {p}\n\f" for p in range(1, frames + 1))
+    return MagicMock(returncode=0, stdout=stdout.encode("utf-8"), stderr=b"")
+
+
+class TestBatchOCR(unittest.TestCase):
+
+    def setUp(self):
+        self.pdf_path = make_blank_pdf(5)
+
+    def tearDown(self):
+        os.remove(self.pdf_path)
+
+    @patch('modules.ocr_extractor.subprocess.run', side_effect=fake_tesseract)
+    def test_pages_share_tesseract_runs(self, mock_run):
+        """Pages go to Tesseract as multi-page TIFFs and are split back apart"""
+        ocr = OCRExtractor(dpi=72, batch_size=2, tesseract_transport="pipe")
+        results = list(ocr.iter_pdf_pages(self.pdf_path))
+
+        self.assertEqual([r["text"] for r in results], ["Frame 1", "Frame 2", "Frame 1", "Frame 2", "Frame 1"])
+        self.assertEqual([r["page"] for r in results], [0, 1, 2, 3, 4])
+        # Batches of 2, 2 and a single page
+        self.assertEqual(mock_run.call_count, 3)
+        cmd = mock_run.call_args_list[0][0][0]
+        self.assertEqual(cmd[1:3], ["stdin", "stdout"])
+        self.assertIn("page_separator=\f", cmd)
+        self.assertTrue(mock_run.call_args_list[0][1]["input"][:4] in (b"II*\x00", b"MM\x00*"))
+
+    @patch('modules.ocr_extractor.subprocess.run', side_effect=fake_tesseract)
+    def test_word_data_is_split_by_page(self, mock_run):
+        """TSV output of a batch is split on page_num"""
+        ocr = OCRExtractor(dpi=72, batch_size=5, word_boxes=True)
+        results = list(ocr.iter_pdf_pages(self.pdf_path))
+
+        self.assertEqual(mock_run.call_count, 1)
+        self.assertEqual([r["text"] for r in results], [f"Frame{p}" for p in range(1, 6)])
+        self.assertEqual([r["confidence"] for r in results], [91, 92, 93, 94, 95])
+        self.assertEqual(results[3]["words"].page.tolist(), [3])
+
+    @patch('modules.ocr_extractor.subprocess.run', side_effect=fake_tesseract)
+    def test_low_confidence_pages_are_rebatched(self, mock_run):
+        """Draft pages below the confidence bar are re-rendered and batched again"""
+        ocr = OCRExtractor(dpi=144, draft_dpi=72, min_confidence=93, batch_size=5)
+        results = list(ocr.iter_pdf_pages(self.pdf_path))
+
+        # Draft batch of 5, then one batch with the pages that scored 91 and 92
+        self.assertEqual(mock_run.call_count, 2)
+        self.assertEqual([r["dpi"] for r in results], [144, 144, 72, 72, 72])
+        rerun = Image.open(BytesIO(mock_run.call_args_list[1][1]["input"]))
+        self.assertEqual(rerun.n_frames, 2)
+
+    @patch('modules.ocr_extractor.subprocess.run', side_effect=fake_tesseract)
+    def test_batch_size_does_not_change_cache_key(self, mock_run):
+        """Batching is a speed setting, so results are shared across batch sizes"""
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = OCRCache(os.path.join(tmp, "cache.sqlite3"))
+            list(OCRExtractor(dpi=72, batch_size=5, cache=cache).iter_pdf_pages(self.pdf_path))
+            ocr = OCRExtractor(dpi=72, batch_size=2, cache=cache)
+            list(ocr.iter_pdf_pages(self.pdf_path))
+            cache.close()
+
+        self.assertEqual(mock_run.call_count, 1)
+        self.assertEqual(ocr.last_stats["cached_pages"], 5)
+
+    @patch('modules.ocr_extractor.ProcessPoolExecutor', ThreadPoolExecutor)
+    @patch('modules.ocr_extractor.subprocess.run', side_effect=fake_tesseract)
+    def test_batches_spread_over_workers(self, mock_run):
+        """Each worker gets a batch even when there are fewer pages than batch_size"""
+        ocr = OCRExtractor(dpi=72, num_workers=2, batch_size=16)
+        results = list(ocr.iter_pdf_pages(self.pdf_path))
+
+        self.assertEqual([r["page"] for r in results], [0, 1, 2, 3, 4])
+        self.assertEqual(mock_run.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+"""
+Test batched, length-bucketed sentence simplification using mocks
+"""
+
+import unittest
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from modules.text_simplifier import TextSimplifier
+
+PAD = "<pad>"
+
+
+class Tokens(list):
+    """Token rows standing in for a tensor, tracking the device they are on"""
+
+    device = "cpu"
+
+    def to(self, device):
+        moved = Tokens(self)
+        moved.device = device
+        return moved
+
+
+class Batch(dict):
+    """Padded batch standing in for a BatchEncoding"""
+
+    def to(self, device):
+        return Batch({name: rows.to(device) for name, rows in self.items()})
+
+
+class FakeTokenizer:
+    """Word-level stand-in for a Hugging Face tokenizer"""
+
+    def __call__(self, texts, max_length=512, truncation=True):
+        return {"input_ids": [text.split()[:max_length] for text in texts]}
+
+    def pad(self, encoded, return_tensors=None):
+        rows = encoded["input_ids"]
+        width = max(len(row) for row in rows)
+        return Batch({
+            "input_ids": Tokens(row + [PAD] * (width - len(row)) for row in rows),
+            "attention_mask": Tokens([1] * len(row) + [0] * (width - len(row)) for row in rows),
+        })
+
+    def encode(self, text, return_tensors=None, max_length=512, truncation=True):
+        return Tokens([text.split()[:max_length]])
+
+    def decode(self, row, skip_special_tokens=True):
+        return " ".join(row)
+
+    def batch_decode(self, rows, skip_special_tokens=True):
+        return [" ".join(token for token in row if token != PAD) for row in rows]
+
+
+class FakeModel:
+    """Generates each input with the prefix dropped and words upper-cased"""
+
+    def __init__(self, fail=False, device="cpu"):
+        self.fail = fail
+        self.device = device
+        self.batches = []
+
+    def generate(self, input_ids, attention_mask=None, **kwargs):
+        if input_ids.device != self.device:
+            raise RuntimeError(f"Expected all tensors to be on the same device, got {input_ids.device}")
+        if self.fail:
+            raise RuntimeError("out of memory")
+        self.batches.append(input_ids)
+        return [[token if token == PAD else token.upper() for token in row[1:]] for row in input_ids]
+
+
+class TestBatchedSimplification(unittest.TestCase):
+
+    SENTENCES = [
+        "a b c d e f g h.",
+        "one.",
+        "x y z w v u.",
+        "two words.",
+        "p q r s t.",
+        "three little words.",
+        "m n o.",
+    ]
+
+    def setUp(self):
+        # Run in an empty directory to check nothing gets written to it
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.mkdtemp()
+        os.chdir(self.tmp)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.tmp)
+
+    def simplifier(self, batch_size, model):
+        simplifier = TextSimplifier(batch_size=batch_size, device=model.device)
+        simplifier.model_type = "t5"
+        simplifier.tokenizer = FakeTokenizer()
+        simplifier.model = model
+        return simplifier
+
+    def test_batches_keep_sentence_order(self):
+        """Results line up with the input sentences whatever batch they ran in"""
+        model = FakeModel()
+        result = self.simplifier(3, model).simplify_sentences(self.SENTENCES)
+
+        self.assertEqual(result, [sentence.upper() for sentence in self.SENTENCES])
+        self.assertEqual([len(batch) for batch in model.batches], [3, 3, 1])
+
+    def test_batches_are_bucketed_by_length(self):
+        """Sentences of similar length share a batch, so little padding is generated"""
+        model = FakeModel()
+        self.simplifier(3, model).simplify_sentences(self.SENTENCES)
+
+        lengths = [sum(token != PAD for token in row) for batch in model.batches for row in batch]
+        self.assertEqual(lengths, sorted(lengths))
+        padding = sum(row.count(PAD) for batch in model.batches for row in batch)
+        # Batching in input order instead would pad the short sentences
+        # up to their long neighbours
+        tokens = [len(sentence.split()) + 1 for sentence in self.SENTENCES]
+        unsorted = sum(max(tokens[i:i + 3]) * len(tokens[i:i + 3]) - sum(tokens[i:i + 3]) for i in range(0, 7, 3))
+        self.assertEqual(padding, 7)
+        self.assertEqual(unsorted, 14)
+
+    def test_failed_batch_falls_back(self):
+        """A batch that fails to generate is simplified sentence by sentence"""
+        result = self.simplifier(4, FakeModel(fail=True)).simplify_sentences(["Short one.", "Another."])
+
+        self.assertEqual(result, ["Short one.", "Another."])
+
+    def test_inputs_are_moved_to_the_model_device(self):
+        """Both generation paths hand generate() inputs on the model's device"""
+        model = FakeModel(device="cuda")
+        self.assertEqual(self.simplifier(3, model).simplify_sentences(self.SENTENCES[:3]), [
+            sentence.upper() for sentence in self.SENTENCES[:3]
+        ])
+        self.assertEqual(self.simplifier(1, model).simplify_text("one."), "ONE.")
+        self.assertEqual(len(model.batches), 2)
+
+    def test_output_is_tidied_without_side_files(self):
+        """Blank lines are dropped from model output and no debug log is written"""
+        simplifier = self.simplifier(3, FakeModel())
+        output, fallback = simplifier._clean_output("Some input.", "  \nFirst line.\n \t \n Second line. \n")
+        self.assertEqual(output, "First line.\nSecond line.")
+        self.assertFalse(fallback)
+
+        simplifier.simplify_sentences(self.SENTENCES)
+        self.assertEqual(os.listdir(self.tmp), [])
+
+    def test_batch_size_one_uses_single_generation(self):
+        """batch_size=1 keeps the one-sentence-per-call path"""
+        simplifier = TextSimplifier(batch_size=1)
+        self.assertEqual(
+            simplifier.simplify_sentences(["Cats sleep.", "Dogs bark."]),
+            ["Cats sleep.", "Dogs bark."],
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,175 @@
+"""
+Test bounded-memory PDF extraction using mocks
+"""
+
+import unittest
+from unittest.mock import patch
+import itertools
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+import numpy as np
+
+from modules.memory_limits import MB, MemoryLimitExceeded, fit_render_dpi
+from modules.ocr_cache import OCRCache
+from modules.ocr_extractor import OCRExtractor
+from ocr_test_utils import make_blank_pdf
+
+
+def fake_rss(mb, start_mb=0):
+    """Patch RSS readings everywhere they are taken, with extraction starting at start_mb"""
+    readings = itertools.chain([start_mb * MB], itertools.repeat(mb * MB))
+    rss = patch('modules.memory_limits.current_rss', return_value=mb * MB)
+    extractor_rss = patch('modules.ocr_extractor.current_rss', side_effect=lambda: next(readings))
+    return rss, extractor_rss
+
+
+class TestFitRenderDPI(unittest.TestCase):
+
+    def test_no_cap_keeps_dpi(self):
+        """Without a cap the requested DPI is used"""
+        self.assertEqual(fit_render_dpi(300, (8.5, 11), None, 100), 300)
+
+    @patch('modules.memory_limits.current_rss', return_value=100 * MB)
+    def test_page_that_fits_keeps_dpi(self, mock_rss):
+        """A page that fits in the headroom is rendered as requested"""
+        # 8.5x11 in at 300 dpi with 4 working copies is about 32 MB
+        self.assertEqual(fit_render_dpi(300, (8.5, 11), 200, 100), 300)
+
+    @patch('modules.memory_limits.current_rss', return_value=184 * MB)
+    def test_tight_headroom_lowers_dpi(self, mock_rss):
+        """DPI shrinks with the square root of the missing memory"""
+        dpi = fit_render_dpi(300, (8.5, 11), 200, 100)
+        self.assertLess(dpi, 300)
+        self.assertGreaterEqual(dpi, 200)
+
+    @patch('modules.memory_limits.current_rss', return_value=199 * MB)
+    def test_no_headroom_raises(self, mock_rss):
+        """Pages that can't fit even at the minimum DPI raise"""
+        with self.assertRaises(MemoryLimitExceeded):
+            fit_render_dpi(300, (8.5, 11), 200, 100)
+
+    @patch('modules.memory_limits.current_rss', return_value=700 * MB)
+    def test_baseline_is_not_counted(self, mock_rss):
+        """Only memory beyond the baseline counts against the cap"""
+        self.assertEqual(fit_render_dpi(300, (8.5, 11), 200, 100, baseline=600 * MB), 300)
+
+    @patch('modules.memory_limits.current_rss', return_value=None)
+    def test_unmeasurable_rss_keeps_dpi(self, mock_rss):
+        """Platforms without an RSS reading fall back to the requested DPI"""
+        self.assertEqual(fit_render_dpi(300, (8.5, 11), 200, 100), 300)
+
+
+class TestBoundedExtraction(unittest.TestCase):
+
+    def setUp(self):
+        # Test pages are 300x400 points (~4.2x5.6 inches)
+        self.pdf_path = make_blank_pdf(3)
+
+    def tearDown(self):
+        os.remove(self.pdf_path)
+
+    @patch('modules.ocr_extractor.pytesseract')
+    def test_pages_shrink_under_tight_cap(self, mock_pytesseract):
+        """Pages are rendered below the configured DPI when memory is short"""
+        mock_pytesseract.image_to_string.return_value = "Some text"
+        rss, extractor_rss = fake_rss(98)
+
+        with rss, extractor_rss:
+            ocr = OCRExtractor(dpi=300, max_rss_mb=100)
+            results = list(ocr.iter_pdf_pages(self.pdf_path))
+
+        for result in results:
+            self.assertTrue(result["memory_limited"])
+            self.assertLess(result["dpi"], 300)
+            self.assertEqual(result["rss_mb"], 98)
+        self.assertEqual(ocr.last_stats["memory_limited_pages"], 3)
+        self.assertEqual(ocr.last_stats["peak_rss_mb"], 98)
+        self.assertEqual(ocr.last_stats["memory_limit_mb"], 100)
+
+    @patch('modules.ocr_extractor.pytesseract')
+    def test_memory_held_before_extraction_is_not_counted(self, mock_pytesseract):
+        """A process already over the cap (loaded models) still renders at full DPI"""
+        mock_pytesseract.image_to_string.return_value = "Some text"
+        rss, extractor_rss = fake_rss(2100, start_mb=2100)
+
+        with rss, extractor_rss:
+            ocr = OCRExtractor(dpi=216, max_rss_mb=2048)
+            results = list(ocr.iter_pdf_pages(self.pdf_path))
+
+        self.assertEqual([r["dpi"] for r in results], [216] * 3)
+        self.assertEqual(ocr.last_stats["memory_limited_pages"], 0)
+
+    @patch('modules.ocr_extractor.pytesseract')
+    def test_memory_limited_pages_are_not_cached(self, mock_pytesseract):
+        """Reduced-resolution results don't end up in the OCR cache"""
+        mock_pytesseract.image_to_string.return_value = "Some text"
+        rss, extractor_rss = fake_rss(98)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = OCRCache(os.path.join(tmp, "cache.sqlite3"))
+            with rss, extractor_rss:
+                list(OCRExtractor(dpi=300, max_rss_mb=100, cache=cache).iter_pdf_pages(self.pdf_path))
+            self.assertEqual(cache.stats()["entries"], 0)
+            cache.close()
+
+    @patch('modules.ocr_extractor.pytesseract')
+    def test_page_too_large_for_cap_raises(self, mock_pytesseract):
+        """Extraction stops rather than going over the cap"""
+        rss, extractor_rss = fake_rss(100)
+
+        with rss, extractor_rss:
+            ocr = OCRExtractor(dpi=300, max_rss_mb=100)
+            with self.assertRaises(MemoryLimitExceeded):
+                ocr.extract_from_pdf(self.pdf_path)
+        mock_pytesseract.image_to_string.assert_not_called()
+
+    @patch('modules.ocr_extractor.gc')
+    @patch('modules.ocr_extractor.pytesseract')
+    def test_document_reopened_near_cap(self, mock_pytesseract, mock_gc):
+        """pdfium caches are dropped once RSS passes the release threshold"""
+        mock_pytesseract.image_to_string.return_value = "Some text"
+        rss, extractor_rss = fake_rss(900)
+
+        with rss, extractor_rss:
+            ocr = OCRExtractor(dpi=150, max_rss_mb=1000)
+            list(ocr.iter_pdf_pages(self.pdf_path))
+
+        # Before every page but the first
+        self.assertEqual(mock_gc.collect.call_count, 2)
+
+    @patch('modules.ocr_extractor.pytesseract')
+    def test_spooled_join_matches_plain_join(self, mock_pytesseract):
+        """Capped extraction returns the same text as uncapped extraction"""
+        mock_pytesseract.image_to_string.side_effect = ["One", "", "Three"] * 2
+
+        plain = OCRExtractor().extract_from_pdf(self.pdf_path)
+        capped = OCRExtractor(max_rss_mb=64 * 1024).extract_from_pdf(self.pdf_path)
+
+        self.assertEqual(plain, "One Three")
+        self.assertEqual(capped, plain)
+
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "needs fork and /proc RSS readings")
+    @patch('modules.ocr_extractor.pytesseract')
+    def test_forked_workers_under_large_parent(self, mock_pytesseract):
+        """Workers forked from a large parent aren't charged for its memory"""
+        # Forked workers inherit the patched pytesseract
+        mock_pytesseract.image_to_string.return_value = "Some text"
+        ballast = np.ones(300 * MB, dtype=np.uint8)
+
+        ocr = OCRExtractor(dpi=150, max_rss_mb=200, num_workers=2)
+        text = ocr.extract_from_pdf(self.pdf_path)
+
+        self.assertEqual(text, "Some text Some text Some text")
+        self.assertEqual(ocr.last_stats["memory_limited_pages"], 0)
+        del ballast
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+"""
+Test resuming interrupted PDF extractions from page checkpoints using mocks
+"""
+
+import unittest
+from unittest.mock import patch
+from concurrent.futures import ThreadPoolExecutor
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from modules.ocr_checkpoint import PageCheckpoint, remove_stale_checkpoints
+from modules.ocr_extractor import OCRExtractor
+from ocr_test_utils import make_blank_pdf
+
+
+def failing_first_page_worker(pdf_path, page_index, options):
+    """Pool worker stand-in whose first page fails after the others are done"""
+    if page_index == 0:
+        time.sleep(0.05)
+        raise RuntimeError("worker died")
+    return {"page": page_index, "text": f"Page {page_index + 1}", "source": "ocr", "ocr_time": 0.0}
+
+
+class TestCheckpoints(unittest.TestCase):
+
+    def setUp(self):
+        self.checkpoint_dir = tempfile.mkdtemp()
+        self.pdf_path = make_blank_pdf(5)
+
+    def tearDown(self):
+        shutil.rmtree(self.checkpoint_dir)
+        os.remove(self.pdf_path)
+
+    def checkpoint_files(self):
+        return list(Path(self.checkpoint_dir).glob("*.jsonl"))
+
+    @patch('modules.ocr_extractor.pytesseract')
+    def test_resume_after_crash(self, mock_pytesseract):
+        """A run that dies part way is finished by OCRing only the missing pages"""
+        mock_pytesseract.image_to_string.side_effect = ["One", "Two", MemoryError()]
+        ocr = OCRExtractor(checkpoint_dir=self.checkpoint_dir)
+        with self.assertRaises(MemoryError):
+            ocr.extract_from_pdf(self.pdf_path)
+        self.assertEqual(len(self.checkpoint_files()), 1)
+
+        mock_pytesseract.image_to_string.side_effect = ["Three", "Four", "Five"]
+        text = ocr.extract_from_pdf(self.pdf_path)
+
+        self.assertEqual(text, "One Two Three Four Five")
+        self.assertEqual(mock_pytesseract.image_to_string.call_count, 6)
+        self.assertEqual(ocr.last_stats["resumed_pages"], 2)
+        # The document is complete, so its checkpoint is gone
+        self.assertEqual(self.checkpoint_files(), [])
+
+    @patch('modules.ocr_extractor.pytesseract')
+    def test_abandoned_generator_is_resumed(self, mock_pytesseract):
+        """Pages yielded before the caller stopped iterating are not OCR'd again"""
+        mock_pytesseract.image_to_string.side_effect = [f"Page {i}" for i in range(1, 6)]
+        ocr = OCRExtractor(checkpoint_dir=self.checkpoint_dir)
+        pages = ocr.iter_pdf_pages(self.pdf_path)
+        next(pages)
+        next(pages)
+        pages.close()
+
+        results = list(ocr.iter_pdf_pages(self.pdf_path))
+
+        self.assertEqual([r["text"] for r in results], [f"Page {i}" for i in range(1, 6)])
+        self.assertEqual([r["cached"] for r in results], [True, True, False, False, False])
+        self.assertEqual(mock_pytesseract.image_to_string.call_count, 5)
+
+    @patch('modules.ocr_extractor._ocr_pdf_page_worker', failing_first_page_worker)
+    @patch('modules.ocr_extractor.ProcessPoolExecutor', ThreadPoolExecutor)
+    def test_parallel_pages_are_checkpointed_when_done(self):
+        """Pages workers finished are kept even if they were never yielded"""
+        ocr = OCRExtractor(num_workers=5, checkpoint_dir=self.checkpoint_dir)
+        with self.assertRaises(RuntimeError):
+            ocr.extract_from_pdf(self.pdf_path)
+
+        with patch('modules.ocr_extractor.pytesseract') as mock_pytesseract:
+            mock_pytesseract.image_to_string.return_value = "Page 1"
+            text = ocr.extract_from_pdf(self.pdf_path, num_workers=1)
+
+        self.assertEqual(text, "Page 1 Page 2 Page 3 Page 4 Page 5")
+        self.assertEqual(ocr.last_stats["resumed_pages"], 4)
+        mock_pytesseract.image_to_string.assert_called_once()
+
+    @patch('modules.ocr_extractor.pytesseract')
+    def test_page_range_keeps_checkpoint(self, mock_pytesseract):
+        """Extracting some pages leaves their checkpoint for the rest of the document"""
+        mock_pytesseract.image_to_string.return_value = "text"
+        ocr = OCRExtractor(checkpoint_dir=self.checkpoint_dir)
+        ocr.extract_from_pdf(self.pdf_path, pages=[0, 1])
+        ocr.extract_from_pdf(self.pdf_path)
+
+        self.assertEqual(mock_pytesseract.image_to_string.call_count, 5)
+        self.assertEqual(self.checkpoint_files(), [])
+
+    def test_checkpoint_file(self):
+        """Torn lines are ignored and other settings get their own checkpoint"""
+        checkpoint = PageCheckpoint(self.checkpoint_dir, "abc", {"dpi": 300})
+        checkpoint.record({"page": 0, "text": "zero"})
+        checkpoint.record({"page": 0, "text": "again"})
+        checkpoint.close()
+        with open(checkpoint.path, "a") as f:
+            f.write('{"page": 1, "te')
+        resumed = PageCheckpoint(self.checkpoint_dir, "abc", {"dpi": 300})
+        self.assertEqual(resumed.load(), {0: {"page": 0, "text": "zero"}})
+        resumed.record({"page": 1, "text": "one"})
+        resumed.close()
+
+        self.assertEqual(
+            PageCheckpoint(self.checkpoint_dir, "abc", {"dpi": 300}).load(),
+            {0: {"page": 0, "text": "zero"}, 1: {"page": 1, "text": "one"}},
+        )
+        self.assertEqual(PageCheckpoint(self.checkpoint_dir, "abc", {"dpi": 150}).load(), {})
+
+    def test_stale_checkpoints_are_removed(self):
+        """Checkpoints nobody resumed are cleaned up after a while"""
+        checkpoint = PageCheckpoint(self.checkpoint_dir, "abc", {})
+        checkpoint.record({"page": 0, "text": "zero"})
+        checkpoint.close()
+        os.utime(checkpoint.path, (0, 0))
+
+        self.assertEqual(remove_stale_checkpoints(self.checkpoint_dir), 1)
+        self.assertFalse(checkpoint.path.exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
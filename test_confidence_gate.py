@@ -0,0 +1,149 @@
+"""
+Test per-line OCR confidences and the confidence gate using mocks
+"""
+
+import unittest
+from unittest.mock import patch
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from modules.confidence_gate import estimate_time_saved, gate_results
+from modules.ocr_extractor import OCRExtractor
+from modules.word_boxes import WordBoxes
+from ocr_test_utils import make_blank_pdf
+
+
+def lines_data(lines):
+    """image_to_data() columns for lines given as [(word, confidence), ...]"""
+    data = {key: [] for key in [
+        "block_num", "par_num", "line_num", "left", "top", "width", "height", "conf", "text"
+    ]}
+    for row, words in enumerate(lines):
+        for col, (word, conf) in enumerate(words):
+            for key, value in zip(data, [1, 1, row + 1, col * 50, row * 30, 40, 20, conf, word]):
+                data[key].append(value)
+    return data
+
+
+PAGE_LINES = [
+    [("Clear", 95), ("text", 91)],
+    [("|#~", 20), ("=|", 30)],
+    [("More", 88), ("words", 80)],
+]
+
+
+class TestLineConfidence(unittest.TestCase):
+
+    def test_word_boxes_line_confidences(self):
+        """Each line's confidence is the mean of its words'"""
+        words = WordBoxes.from_tesseract(lines_data(PAGE_LINES))
+
+        self.assertEqual(words.lines(), ["Clear text", "|#~ =|", "More words"])
+        np.testing.assert_allclose(words.line_confidences(), [93, 25, 84])
+        self.assertEqual(WordBoxes.empty().line_confidences().size, 0)
+
+    @patch('modules.ocr_extractor._tesseract_to_data', return_value=lines_data(PAGE_LINES))
+    def test_pdf_pages_report_lines(self, mock_data):
+        """OCR'd pages carry their lines and confidences"""
+        pdf_path = make_blank_pdf(1)
+        try:
+            ocr = OCRExtractor(line_confidence=True, tesseract_transport="pipe")
+            result = next(ocr.iter_pdf_pages(pdf_path))
+        finally:
+            os.remove(pdf_path)
+
+        self.assertEqual(
+            result["lines"],
+            [
+                {"text": "Clear text", "confidence": 93.0},
+                {"text": "|#~ =|", "confidence": 25.0},
+                {"text": "More words", "confidence": 84.0},
+            ],
+        )
+        self.assertAlmostEqual(result["confidence"], (95 + 91 + 20 + 30 + 88 + 80) / 6)
+        # Word boxes themselves stay off
+        self.assertIsNone(result["words"])
+
+    @patch('modules.ocr_extractor._tesseract_to_data', return_value=lines_data(PAGE_LINES))
+    def test_image_result_reports_lines(self, mock_data):
+        """extract_image_result() gives the text with line confidences"""
+        fd, path = tempfile.mkstemp(suffix=".png")
+        os.close(fd)
+        try:
+            Image.new("L", (200, 100), 255).save(path)
+            result = OCRExtractor(line_confidence=True).extract_image_result(path)
+        finally:
+            os.remove(path)
+
+        self.assertEqual(result["text"], "Clear text |#~ =| More words")
+        self.assertEqual([line["confidence"] for line in result["lines"]], [93.0, 25.0, 84.0])
+
+    @patch('modules.ocr_extractor._tesseract_to_data')
+    def test_tiff_frames_are_gated_as_pages(self, mock_data):
+        """A multi-frame TIFF reports each frame, so whole frames can be gated"""
+        mock_data.side_effect = [lines_data(PAGE_LINES[:1]), lines_data(PAGE_LINES[1:2])]
+        fd, path = tempfile.mkstemp(suffix=".tiff")
+        os.close(fd)
+        try:
+            frames = [Image.new("L", (200, 100), 255) for _ in range(2)]
+            frames[0].save(path, save_all=True, append_images=frames[1:], dpi=(200, 200))
+            result = OCRExtractor(line_confidence=True).extract_image_result(path)
+        finally:
+            os.remove(path)
+
+        self.assertEqual([page["page"] for page in result["pages"]], [0, 1])
+        gate = gate_results(result["pages"], min_line_confidence=20, min_page_confidence=40)
+        self.assertEqual(gate["text"], "Clear text")
+        self.assertEqual(gate["dropped"], [{"page": 1, "text": "|#~ =|", "confidence": 25.0}])
+
+class TestConfidenceGate(unittest.TestCase):
+
+    def test_low_confidence_lines_are_dropped(self):
+        """Unreliable lines are left out; pages without line data pass through"""
+        results = [
+            {"page": 0, "text": "Born digital page", "confidence": None, "lines": None},
+            {
+                "page": 1,
+                "text": "Clear text |#~ =|",
+                "confidence": 59,
+                "lines": [{"text": "Clear text", "confidence": 93}, {"text": "|#~ =|", "confidence": 25}],
+            },
+        ]
+
+        gate = gate_results(results, min_line_confidence=60)
+
+        self.assertEqual(gate["text"], "Born digital page Clear text")
+        self.assertEqual(gate["dropped"], [{"page": 1, "text": "|#~ =|", "confidence": 25}])
+        self.assertEqual(gate["kept_chars"], len("Born digital page Clear text"))
+        self.assertEqual(gate["dropped_chars"], 6)
+
+    def test_low_confidence_pages_are_dropped(self):
+        """A page below the page threshold is left out whole"""
+        results = [{
+            "page": 4,
+            "text": "Clear text |#~ =|",
+            "confidence": 30,
+            "lines": [{"text": "Clear text", "confidence": 70}, {"text": "|#~ =|", "confidence": 10}],
+        }]
+
+        gate = gate_results(results, min_line_confidence=60, min_page_confidence=40)
+
+        self.assertEqual(gate["text"], "")
+        self.assertEqual([line["text"] for line in gate["dropped"]], ["Clear text", "|#~ =|"])
+
+    def test_time_saved(self):
+        """Model time saved scales with the share of text left out"""
+        self.assertAlmostEqual(estimate_time_saved(10.0, kept_chars=1000, dropped_chars=250), 2.5)
+        self.assertEqual(estimate_time_saved(10.0, kept_chars=0, dropped_chars=250), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
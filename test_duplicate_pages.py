@@ -0,0 +1,113 @@
+"""
+Test duplicate-page detection using mocks
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+from io import BytesIO
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from modules.ocr_cache import OCRCache
+from modules.ocr_extractor import OCRExtractor
+from modules.page_fingerprints import fingerprint_distance, page_fingerprint
+from ocr_test_utils import make_pdf
+
+PAGES = ["Cover sheet\nCourse pack", "Chapter one\nReading is fun", "Cover sheet\nCourse pack"]
+
+
+def fake_tesseract(cmd, input, **kwargs):
+    """Stand-in for tesseract: one line per frame, counting the frame's dark pixels"""
+    image = Image.open(BytesIO(input))
+    texts = []
+    for n in range(getattr(image, "n_frames", 1)):
+        image.seek(n)
+        texts.append(f"Ink {int((np.asarray(image.convert('L')) < 128).sum())}\n\f")
+    return MagicMock(returncode=0, stdout="".join(texts).encode("utf-8"), stderr=b"")
+
+
+class TestDuplicatePages(unittest.TestCase):
+
+    def setUp(self):
+        self.pdf_path = make_pdf(PAGES)
+
+    def tearDown(self):
+        os.remove(self.pdf_path)
+
+    def make_ocr(self, **kwargs):
+        return OCRExtractor(use_text_layer=False, tesseract_transport="pipe", dpi=144, **kwargs)
+
+    def test_fingerprint_distance(self):
+        """Noise moves a fingerprint a little, different text moves it a lot"""
+        rng = np.random.default_rng(0)
+        page = np.full((800, 600), 255, dtype=np.uint8)
+        page[100:700:40, 50:550] = 0
+        other = np.full((800, 600), 255, dtype=np.uint8)
+        other[120:500:25, 80:400] = 0
+        noisy = np.clip(page.astype(int) + rng.integers(-20, 20, page.shape), 0, 255).astype(np.uint8)
+
+        self.assertEqual(len(page_fingerprint(page)), 128)
+        self.assertLessEqual(fingerprint_distance(page_fingerprint(page), page_fingerprint(noisy)), 4)
+        self.assertGreater(fingerprint_distance(page_fingerprint(page), page_fingerprint(other)), 20)
+
+    @patch('modules.ocr_extractor.subprocess.run', side_effect=fake_tesseract)
+    def test_repeated_page_skips_tesseract(self, mock_run):
+        """A repeat of an earlier page reuses its text"""
+        ocr = self.make_ocr(duplicate_distance=0)
+        results = list(ocr.iter_pdf_pages(self.pdf_path))
+
+        self.assertEqual(mock_run.call_count, 2)
+        self.assertEqual(results[2]["text"], results[0]["text"])
+        self.assertNotEqual(results[1]["text"], results[0]["text"])
+        self.assertEqual([r["duplicate"] for r in results], [False, False, True])
+        self.assertEqual(ocr.last_stats["duplicate_pages"], 1)
+
+    @patch('modules.ocr_extractor.subprocess.run', side_effect=fake_tesseract)
+    def test_repeat_within_a_batch(self, mock_run):
+        """Repeats inside one Tesseract batch are left out of it"""
+        ocr = self.make_ocr(duplicate_distance=0, batch_size=3)
+        results = list(ocr.iter_pdf_pages(self.pdf_path))
+
+        self.assertEqual(mock_run.call_count, 1)
+        self.assertEqual(Image.open(BytesIO(mock_run.call_args[1]["input"])).n_frames, 2)
+        self.assertEqual(results[2]["text"], results[0]["text"])
+        self.assertTrue(results[2]["duplicate"])
+
+    @patch('modules.ocr_extractor.subprocess.run', side_effect=fake_tesseract)
+    def test_repeat_found_in_cache(self, mock_run):
+        """Pages seen in another document are found through the OCR cache"""
+        other_path = make_pdf(["Cover sheet\nCourse pack", "Appendix\nWord list"])
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                cache = OCRCache(os.path.join(tmp, "cache.sqlite3"))
+                list(self.make_ocr(duplicate_distance=0, cache=cache).iter_pdf_pages(self.pdf_path))
+                calls = mock_run.call_count
+                ocr = self.make_ocr(duplicate_distance=0, cache=cache)
+                results = list(ocr.iter_pdf_pages(other_path))
+                cache.close()
+        finally:
+            os.remove(other_path)
+
+        self.assertEqual(mock_run.call_count - calls, 1)
+        self.assertEqual([r["duplicate"] for r in results], [True, False])
+        self.assertEqual(ocr.last_stats["cached_pages"], 0)
+
+    @patch('modules.ocr_extractor.subprocess.run', side_effect=fake_tesseract)
+    def test_off_by_default(self, mock_run):
+        """Without duplicate_distance every page is recognized"""
+        results = list(self.make_ocr().iter_pdf_pages(self.pdf_path))
+
+        self.assertEqual(mock_run.call_count, 3)
+        self.assertFalse(any(r["duplicate"] for r in results))
+
+
+if __name__ == '__main__':
+    unittest.main()
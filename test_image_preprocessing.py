@@ -0,0 +1,104 @@
+"""
+Test the vectorized image preprocessing stage
+"""
+
+import unittest
+from unittest.mock import patch
+import os
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from modules.image_preprocessing import (
+    binarize_otsu,
+    binarize_sauvola,
+    crop_borders,
+    estimate_skew,
+    normalize_contrast,
+    preprocess_image,
+)
+from modules.ocr_extractor import OCRExtractor
+from ocr_test_utils import make_blank_pdf
+
+
+def make_text_like_page(width=800, height=1000):
+    """A white page with rows of black 'words'"""
+    image = Image.new("L", (width, height), 255)
+    draw = ImageDraw.Draw(image)
+    for y in range(100, height - 100, 40):
+        for x in range(100, width - 100, 60):
+            draw.rectangle([x, y, x + 45, y + 14], fill=0)
+    return image
+
+
+class TestImagePreprocessing(unittest.TestCase):
+
+    def test_deskew_recovers_rotation(self):
+        """Skew is measured and removed for both directions"""
+        page = make_text_like_page()
+        for angle in (3.0, -2.5):
+            tilted = np.asarray(page.rotate(angle, expand=True, fillcolor=255))
+            self.assertAlmostEqual(estimate_skew(tilted), angle, delta=0.15)
+
+            straightened = preprocess_image(tilted, {"crop_borders": False, "binarize": None})
+            self.assertAlmostEqual(estimate_skew(straightened), 0.0, delta=0.15)
+
+    def test_normalize_contrast_stretches_range(self):
+        """A washed-out image is stretched to full black and white"""
+        faded = np.asarray(make_text_like_page()) // 3 + 100  # 100..185
+        stretched = normalize_contrast(faded)
+
+        self.assertEqual(stretched.min(), 0)
+        self.assertEqual(stretched.max(), 255)
+
+    def test_crop_borders_removes_scanner_edge_and_margins(self):
+        """Black scanner edges and empty margins are cropped off"""
+        page = np.asarray(make_text_like_page()).copy()
+        page[:, :30] = 0  # dark scanner edge on the left
+
+        cropped = crop_borders(page, padding=10)
+
+        # Words span rows 100-874 and columns 100-685, plus 10px padding each side
+        self.assertEqual(cropped.shape, (775 + 20, 586 + 20))
+        self.assertGreater(cropped[:, 0].mean(), 250)
+
+    def test_binarization_outputs_two_levels(self):
+        """Both binarizers produce pure black and white"""
+        page = np.asarray(make_text_like_page())
+        # Uneven lighting: the right side is much darker than the left
+        shaded = (page * np.linspace(1.0, 0.5, page.shape[1])[None, :]).astype(np.uint8)
+
+        for binarized in (binarize_otsu(page), binarize_sauvola(shaded)):
+            self.assertEqual(set(np.unique(binarized)), {0, 255})
+
+        # Sauvola keeps the shaded paper white where a global threshold would not
+        self.assertGreater(binarize_sauvola(shaded)[50, -50], 0)
+
+    def test_steps_can_be_disabled(self):
+        """With every step off, the image is returned untouched"""
+        page = np.asarray(make_text_like_page())
+        options = {"normalize_contrast": False, "crop_borders": False, "deskew": False, "binarize": None}
+
+        self.assertIs(preprocess_image(page, options), page)
+
+    @patch('modules.ocr_extractor.pytesseract')
+    def test_extractor_sends_preprocessed_page(self, mock_pytesseract):
+        """With preprocessing on, Tesseract receives the binarized page"""
+        mock_pytesseract.image_to_string.return_value = "text"
+        pdf_path = make_blank_pdf(1)
+        try:
+            OCRExtractor(preprocessing={"crop_borders": False}).extract_from_pdf(pdf_path)
+        finally:
+            os.remove(pdf_path)
+
+        image = mock_pytesseract.image_to_string.call_args[0][0]
+        self.assertTrue(set(np.unique(np.asarray(image))) <= {0, 255})
+
+
+if __name__ == '__main__':
+    unittest.main()
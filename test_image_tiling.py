@@ -0,0 +1,164 @@
+"""
+Test tiled OCR of large images using mocks
+"""
+
+import unittest
+from unittest.mock import patch
+from concurrent.futures import ThreadPoolExecutor
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from modules.image_tiling import merge_tile_words, plan_tiles
+from modules.ocr_extractor import OCRExtractor
+from modules.word_boxes import WordBoxes
+
+
+def text_image(height=3000, width=2000, line_height=20, line_gap=40, columns=1):
+    """White page with black bars for text lines; line k is 100 + k pixels wide"""
+    image = np.full((height, width), 255, dtype=np.uint8)
+    column_width = width // columns
+    k = 0
+    for c in range(columns):
+        for top in range(line_gap, height - line_height, line_height + line_gap):
+            left = c * column_width + 50
+            image[top:top + line_height, left:left + 100 + k] = 0
+            k += 1
+    return image
+
+
+def words_data(words):
+    """Tesseract image_to_data() columns for (text, left, top, width, height) words"""
+    return {
+        "text": [w[0] for w in words],
+        "block_num": [1] * len(words),
+        "par_num": [1] * len(words),
+        "line_num": list(range(1, len(words) + 1)),
+        "left": [w[1] for w in words],
+        "top": [w[2] for w in words],
+        "width": [w[3] for w in words],
+        "height": [w[4] for w in words],
+        "conf": [95] * len(words),
+    }
+
+
+def fake_tesseract_data(image, dpi, options):
+    """Stand-in for Tesseract: one word per bar, named after the bar's width"""
+    ink = image < 128
+    rows = ink.any(axis=1)
+    words = []
+    top = None
+    for y, on in enumerate(list(rows) + [False]):
+        if on and top is None:
+            top = y
+        elif not on and top is not None:
+            cols = np.flatnonzero(ink[top:y].any(axis=0))
+            words.append((f"w{cols.size}", int(cols[0]), top, int(cols.size), y - top))
+            top = None
+    return words_data(words)
+
+
+class TestImageTiling(unittest.TestCase):
+
+    def test_cuts_between_lines(self):
+        """Strips are cut in the whitespace between text lines, without overlap"""
+        image = text_image()
+        tiles = plan_tiles(image, 3, min_gap_x=100)
+
+        self.assertEqual(len(tiles), 3)
+        for tile in tiles:
+            self.assertEqual(tile["box"], tile["core"])
+            top, bottom = tile["box"][:2]
+            # No line of ink crosses a cut
+            if top > 0:
+                self.assertFalse((image[top] < 128).any())
+        self.assertEqual(tiles[0]["box"][0], 0)
+        self.assertEqual(tiles[-1]["box"][1], image.shape[0])
+
+    def test_splits_columns_first(self):
+        """Two-column pages become left-column tiles followed by right-column tiles"""
+        image = text_image(columns=2)
+        tiles = plan_tiles(image, 4, min_gap_x=100)
+
+        lefts = [tile["core"][2] for tile in tiles]
+        self.assertEqual(len(tiles), 4)
+        self.assertEqual(lefts, sorted(lefts))
+        self.assertEqual(len(set(lefts)), 2)
+
+    def test_overlap_without_gutter(self):
+        """Cuts through solid text reach past the cut on both sides"""
+        image = np.zeros((1000, 500), dtype=np.uint8)
+        image[:, :10] = 255
+        tiles = plan_tiles(image, 2, min_gap_x=100, overlap=50)
+
+        self.assertEqual(tiles[0]["core"][:2], (0, 500))
+        self.assertEqual(tiles[0]["box"][:2], (0, 550))
+        self.assertEqual(tiles[1]["box"][:2], (450, 1000))
+
+    def test_small_request_keeps_whole_image(self):
+        """One tile means no tiling"""
+        image = text_image(height=500)
+        whole = {"box": (0, 500, 0, 2000), "core": (0, 500, 0, 2000)}
+        self.assertEqual(plan_tiles(image, 1, min_gap_x=100), [whole])
+
+    def test_merge_drops_seam_duplicates(self):
+        """A word seen by two overlapping tiles is kept once, by the tile whose core holds it"""
+        tiles = [
+            {"box": (0, 550, 0, 500), "core": (0, 500, 0, 500)},
+            {"box": (450, 1000, 0, 500), "core": (500, 1000, 0, 500)},
+        ]
+        top = WordBoxes.from_tesseract(words_data([("alpha", 10, 100, 50, 20), ("seam", 10, 490, 50, 20)]))
+        bottom = WordBoxes.from_tesseract(
+            words_data([("seam", 10, 40, 50, 20), ("omega", 10, 300, 50, 20)]), origin=(0, 450)
+        )
+
+        merged = merge_tile_words(tiles, [top, bottom])
+
+        self.assertEqual(merged.text, "alpha seam omega")
+        self.assertEqual(merged.line.tolist(), [0, 1, 2])
+        self.assertEqual(merged.bbox[1].tolist(), [10, 490, 50, 20])
+
+    @patch('modules.ocr_extractor._tesseract_to_data', side_effect=fake_tesseract_data)
+    @patch('modules.ocr_extractor.ProcessPoolExecutor', ThreadPoolExecutor)
+    def test_large_image_is_tiled(self, mock_data):
+        """Large images are recognized tile by tile, keeping every line once and in order"""
+        image = text_image()
+        expected = " ".join(fake_tesseract_data(image, None, {})["text"])
+        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as f:
+            path = f.name
+        try:
+            Image.fromarray(image).save(path)
+            ocr = OCRExtractor(num_workers=3, tile_megapixels=4, tesseract_transport="pipe")
+            text = ocr.extract_from_image(path)
+        finally:
+            os.remove(path)
+
+        self.assertEqual(text, expected)
+        self.assertEqual(mock_data.call_count, 3)
+
+    @patch('modules.ocr_extractor._tesseract_to_string', return_value="whole")
+    @patch('modules.ocr_extractor._tesseract_to_data')
+    def test_small_image_is_not_tiled(self, mock_data, mock_string):
+        """Images under the threshold, or with one worker, go to Tesseract whole"""
+        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as f:
+            path = f.name
+        try:
+            Image.fromarray(text_image()).save(path)
+            for workers, megapixels in ((3, 10), (1, 4)):
+                ocr = OCRExtractor(num_workers=workers, tile_megapixels=megapixels, tesseract_transport="pipe")
+                self.assertEqual(ocr.extract_from_image(path), "whole")
+        finally:
+            os.remove(path)
+
+        mock_data.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
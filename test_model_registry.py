@@ -0,0 +1,183 @@
+"""
+Test the process-wide model registry using fake models
+"""
+
+import unittest
+from unittest.mock import patch
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from modules.model_registry import MB, ModelRegistry, model_nbytes
+from modules.text_simplifier import TextSimplifier
+
+
+class FakeTensor:
+
+    def __init__(self, nbytes):
+        self.array = np.zeros(nbytes, dtype=np.uint8)
+
+    def numel(self):
+        return self.array.size
+
+    def element_size(self):
+        return self.array.itemsize
+
+
+class FakeModel:
+    """Model stand-in with parameters() and buffers() of a given size"""
+
+    def __init__(self, name, megabytes):
+        self.name = name
+        self._parameters = [FakeTensor(int(megabytes * MB))]
+
+    def parameters(self):
+        return iter(self._parameters)
+
+    def buffers(self):
+        return iter([])
+
+
+class CountingLoader:
+    """Loader that records which models it loaded"""
+
+    def __init__(self, sizes, delay=0.0):
+        self.sizes = sizes
+        self.delay = delay
+        self.loaded = []
+        self._lock = threading.Lock()
+
+    def __call__(self, name, dtype, device):
+        time.sleep(self.delay)
+        with self._lock:
+            self.loaded.append((name, dtype, device))
+        return f"{name} tokenizer", FakeModel(name, self.sizes[name])
+
+
+class TestModelRegistry(unittest.TestCase):
+
+    def test_models_are_loaded_once(self):
+        """Later requests for the same model reuse the loaded one"""
+        registry = ModelRegistry()
+        loader = CountingLoader({"t5-small": 1})
+
+        first = registry.get("t5-small", loader)
+        second = registry.get("t5-small", loader)
+
+        self.assertIs(first[1], second[1])
+        self.assertEqual(first[0], "t5-small tokenizer")
+        self.assertEqual(len(loader.loaded), 1)
+        self.assertEqual(registry.stats()["hits"], 1)
+        self.assertEqual(registry.stats()["misses"], 1)
+        self.assertEqual(registry.nbytes, MB)
+
+    def test_dtype_and_device_are_part_of_the_key(self):
+        """The same model in another dtype or on another device is a separate entry"""
+        registry = ModelRegistry()
+        loader = CountingLoader({"t5-small": 1})
+
+        registry.get("t5-small", loader)
+        registry.get("t5-small", loader, dtype="float16")
+        registry.get("t5-small", loader, device="cuda")
+
+        self.assertEqual(
+            loader.loaded,
+            [("t5-small", None, "cpu"), ("t5-small", "float16", "cpu"), ("t5-small", None, "cuda")],
+        )
+
+    def test_least_recently_used_model_is_evicted(self):
+        """Going over the memory budget unloads the model used longest ago"""
+        registry = ModelRegistry(max_memory_mb=3)
+        loader = CountingLoader({"a": 1, "b": 1, "c": 2})
+
+        registry.get("a", loader)
+        registry.get("b", loader)
+        registry.get("a", loader)
+        registry.get("c", loader)
+
+        self.assertEqual([key[0] for key in registry.stats()["models"]], ["a", "c"])
+        self.assertEqual(registry.stats()["evictions"], 1)
+
+    def test_model_over_budget_stays_loaded(self):
+        """A single model bigger than the budget is kept rather than reloaded every time"""
+        registry = ModelRegistry(max_memory_mb=1)
+        loader = CountingLoader({"a": 1, "big": 4})
+
+        registry.get("a", loader)
+        registry.get("big", loader)
+        registry.get("big", loader)
+
+        self.assertEqual([key[0] for key in registry.stats()["models"]], ["big"])
+        self.assertEqual(len(loader.loaded), 2)
+
+    def test_set_budget_evicts(self):
+        """Lowering the budget unloads models that no longer fit"""
+        registry = ModelRegistry()
+        loader = CountingLoader({"a": 1, "b": 1})
+        registry.get("a", loader)
+        registry.get("b", loader)
+
+        registry.set_budget(1)
+
+        self.assertEqual([key[0] for key in registry.stats()["models"]], ["b"])
+
+    def test_concurrent_requests_load_once(self):
+        """Threads asking for the same model at once share one load"""
+        registry = ModelRegistry()
+        loader = CountingLoader({"t5-small": 1, "bart": 1}, delay=0.05)
+        models = []
+
+        def request(name):
+            models.append(registry.get(name, loader)[1])
+
+        threads = [threading.Thread(target=request, args=(name,)) for name in ["t5-small", "bart"] * 4]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(name for name, _, _ in loader.loaded), ["bart", "t5-small"])
+        self.assertEqual(len({id(model) for model in models}), 2)
+
+    def test_model_nbytes(self):
+        """Objects without parameters count as zero bytes"""
+        self.assertEqual(model_nbytes(FakeModel("a", 2)), 2 * MB)
+        self.assertEqual(model_nbytes(object()), 0)
+
+
+class TestSimplifierRegistry(unittest.TestCase):
+
+    @patch('modules.text_simplifier.HAS_TRANSFORMERS', True)
+    def test_simplifiers_share_models(self):
+        """New simplifiers for the same model don't load it again"""
+        registry = ModelRegistry()
+        with patch.object(TextSimplifier, "_load_pretrained", return_value=("tokenizer", "model")) as load:
+            first = TextSimplifier("t5", registry=registry)
+            second = TextSimplifier("t5", registry=registry)
+            bart = TextSimplifier("bart", registry=registry)
+
+        self.assertEqual(load.call_count, 2)
+        self.assertIs(first.model, second.model)
+        self.assertEqual(bart.model_type, "bart")
+        self.assertEqual([key[0] for key in registry.stats()["models"]], ["t5-small", "sshleifer/distilbart-cnn-12-6"])
+
+    @patch('modules.text_simplifier.HAS_TRANSFORMERS', True)
+    def test_half_precision_only_on_cuda(self):
+        """float16 is used on an available GPU and falls back to float32 on CPU"""
+        with patch('modules.text_simplifier.torch', create=True) as torch:
+            torch.cuda.is_available.return_value = True
+            self.assertEqual(TextSimplifier(dtype="float16", device="cuda").dtype, "float16")
+            self.assertEqual(TextSimplifier(dtype="float16", device="cpu").dtype, "float32")
+            torch.cuda.is_available.return_value = False
+            self.assertEqual(TextSimplifier(dtype="float16", device="cuda").dtype, "float32")
+        self.assertIsNone(TextSimplifier().dtype)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+"""
+Test OCR of scanned PDF pages from their embedded images using mocks
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+from io import BytesIO
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from modules.ocr_extractor import OCRExtractor
+from ocr_test_utils import make_scanned_pdf
+
+TSV_HEADER = "level\tpage_num\tblock_num\tpar_num\tline_num\tword_num\tleft\ttop\twidth\theight\tconf\ttext\n"
+
+
+def fake_tesseract(cmd, input, **kwargs):
+    """Stand-in for tesseract that reports the size of the image it was given"""
+    image = Image.open(BytesIO(input))
+    if cmd[-1] == "tsv":
+        stdout = TSV_HEADER + "5\t1\t1\t1\t1\t1\t0\t0\t72\t36\t95\tCorner\n"
+    else:
+        stdout = f"{image.width} by {image.height}\n"
+    return MagicMock(returncode=0, stdout=stdout.encode("utf-8"), stderr=b"")
+
+
+def scan(width, height):
+    """A white scanned page with a few dark text-like bars"""
+    pixels = np.full((height, width), 255, dtype=np.uint8)
+    pixels[height // 8:height // 8 + height // 40, width // 10:width // 2] = 0
+    return pixels
+
+
+class TestNativeImages(unittest.TestCase):
+
+    def extract(self, pdf_path, **kwargs):
+        ocr = OCRExtractor(dpi=216, use_text_layer=False, tesseract_transport="pipe", **kwargs)
+        try:
+            return ocr, list(ocr.iter_pdf_pages(pdf_path))
+        finally:
+            os.remove(pdf_path)
+
+    @patch('modules.ocr_extractor.subprocess.run', side_effect=fake_tesseract)
+    def test_scan_used_at_its_own_resolution(self, mock_run):
+        """A 144 dpi scan is OCR'd as is instead of being rendered at 216 dpi"""
+        ocr, results = self.extract(make_scanned_pdf([scan(600, 800)]), native_images=True)
+
+        self.assertEqual(results[0]["text"], "600 by 800")
+        self.assertEqual(results[0]["dpi"], 144)
+        self.assertTrue(results[0]["native_image"])
+        self.assertFalse(results[0]["memory_limited"])
+        self.assertIn("144", mock_run.call_args[0][0])
+        self.assertEqual(ocr.last_stats["native_image_pages"], 1)
+
+    @patch('modules.ocr_extractor.subprocess.run', side_effect=fake_tesseract)
+    def test_very_high_resolution_scan_is_reduced(self, mock_run):
+        """Scans at twice the requested DPI or more are reduced by a whole factor"""
+        _, results = self.extract(make_scanned_pdf([scan(2500, 3334)]), native_images=True)
+
+        # 600 dpi scan, 216 requested: a factor of 2 gives 300 dpi
+        self.assertEqual(results[0]["text"], "1250 by 1667")
+        self.assertEqual(results[0]["dpi"], 300)
+
+    @patch('modules.ocr_extractor.subprocess.run', side_effect=fake_tesseract)
+    def test_mixed_content_is_rendered(self, mock_run):
+        """Pages with anything besides the scan are rendered as before"""
+        pdf_path = make_scanned_pdf([scan(600, 800)], texts={0: "Caption"})
+        _, results = self.extract(pdf_path, native_images=True)
+
+        self.assertEqual(results[0]["text"], "900 by 1200")
+        self.assertFalse(results[0]["native_image"])
+
+    @patch('modules.ocr_extractor.subprocess.run', side_effect=fake_tesseract)
+    def test_rotated_page_is_rendered(self, mock_run):
+        """Rotated pages are rendered so the text comes out upright"""
+        _, results = self.extract(make_scanned_pdf([scan(600, 800)], rotation=90), native_images=True)
+
+        self.assertFalse(results[0]["native_image"])
+        self.assertEqual(results[0]["text"], "1200 by 900")
+
+    @patch('modules.ocr_extractor.subprocess.run', side_effect=fake_tesseract)
+    def test_off_by_default(self, mock_run):
+        """Without native_images every page is rendered"""
+        _, results = self.extract(make_scanned_pdf([scan(600, 800)]))
+
+        self.assertEqual(results[0]["text"], "900 by 1200")
+        self.assertFalse(results[0]["native_image"])
+
+    @patch('modules.ocr_extractor.subprocess.run', side_effect=fake_tesseract)
+    def test_word_boxes_are_placed_on_the_page(self, mock_run):
+        """Word boxes account for where the scan sits on the page"""
+        pdf_path = make_scanned_pdf([scan(300, 400)], boxes={0: (50, 100, 150, 200)})
+        _, results = self.extract(pdf_path, native_images=True, word_boxes=True)
+
+        # The image's top-left corner is 50 pt from the left and
+        # 400 - 100 - 200 = 100 pt from the top; 72 x 36 px at 144 dpi is 36 x 18 pt
+        self.assertTrue(results[0]["native_image"])
+        self.assertEqual(results[0]["words"].bbox.tolist(), [[50, 100, 36, 18]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+"""
+Test the persistent OCR result cache using mocks
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+from PIL import Image
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from modules.ocr_cache import OCRCache
+from modules.ocr_extractor import OCRExtractor
+from ocr_test_utils import make_blank_pdf
+
+
+class TestOCRCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache = OCRCache(os.path.join(self.cache_dir, "ocr.sqlite3"))
+        self.pdf_path = make_blank_pdf(3)
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.cache_dir)
+        os.remove(self.pdf_path)
+
+    @patch('modules.ocr_extractor.pytesseract')
+    def test_second_run_is_served_from_cache(self, mock_pytesseract):
+        """Re-extracting the same file does not call Tesseract again"""
+        mock_pytesseract.image_to_string.side_effect = ["One", "Two", "Three"]
+        ocr = OCRExtractor(cache=self.cache)
+
+        first = ocr.extract_from_pdf(self.pdf_path)
+        results = list(ocr.iter_pdf_pages(self.pdf_path))
+
+        self.assertEqual(first, "One Two Three")
+        self.assertEqual([r["text"] for r in results], ["One", "Two", "Three"])
+        self.assertTrue(all(r["cached"] for r in results))
+        self.assertEqual(mock_pytesseract.image_to_string.call_count, 3)
+        self.assertEqual(self.cache.stats()["hits"], 3)
+        self.assertEqual(self.cache.stats()["misses"], 3)
+
+    @patch('modules.ocr_extractor.pytesseract')
+    def test_settings_are_part_of_the_key(self, mock_pytesseract):
+        """A different language must not reuse another language's results"""
+        mock_pytesseract.image_to_string.return_value = "text"
+
+        OCRExtractor(lang="eng", cache=self.cache).extract_from_pdf(self.pdf_path)
+        OCRExtractor(lang="fra", cache=self.cache).extract_from_pdf(self.pdf_path)
+
+        self.assertEqual(mock_pytesseract.image_to_string.call_count, 6)
+
+    @patch('modules.ocr_extractor.subprocess.run')
+    @patch('modules.ocr_extractor.pytesseract')
+    def test_image_key_covers_tiling_and_transport(self, mock_pytesseract, mock_run):
+        """Image results aren't shared between tiling or transport settings"""
+        mock_pytesseract.image_to_string.return_value = "text"
+        mock_run.return_value = MagicMock(returncode=0, stdout=b"text", stderr=b"")
+        image_path = os.path.join(self.cache_dir, "page.png")
+        Image.new("L", (200, 100), 255).save(image_path)
+
+        OCRExtractor(cache=self.cache).extract_from_image(image_path)
+        OCRExtractor(cache=self.cache, tile_megapixels=8).extract_from_image(image_path)
+        OCRExtractor(cache=self.cache, tesseract_transport="pipe").extract_from_image(image_path)
+        OCRExtractor(cache=self.cache, tesseract_transport="pipe").extract_from_image(image_path)
+
+        self.assertEqual(mock_pytesseract.image_to_string.call_count, 2)
+        self.assertEqual(mock_run.call_count, 1)
+
+    def test_lru_eviction(self):
+        """The least recently used entries go first once the size limit is hit"""
+        cache = OCRCache(os.path.join(self.cache_dir, "small.sqlite3"), max_size_mb=0.001)
+        entry = {"text": "x" * 400}  # two entries fit in the limit, three do not
+
+        cache.put("a", entry)
+        cache.put("b", entry)
+        cache.get("a")  # "a" is now more recent than "b"
+        cache.put("c", entry)
+
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("c"))
+        self.assertLessEqual(cache.stats()["size_bytes"], 1024 * 1024 * 0.001)
+        cache.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
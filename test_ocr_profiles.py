@@ -0,0 +1,82 @@
+"""
+Test OCR speed profiles
+"""
+
+import unittest
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from modules.ocr_extractor import OCRExtractor
+from modules.ocr_profiles import OCR_PROFILES, load_profile_benchmarks, profile_settings
+from ocr_corpus import character_accuracy
+
+
+class TestOCRProfiles(unittest.TestCase):
+
+    def test_profiles_set_engine_and_segmentation(self):
+        """Each profile turns into OEM/PSM options and a render resolution"""
+        fast = profile_settings("fast", ["eng"])
+        accurate = profile_settings("accurate", ["eng"])
+
+        self.assertEqual(fast["tesseract_config"], "--oem 1 --psm 6")
+        self.assertEqual(fast["dpi"], 150)
+        self.assertEqual(accurate["tesseract_config"], "--oem 1 --psm 3")
+        self.assertEqual(accurate["dpi"], 300)
+        self.assertIsNotNone(accurate["preprocessing"])
+
+    def test_fast_profile_loads_one_language(self):
+        """The fast profile keeps only the first configured language"""
+        self.assertEqual(profile_settings("fast", ["eng", "fra"])["lang"], "eng")
+        self.assertEqual(profile_settings("balanced", ["eng", "fra"])["lang"], "eng+fra")
+        self.assertIsNone(profile_settings("balanced")["lang"])
+
+    def test_tessdata_variant_directory(self):
+        """A variant directory is used only when it has every language's model"""
+        with tempfile.TemporaryDirectory() as tmp:
+            Path(tmp, "eng.traineddata").touch()
+            dirs = {"fast": tmp, "best": os.path.join(tmp, "missing")}
+
+            fast = profile_settings("fast", ["eng"], dirs)
+            self.assertIn(f'--tessdata-dir "{tmp}"', fast["tesseract_config"])
+
+            # No fra model: fall back to the installed models
+            balanced_fra = profile_settings("fast", ["fra"], dirs)
+            self.assertNotIn("--tessdata-dir", balanced_fra["tesseract_config"])
+
+            accurate = profile_settings("accurate", ["eng"], dirs)
+            self.assertNotIn("--tessdata-dir", accurate["tesseract_config"])
+
+    def test_unknown_profile(self):
+        """Typos in the profile name fail fast"""
+        with self.assertRaises(ValueError):
+            profile_settings("turbo")
+
+    def test_from_profile(self):
+        """from_profile applies the profile and lets other arguments through"""
+        ocr = OCRExtractor.from_profile(
+            "fast", languages=["deu"], tesseract_config="-c preserve_interword_spaces=1", num_workers=4
+        )
+
+        self.assertEqual(ocr.lang, "deu")
+        self.assertEqual(ocr.dpi, OCR_PROFILES["fast"]["dpi"])
+        self.assertEqual(ocr.tesseract_config, "--oem 1 --psm 6 -c preserve_interword_spaces=1")
+        self.assertEqual(ocr.num_workers, 4)
+
+    def test_missing_benchmarks(self):
+        """Profiles without a benchmark run have no measurements"""
+        self.assertEqual(load_profile_benchmarks("/nonexistent/ocr_profiles.json"), {})
+
+    def test_character_accuracy(self):
+        """Accuracy is one minus the character error rate, ignoring line breaks"""
+        self.assertEqual(character_accuracy("hello\nworld", "hello world"), 1.0)
+        self.assertAlmostEqual(character_accuracy("helo world", "hello world"), 10 / 11)
+        self.assertEqual(character_accuracy("", "text"), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
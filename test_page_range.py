@@ -0,0 +1,133 @@
+"""
+Test page-range and lazy PDF extraction using mocks
+"""
+
+import unittest
+from unittest.mock import patch
+import os
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from modules.ocr_extractor import OCRExtractor
+from modules.pdf_document import parse_page_range
+from ocr_test_utils import make_pdf
+
+PAGE_TEXTS = [f"This is the text layer of page number {i}." for i in range(1, 11)]
+
+
+class TestParsePageRange(unittest.TestCase):
+
+    def test_ranges_and_single_pages(self):
+        """One-based ranges become sorted zero-based indices"""
+        self.assertEqual(parse_page_range("1-3, 7", 10), [0, 1, 2, 6])
+        self.assertEqual(parse_page_range("7, 2-3, 3", 10), [1, 2, 6])
+
+    def test_open_ended_ranges(self):
+        """Open ends run to the first or last page"""
+        self.assertEqual(parse_page_range("8-", 10), [7, 8, 9])
+        self.assertEqual(parse_page_range("-2", 10), [0, 1])
+
+    def test_empty_means_every_page(self):
+        """An empty range selects the whole document"""
+        self.assertEqual(parse_page_range("  ", 3), [0, 1, 2])
+
+    def test_invalid_ranges(self):
+        """Malformed or out-of-document ranges are rejected"""
+        for spec in ["abc", "0", "11", "5-3", "-", "1-2-3"]:
+            with self.assertRaises(ValueError):
+                parse_page_range(spec, 10)
+
+
+class TestPageRangeExtraction(unittest.TestCase):
+
+    def setUp(self):
+        self.pdf_path = make_pdf(PAGE_TEXTS)
+
+    def tearDown(self):
+        os.remove(self.pdf_path)
+
+    def test_iter_selected_pages(self):
+        """Only the requested pages are extracted, in page order"""
+        ocr = OCRExtractor()
+        results = list(ocr.iter_pdf_pages(self.pdf_path, pages=[6, 2, 3]))
+
+        self.assertEqual([r["page"] for r in results], [2, 3, 6])
+        self.assertEqual(results[0]["text"], PAGE_TEXTS[2])
+        self.assertEqual(ocr.last_stats["pages"], 3)
+        self.assertEqual(ocr.last_stats["document_pages"], 10)
+
+    def test_extract_text_with_range(self):
+        """extract_text passes the page range through for PDFs"""
+        text = OCRExtractor().extract_text(self.pdf_path, pages=range(8, 10))
+        self.assertEqual(text, f"{PAGE_TEXTS[8]} {PAGE_TEXTS[9]}")
+
+    def test_out_of_range_page(self):
+        """Pages past the end of the document are an error"""
+        with self.assertRaises(ValueError):
+            list(OCRExtractor().iter_pdf_pages(self.pdf_path, pages=[10]))
+
+
+class TestLazyPDFDocument(unittest.TestCase):
+
+    def setUp(self):
+        self.pdf_path = make_pdf(PAGE_TEXTS)
+
+    def tearDown(self):
+        os.remove(self.pdf_path)
+
+    def test_nothing_extracted_on_open(self):
+        """Opening a document only counts its pages"""
+        ocr = OCRExtractor()
+        with patch.object(ocr, 'iter_pdf_pages') as mock_iter:
+            document = ocr.open_pdf(self.pdf_path)
+            self.assertEqual(len(document), 10)
+            mock_iter.assert_not_called()
+        self.assertEqual(document.loaded_pages, [])
+
+    def test_pages_are_memoized(self):
+        """Each page is extracted once, however often it is read"""
+        ocr = OCRExtractor()
+        document = ocr.open_pdf(self.pdf_path)
+
+        with patch.object(ocr, 'iter_pdf_pages', wraps=ocr.iter_pdf_pages) as mock_iter:
+            self.assertEqual(document.page_text(0), PAGE_TEXTS[0])
+            self.assertEqual(document[-1]["text"], PAGE_TEXTS[9])
+            self.assertEqual(document.page_text(0), PAGE_TEXTS[0])
+            self.assertEqual(document.text([0, 1]), f"{PAGE_TEXTS[0]} {PAGE_TEXTS[1]}")
+
+        # Page 1, page 10, then only page 2 was missing
+        self.assertEqual(
+            [call.kwargs["pages"] for call in mock_iter.call_args_list],
+            [[0], [9], [1]],
+        )
+        self.assertEqual(document.loaded_pages, [0, 1, 9])
+
+    def test_iter_load_extracts_missing_pages_in_one_run(self):
+        """Missing pages stream out of a single extraction and are remembered on arrival"""
+        ocr = OCRExtractor()
+        document = ocr.open_pdf(self.pdf_path)
+        document.load([1])
+
+        with patch.object(ocr, 'iter_pdf_pages', wraps=ocr.iter_pdf_pages) as mock_iter:
+            pages = document.iter_load([0, 1, 2, 3])
+            first = next(pages)
+            self.assertEqual(first["page"], 0)
+            self.assertEqual(document.loaded_pages, [0, 1])
+            self.assertEqual([r["page"] for r in pages], [2, 3])
+            self.assertEqual(list(document.iter_load([0, 1])), [])
+
+        self.assertEqual([call.kwargs["pages"] for call in mock_iter.call_args_list], [[0, 2, 3]])
+        self.assertEqual(document.loaded_pages, [0, 1, 2, 3])
+
+    def test_index_out_of_range(self):
+        """Indexing past the end raises IndexError"""
+        document = OCRExtractor().open_pdf(self.pdf_path)
+        with self.assertRaises(IndexError):
+            document[10]
+
+
+if __name__ == '__main__':
+    unittest.main()
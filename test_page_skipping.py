@@ -0,0 +1,93 @@
+"""
+Test blank-page and non-text region skipping using mocks
+"""
+
+import unittest
+from unittest.mock import patch
+import os
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+import numpy as np
+
+from modules.ocr_extractor import OCRExtractor
+from modules.page_layout import analyze_page, find_blocks
+from ocr_test_utils import make_pdf
+
+LINES = "\n".join(["Reading aids help students with dyslexia."] * 6)
+
+
+class TestPageSkipping(unittest.TestCase):
+
+    def setUp(self):
+        # Page 1: text, page 2: blank, page 3: full-page picture,
+        # page 4: text with a picture below it
+        self.pdf_path = make_pdf(
+            [LINES, None, None, LINES],
+            figures={2: (30, 30, 240, 340), 3: (30, 30, 240, 180)},
+        )
+
+    def tearDown(self):
+        os.remove(self.pdf_path)
+
+    @patch('modules.ocr_extractor.pytesseract')
+    def test_blank_and_picture_pages_are_skipped(self, mock_pytesseract):
+        """Only pages with text reach Tesseract, and the counts are reported"""
+        mock_pytesseract.image_to_string.return_value = "text"
+
+        ocr = OCRExtractor(use_text_layer=False, skip_non_text=True)
+        results = list(ocr.iter_pdf_pages(self.pdf_path))
+
+        self.assertEqual([r["skipped"] for r in results], [None, "blank", "image", None])
+        self.assertEqual([r["regions_skipped"] for r in results], [0, 0, 0, 1])
+        self.assertEqual(mock_pytesseract.image_to_string.call_count, 2)
+        self.assertEqual(ocr.last_stats["blank_pages_skipped"], 1)
+        self.assertEqual(ocr.last_stats["image_pages_skipped"], 1)
+        self.assertEqual(ocr.last_stats["regions_skipped"], 1)
+        self.assertEqual(ocr.last_stats["ocr_pages"], 2)
+
+    @patch('modules.ocr_extractor.pytesseract')
+    def test_text_page_is_cropped_to_its_text(self, mock_pytesseract):
+        """The picture on the last page is cut away before OCR"""
+        mock_pytesseract.image_to_string.return_value = "text"
+
+        ocr = OCRExtractor(dpi=72, use_text_layer=False, skip_non_text=True)
+        list(ocr.iter_pdf_pages(self.pdf_path))
+
+        last_page = np.asarray(mock_pytesseract.image_to_string.call_args_list[-1][0][0])
+        self.assertLess(last_page.shape[0], 400 / 2)
+        self.assertGreater(last_page.mean(), 200)
+
+    @patch('modules.ocr_extractor.pytesseract')
+    def test_skipping_is_off_by_default(self, mock_pytesseract):
+        """Without skip_non_text every page is OCR'd"""
+        mock_pytesseract.image_to_string.return_value = "text"
+
+        OCRExtractor(use_text_layer=False).extract_from_pdf(self.pdf_path)
+
+        self.assertEqual(mock_pytesseract.image_to_string.call_count, 4)
+
+    def test_find_blocks_separates_columns(self):
+        """XY-cut finds two text columns separated by a gutter"""
+        ink = np.zeros((100, 200), dtype=bool)
+        ink[10:20, 10:90] = True
+        ink[30:40, 10:90] = True
+        ink[10:40, 120:190] = True
+
+        blocks = find_blocks(ink, min_gap_y=15, min_gap_x=15)
+
+        self.assertEqual(blocks, [(10, 40, 10, 90), (10, 40, 120, 190)])
+
+    def test_paper_texture_counts_as_blank(self):
+        """Faint show-through on an empty page is not text"""
+        page = np.full((400, 300), 235, dtype=np.uint8)
+        page[100:110, 40:260] = 210
+
+        self.assertEqual(analyze_page(page, 72)["kind"], "blank")
+
+
+if __name__ == '__main__':
+    unittest.main()
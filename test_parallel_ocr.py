@@ -0,0 +1,67 @@
+"""
+Test parallel per-page OCR for PDFs using mocks
+"""
+
+import unittest
+from unittest.mock import patch
+from concurrent.futures import ThreadPoolExecutor
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from modules.ocr_extractor import OCRExtractor
+from ocr_test_utils import make_blank_pdf
+
+
+def fake_page_worker(pdf_path, page_index, options):
+    """Stand-in for the pool worker that finishes pages out of order"""
+    time.sleep(random.uniform(0, 0.02))
+    return {"page": page_index, "text": f"Page {page_index + 1} text", "source": "ocr", "ocr_time": 0.0}
+
+
+class TestParallelOCR(unittest.TestCase):
+
+    def setUp(self):
+        self.pdf_path = make_blank_pdf(6)
+
+    def tearDown(self):
+        os.remove(self.pdf_path)
+
+    @patch('modules.ocr_extractor.pytesseract')
+    def test_sequential_extraction(self, mock_pytesseract):
+        """Sequential mode OCRs every page in order"""
+        mock_pytesseract.image_to_string.side_effect = [f"Page {i}" for i in range(1, 7)]
+
+        ocr = OCRExtractor(num_workers=1)
+        result = ocr.extract_from_pdf(self.pdf_path)
+
+        self.assertEqual(result, "Page 1 Page 2 Page 3 Page 4 Page 5 Page 6")
+        self.assertEqual(mock_pytesseract.image_to_string.call_count, 6)
+
+    @patch.dict(os.environ, {})
+    @patch('modules.ocr_extractor._ocr_pdf_page_worker', fake_page_worker)
+    @patch('modules.ocr_extractor.ProcessPoolExecutor', ThreadPoolExecutor)
+    def test_parallel_extraction_keeps_page_order(self):
+        """Parallel mode returns pages in document order"""
+        ocr = OCRExtractor(num_workers=4)
+        result = ocr.extract_from_pdf(self.pdf_path)
+
+        expected = " ".join(f"Page {i} text" for i in range(1, 7))
+        self.assertEqual(result, expected)
+        self.assertEqual(os.environ["OMP_THREAD_LIMIT"], "1")
+
+    def test_resolve_workers(self):
+        """Worker count is capped by page count and 0 means one per core"""
+        ocr = OCRExtractor(num_workers=8)
+        self.assertEqual(ocr._resolve_workers(None, 3), 3)
+        self.assertEqual(ocr._resolve_workers(1, 3), 1)
+        self.assertEqual(ocr._resolve_workers(0, 10_000), os.cpu_count())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+"""
+Test progressive (preview, then full quality) PDF extraction using mocks
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+from io import BytesIO
+import os
+import sys
+import threading
+from pathlib import Path
+
+from PIL import Image
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from modules.ocr_extractor import OCRExtractor
+from ocr_test_utils import make_pdf
+
+
+def fake_tesseract(cmd, input, **kwargs):
+    """Stand-in for tesseract that reports the height of the image it was given"""
+    height = Image.open(BytesIO(input)).height
+    return MagicMock(returncode=0, stdout=f"Rendered {height} high\n".encode("utf-8"), stderr=b"")
+
+
+class TestProgressiveOCR(unittest.TestCase):
+
+    def setUp(self):
+        # A born-digital page between two scans
+        self.pdf_path = make_pdf([None, "This page has a perfectly good text layer", None])
+        self.ocr = OCRExtractor(dpi=144, tesseract_transport="pipe")
+
+    def tearDown(self):
+        os.remove(self.pdf_path)
+
+    @patch('modules.ocr_extractor.subprocess.run', side_effect=fake_tesseract)
+    def test_preview_then_final(self, mock_run):
+        """Scanned pages are previewed at low resolution and then redone at full resolution"""
+        progressive = self.ocr.extract_progressive(self.pdf_path, preview_dpi=72)
+        self.assertTrue(progressive.wait(timeout=10))
+
+        results = progressive.results()
+        self.assertIsNone(progressive.error)
+        self.assertEqual([r["quality"] for r in results], ["final"] * 3)
+        self.assertEqual(results[0]["text"], "Rendered 800 high")
+        self.assertEqual(results[1]["source"], "text_layer")
+        self.assertEqual(progressive.pending_pages, 0)
+        # Two previews, then the two scans again; the text layer is read once
+        self.assertEqual(mock_run.call_count, 4)
+        self.assertEqual(progressive.version, 5)
+
+    @patch('modules.ocr_extractor.subprocess.run', side_effect=fake_tesseract)
+    def test_updates_since_version(self, mock_run):
+        """Callers can ask for only the pages that changed since they last looked"""
+        progressive = self.ocr.extract_progressive(self.pdf_path, preview_dpi=72)
+        progressive.wait(timeout=10)
+
+        # Versions 1-3 are the preview pass, 4-5 the refined scans
+        self.assertEqual([r["page"] for r in progressive.updates(3)], [0, 2])
+        self.assertEqual(progressive.updates(5), [])
+        self.assertEqual(progressive.wait_for_update(5, timeout=0.1), 5)
+        self.assertEqual(progressive.text(), "Rendered 800 high This page has a perfectly good text layer Rendered 800 high")
+
+    @patch('modules.ocr_extractor.subprocess.run', side_effect=fake_tesseract)
+    def test_single_pass_when_preview_is_full_quality(self, mock_run):
+        """A preview at full resolution is already final"""
+        progressive = self.ocr.extract_progressive(self.pdf_path, pages=[0], preview_dpi=144)
+        progressive.wait(timeout=10)
+
+        self.assertEqual(mock_run.call_count, 1)
+        self.assertEqual(progressive.results()[0]["quality"], "final")
+
+    def test_cancel(self):
+        """Cancelling stops after the page in progress, keeping what was done"""
+        release = threading.Event()
+
+        def slow_tesseract(cmd, input, **kwargs):
+            release.wait(timeout=10)
+            return fake_tesseract(cmd, input)
+
+        with patch('modules.ocr_extractor.subprocess.run', side_effect=slow_tesseract):
+            progressive = self.ocr.extract_progressive(self.pdf_path, preview_dpi=72)
+            progressive.cancel()
+            release.set()
+            self.assertTrue(progressive.wait(timeout=10))
+
+        self.assertTrue(progressive.done)
+        self.assertEqual(len(progressive.results()), 0)
+
+    def test_errors_are_kept(self):
+        """A failure in the background thread is recorded, not lost"""
+        with patch('modules.ocr_extractor.subprocess.run', side_effect=OSError("no tesseract")):
+            progressive = self.ocr.extract_progressive(self.pdf_path, preview_dpi=72)
+            progressive.wait(timeout=10)
+
+        self.assertIsInstance(progressive.error, OSError)
+
+    def test_bad_pages(self):
+        """Page indices outside the document fail straight away"""
+        with self.assertRaises(ValueError):
+            self.ocr.extract_progressive(self.pdf_path, pages=[3])
+
+    def test_with_settings(self):
+        """with_settings copies the extractor, leaving the original alone"""
+        preview = self.ocr.with_settings(dpi=72)
+        self.assertEqual(preview.dpi, 72)
+        self.assertEqual(self.ocr.dpi, 144)
+        with self.assertRaises(TypeError):
+            self.ocr.with_settings(resolution=72)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+"""
+Test shared-memory image transport to worker processes
+"""
+
+import unittest
+from unittest.mock import patch
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from modules.ocr_extractor import OCRExtractor
+from modules.shared_images import BLOCK_GRANULARITY, SharedImagePool, attach_image
+from test_image_tiling import fake_tesseract_data, text_image
+
+
+def tile_total(handle, box):
+    """Sum a tile of a shared image (runs in a worker process)"""
+    top, bottom, left, right = box
+    return int(attach_image(handle)[top:bottom, left:right].sum(dtype=np.int64))
+
+
+class TestSharedImages(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = SharedImagePool(max_free_blocks=1)
+        self.image = np.arange(600 * 800, dtype=np.uint32).reshape(600, 800).astype(np.uint8)
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_round_trip(self):
+        """A handle gives back the same pixels, as a read-only view"""
+        handle = self.pool.put(self.image)
+        image = attach_image(handle)
+
+        np.testing.assert_array_equal(image, self.image)
+        self.assertFalse(image.flags.writeable)
+        self.assertEqual(set(handle), {"name", "shape", "dtype"})
+
+    def test_blocks_are_recycled(self):
+        """Released blocks are reused by later images that fit"""
+        first = self.pool.put(self.image)
+        self.pool.release(first)
+        second = self.pool.put(self.image[:300])
+
+        self.assertEqual(second["name"], first["name"])
+        self.assertEqual(self.pool.nbytes, BLOCK_GRANULARITY)
+
+    def test_extra_free_blocks_are_freed(self):
+        """Only max_free_blocks released blocks are kept"""
+        first = self.pool.put(self.image)
+        second = self.pool.put(self.image)
+        self.pool.release(first)
+        self.pool.release(second)
+
+        self.assertEqual(self.pool.nbytes, BLOCK_GRANULARITY)
+        with self.assertRaises(FileNotFoundError):
+            shared_memory.SharedMemory(name=second["name"])
+
+    def test_close_unlinks(self):
+        """Closing the pool removes its blocks from the system"""
+        handle = self.pool.put(self.image)
+        self.pool.close()
+
+        with self.assertRaises(FileNotFoundError):
+            shared_memory.SharedMemory(name=handle["name"])
+
+    def test_worker_processes_read_the_block(self):
+        """Worker processes see the image through the handle alone"""
+        handle = self.pool.put(self.image)
+        boxes = [(0, 300, 0, 800), (300, 600, 0, 800)]
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            totals = list(executor.map(tile_total, [handle] * 2, boxes))
+
+        self.assertEqual(totals, [int(self.image[a:b, c:d].sum(dtype=np.int64)) for a, b, c, d in boxes])
+
+    @patch('modules.ocr_extractor._tesseract_to_data', side_effect=fake_tesseract_data)
+    @patch('modules.ocr_extractor.ProcessPoolExecutor', ThreadPoolExecutor)
+    def test_tiles_through_shared_memory(self, mock_data):
+        """Tiled OCR sends shared-memory handles and recycles the block"""
+        image = text_image()
+        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as f:
+            path = f.name
+        try:
+            Image.fromarray(image).save(path)
+            ocr = OCRExtractor(num_workers=3, tile_megapixels=4, tesseract_transport="pipe",
+                               worker_transport="shared_memory")
+            first = ocr.extract_from_image(path)
+            pool_bytes = ocr._image_pool.nbytes
+            second = ocr.extract_from_image(path)
+        finally:
+            os.remove(path)
+
+        self.assertEqual(first, " ".join(fake_tesseract_data(image, None, {})["text"]))
+        self.assertEqual(second, first)
+        self.assertEqual(mock_data.call_count, 6)
+        # The second image reused the first one's block
+        self.assertEqual(ocr._image_pool.nbytes, pool_bytes)
+        ocr._image_pool.close()
+
+    def test_unknown_transport(self):
+        """Typos in the worker transport fail fast"""
+        with self.assertRaises(ValueError):
+            OCRExtractor(worker_transport="pipes")
+
+
+if __name__ == '__main__':
+    unittest.main()
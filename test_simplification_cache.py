@@ -0,0 +1,176 @@
+"""
+Test the two-tier simplification cache using mocks
+"""
+
+import unittest
+from unittest.mock import MagicMock
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from modules.simplification_cache import SimplificationCache
+from modules.text_simplifier import TextSimplifier
+
+
+class Batch(dict):
+    """Batch standing in for a BatchEncoding (device moves are no-ops)"""
+
+    def to(self, device):
+        return self
+
+
+class Tokens(list):
+    """Token rows standing in for a tensor (device moves are no-ops)"""
+
+    def to(self, device):
+        return self
+
+
+class FakeTokenizer:
+    """Word-level stand-in for a Hugging Face tokenizer"""
+
+    def __call__(self, texts, max_length=512, truncation=True):
+        return {"input_ids": [text.split() for text in texts]}
+
+    def pad(self, encoded, return_tensors=None):
+        return Batch({"input_ids": encoded["input_ids"]})
+
+    def batch_decode(self, rows, skip_special_tokens=True):
+        return [" ".join(row) for row in rows]
+
+    def encode(self, text, return_tensors=None, max_length=512, truncation=True):
+        return Tokens([text.split()])
+
+    def decode(self, row, skip_special_tokens=True):
+        return " ".join(row)
+
+
+def fake_generate(input_ids, **kwargs):
+    """Drop the prompt prefix and upper-case the rest"""
+    return [[token.upper() for token in row[1:]] for row in input_ids]
+
+
+def empty_generate(input_ids, **kwargs):
+    """A model that generates nothing"""
+    return [[] for _ in input_ids]
+
+
+class TestSimplificationCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "simplify.sqlite3")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_key_covers_generation_settings(self):
+        """Model, sentence, max_length and num_beams all change the key"""
+        base = SimplificationCache.make_key("t5-small", "A sentence.", 100, 4)
+        self.assertEqual(base, SimplificationCache.make_key("t5-small", "A sentence.", 100, 4))
+        for other in [
+            ("bart", "A sentence.", 100, 4),
+            ("t5-small", "Another.", 100, 4),
+            ("t5-small", "A sentence.", 50, 4),
+            ("t5-small", "A sentence.", 100, 2),
+        ]:
+            self.assertNotEqual(base, SimplificationCache.make_key(*other))
+
+    def test_memory_then_disk(self):
+        """Entries survive a restart through SQLite and are promoted to memory on use"""
+        cache = SimplificationCache(self.path)
+        cache.put("k", "simple")
+        self.assertEqual(cache.get("k"), "simple")
+        cache.close()
+
+        reopened = SimplificationCache(self.path)
+        self.assertEqual(reopened.get("k"), "simple")
+        self.assertEqual(reopened.get("k"), "simple")
+        self.assertIsNone(reopened.get("missing"))
+
+        stats = reopened.stats()
+        self.assertEqual((stats["disk_hits"], stats["memory_hits"], stats["misses"]), (1, 1, 1))
+        self.assertAlmostEqual(stats["hit_rate"], 2 / 3)
+        reopened.close()
+
+    def test_memory_tier_is_bounded(self):
+        """The in-memory tier keeps only the most recently used entries"""
+        cache = SimplificationCache(memory_entries=2)
+        cache.put_many({"a": "1", "b": "2"})
+        cache.get("a")
+        cache.put("c", "3")
+
+        self.assertEqual(cache.get_many(["a", "b", "c"]), {"a": "1", "c": "3"})
+        self.assertEqual(cache.stats()["memory_entries"], 2)
+
+    def test_disk_tier_is_bounded(self):
+        """The database evicts least recently used rows past its size limit"""
+        cache = SimplificationCache(self.path, max_size_mb=0.001, memory_entries=1)
+        for i in range(20):
+            cache.put(f"key{i}", "x" * 100)
+
+        stats = cache.stats()
+        self.assertLessEqual(stats["size_bytes"], 1024 * 1024 * 0.001)
+        self.assertIsNotNone(cache.get("key19"))
+        self.assertIsNone(cache.get("key0"))
+        cache.close()
+
+
+class TestCachedSimplifier(unittest.TestCase):
+
+    def simplifier(self, cache, batch_size=4):
+        simplifier = TextSimplifier(batch_size=batch_size, cache=cache)
+        simplifier.model_type = "t5"
+        simplifier.tokenizer = FakeTokenizer()
+        simplifier.model = MagicMock()
+        simplifier.model.generate.side_effect = fake_generate
+        return simplifier
+
+    def test_second_document_run_is_free(self):
+        """Re-simplifying a document generates nothing, and repeats are generated once"""
+        sentences = ["The cat sat.", "A dog ran.", "The cat sat.", "Birds fly high."]
+        cache = SimplificationCache()
+
+        first = self.simplifier(cache)
+        self.assertEqual(first.simplify_sentences(sentences), ["THE CAT SAT.", "A DOG RAN.", "THE CAT SAT.", "BIRDS FLY HIGH."])
+        generated = sum(len(call.kwargs["input_ids"]) for call in first.model.generate.call_args_list)
+        self.assertEqual(generated, 3)
+
+        second = self.simplifier(cache)
+        self.assertEqual(second.simplify_sentences(sentences), first.simplify_sentences(sentences))
+        second.model.generate.assert_not_called()
+        self.assertEqual(cache.stats()["misses"], 3)
+
+    def test_single_sentence_path_uses_cache(self):
+        """simplify_text() reuses cached output too"""
+        cache = SimplificationCache()
+        simplifier = self.simplifier(cache, batch_size=1)
+
+        self.assertEqual(simplifier.simplify_text("Some text here."), "SOME TEXT HERE.")
+        self.assertEqual(simplifier.simplify_text("Some text here."), "SOME TEXT HERE.")
+        self.assertEqual(simplifier.model.generate.call_count, 1)
+
+    def test_fallbacks_are_not_cached(self):
+        """Sentences the model gave nothing for are tried again next time"""
+        cache = SimplificationCache()
+        sentences = ["The cat sat.", "A dog ran."]
+
+        batched = self.simplifier(cache)
+        batched.model.generate.side_effect = empty_generate
+        self.assertEqual(batched.simplify_sentences(sentences), sentences)
+        single = self.simplifier(cache, batch_size=1)
+        single.model.generate.side_effect = empty_generate
+        self.assertEqual(single.simplify_text("The cat sat."), "The cat sat.")
+        self.assertEqual(cache.stats()["memory_entries"], 0)
+
+        recovered = self.simplifier(cache)
+        self.assertEqual(recovered.simplify_sentences(sentences), ["THE CAT SAT.", "A DOG RAN."])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+"""
+Test the streaming page iterator for PDF extraction using mocks
+"""
+
+import unittest
+from unittest.mock import patch
+from concurrent.futures import ThreadPoolExecutor
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from modules.ocr_extractor import OCRExtractor
+from ocr_test_utils import make_blank_pdf
+
+
+def slow_first_page_worker(pdf_path, page_index, options):
+    """Stand-in for the pool worker where the first page is the slowest"""
+    time.sleep(0.05 if page_index == 0 else 0.0)
+    return {"page": page_index, "text": f"Page {page_index + 1}", "source": "ocr", "ocr_time": 0.0}
+
+
+class TestStreamingOCR(unittest.TestCase):
+
+    def setUp(self):
+        self.pdf_path = make_blank_pdf(3)
+
+    def tearDown(self):
+        os.remove(self.pdf_path)
+
+    @patch('modules.ocr_extractor.pytesseract')
+    def test_yields_page_results(self, mock_pytesseract):
+        """Each page comes back with its index, text and timing"""
+        mock_pytesseract.image_to_string.side_effect = ["One\n", "", "Three  3"]
+
+        ocr = OCRExtractor()
+        results = list(ocr.iter_pdf_pages(self.pdf_path))
+
+        self.assertEqual([r["page"] for r in results], [0, 1, 2])
+        self.assertEqual([r["text"] for r in results], ["One", "", "Three 3"])
+        for result in results:
+            self.assertGreaterEqual(result["ocr_time"], 0)
+            self.assertGreaterEqual(result["elapsed"], result["ocr_time"])
+
+    @patch('modules.ocr_extractor.pytesseract')
+    def test_first_page_before_the_rest(self, mock_pytesseract):
+        """The generator hands over page 1 before later pages are recognized"""
+        mock_pytesseract.image_to_string.return_value = "text"
+
+        ocr = OCRExtractor()
+        pages = ocr.iter_pdf_pages(self.pdf_path)
+        first = next(pages)
+
+        self.assertEqual(first["page"], 0)
+        self.assertEqual(mock_pytesseract.image_to_string.call_count, 1)
+        pages.close()
+
+    @patch.dict(os.environ, {})
+    @patch('modules.ocr_extractor._ocr_pdf_page_worker', slow_first_page_worker)
+    @patch('modules.ocr_extractor.ProcessPoolExecutor', ThreadPoolExecutor)
+    def test_unordered_yields_in_completion_order(self):
+        """With ordered=False, fast pages are not held back by slow ones"""
+        ocr = OCRExtractor(num_workers=3)
+
+        ordered = [r["page"] for r in ocr.iter_pdf_pages(self.pdf_path)]
+        unordered = [r["page"] for r in ocr.iter_pdf_pages(self.pdf_path, ordered=False)]
+
+        self.assertEqual(ordered, [0, 1, 2])
+        self.assertEqual(sorted(unordered), [0, 1, 2])
+        self.assertEqual(unordered[-1], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+"""
+Test the grayscale in-memory hand-off to Tesseract using mocks
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+import pytesseract
+from PIL import Image
+
+from modules.ocr_extractor import OCRExtractor, _parse_tsv
+from ocr_test_utils import make_blank_pdf
+
+
+def completed(stdout: str, returncode: int = 0):
+    """Fake subprocess.run result"""
+    return MagicMock(returncode=returncode, stdout=stdout.encode("utf-8"), stderr=b"boom")
+
+
+class TestTesseractPipe(unittest.TestCase):
+
+    def setUp(self):
+        self.pdf_path = make_blank_pdf(1)
+
+    def tearDown(self):
+        os.remove(self.pdf_path)
+
+    @patch('modules.ocr_extractor.subprocess.run')
+    def test_page_is_streamed_as_pgm(self, mock_run):
+        """The page goes over stdin as a grayscale PGM, no temp files"""
+        mock_run.return_value = completed("Piped\ntext\n")
+
+        ocr = OCRExtractor(dpi=144, lang="eng", tesseract_config="--psm 6", tesseract_transport="pipe")
+        result = ocr.extract_from_pdf(self.pdf_path)
+
+        self.assertEqual(result, "Piped text")
+        cmd = mock_run.call_args[0][0]
+        self.assertEqual(cmd[1:], ["stdin", "stdout", "--dpi", "144", "-l", "eng", "--psm", "6"])
+
+        payload = mock_run.call_args[1]["input"]
+        header = b"P5\n600 800\n255\n"
+        self.assertTrue(payload.startswith(header))
+        self.assertEqual(len(payload), len(header) + 600 * 800)
+        # Blank page renders white
+        self.assertEqual(set(payload[len(header):]), {255})
+
+    @patch('modules.ocr_extractor.subprocess.run')
+    def test_placeholder_image_dpi_is_not_passed(self, mock_run):
+        """An image recording 1 dpi (no resolution tags) is sent without --dpi"""
+        mock_run.return_value = completed("Scanned\n")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "scan.tiff")
+            Image.new("L", (200, 100), 255).save(path, dpi=(1, 1))
+            text = OCRExtractor(tesseract_transport="pipe").extract_from_image(path)
+
+        self.assertEqual(text, "Scanned")
+        self.assertNotIn("--dpi", mock_run.call_args[0][0])
+
+    @patch('modules.ocr_extractor.subprocess.run')
+    def test_tesseract_errors_are_raised(self, mock_run):
+        """A failing tesseract run surfaces as a TesseractError"""
+        mock_run.return_value = completed("", returncode=1)
+
+        ocr = OCRExtractor(tesseract_transport="pipe")
+        with self.assertRaises(pytesseract.TesseractError) as context:
+            ocr.extract_from_pdf(self.pdf_path)
+        self.assertIn("boom", str(context.exception))
+
+    def test_parse_tsv(self):
+        """TSV output is parsed into typed columns"""
+        tsv = (
+            "level\tpage_num\tblock_num\tpar_num\tline_num\tword_num\tleft\ttop\twidth\theight\tconf\ttext\n"
+            "1\t1\t0\t0\t0\t0\t0\t0\t600\t800\t-1\t\n"
+            "5\t1\t1\t1\t1\t1\t10\t20\t30\t12\t96.5\tHello\n"
+        )
+        data = _parse_tsv(tsv)
+
+        self.assertEqual(data["text"], ["", "Hello"])
+        self.assertEqual(data["conf"], [-1.0, 96.5])
+        self.assertEqual(data["left"], [0, 10])
+
+    def test_unknown_transport_is_rejected(self):
+        """Typos in the transport name fail fast"""
+        with self.assertRaises(ValueError):
+            OCRExtractor(tesseract_transport="socket")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+Test the native text-layer fast path for born-digital PDFs using mocks
+"""
+
+import unittest
+from unittest.mock import patch
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from modules.ocr_extractor import OCRExtractor, _is_usable_text_layer
+from ocr_test_utils import make_pdf, make_scanned_pdf
+
+DIGITAL_TEXT = "Photosynthesis converts light energy into chemical energy."
+
+
+class TestTextLayer(unittest.TestCase):
+
+    def setUp(self):
+        # Page 1 is born-digital, page 2 is a "scan" with no text layer
+        self.pdf_path = make_pdf([DIGITAL_TEXT, None])
+
+    def tearDown(self):
+        os.remove(self.pdf_path)
+
+    @patch('modules.ocr_extractor.pytesseract')
+    def test_digital_page_skips_ocr(self, mock_pytesseract):
+        """Only the page without a text layer goes through Tesseract"""
+        mock_pytesseract.image_to_string.return_value = "Scanned page text"
+
+        ocr = OCRExtractor()
+        results = list(ocr.iter_pdf_pages(self.pdf_path))
+
+        self.assertEqual(results[0]["source"], "text_layer")
+        self.assertEqual(results[0]["text"], DIGITAL_TEXT)
+        self.assertEqual(results[1]["source"], "ocr")
+        self.assertEqual(results[1]["text"], "Scanned page text")
+        self.assertEqual(mock_pytesseract.image_to_string.call_count, 1)
+
+    @patch('modules.ocr_extractor.pytesseract')
+    def test_text_layer_can_be_disabled(self, mock_pytesseract):
+        """With use_text_layer=False every page is OCR'd"""
+        mock_pytesseract.image_to_string.return_value = "OCR text"
+
+        ocr = OCRExtractor(use_text_layer=False)
+        result = ocr.extract_from_pdf(self.pdf_path)
+
+        self.assertEqual(result, "OCR text OCR text")
+        self.assertEqual(mock_pytesseract.image_to_string.call_count, 2)
+
+    @patch('modules.ocr_extractor.pytesseract')
+    def test_scan_with_digital_footer_is_ocrd(self, mock_pytesseract):
+        """A short digital line stamped on a full-page scan doesn't stand in for its body"""
+        mock_pytesseract.image_to_string.return_value = "Scanned body text"
+        footer = "Downloaded from the county archive, page 4"
+        full_layer = "\n".join([DIGITAL_TEXT] * 20)
+        pdf_path = make_scanned_pdf([np.full((400, 300), 200, dtype=np.uint8)] * 2, texts={0: footer, 1: full_layer})
+        try:
+            results = list(OCRExtractor().iter_pdf_pages(pdf_path))
+        finally:
+            os.remove(pdf_path)
+
+        self.assertEqual(results[0]["source"], "ocr")
+        self.assertEqual(results[0]["text"], "Scanned body text")
+        # An OCR'd scan's hidden text layer covers the page and is still used
+        self.assertEqual(results[1]["source"], "text_layer")
+        self.assertEqual(mock_pytesseract.image_to_string.call_count, 1)
+
+    def test_broken_text_layers_are_rejected(self):
+        """Empty, too short and garbled text layers fall back to OCR"""
+        self.assertTrue(_is_usable_text_layer(DIGITAL_TEXT, 20))
+        self.assertFalse(_is_usable_text_layer("", 20))
+        self.assertFalse(_is_usable_text_layer("Page 12", 20))
+        self.assertFalse(_is_usable_text_layer("\ufffd" * 30 + "abc", 20))
+        self.assertFalse(_is_usable_text_layer("\ue001\ue002\ue003" * 10, 20))
+        self.assertFalse(_is_usable_text_layer("#$%&*()!@" * 5, 20))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+"""
+Test measuring text size and downscaling oversized images before OCR
+"""
+
+import unittest
+from unittest.mock import patch
+import os
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+from PIL.JpegImagePlugin import JpegImageFile
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from modules.ocr_extractor import OCRExtractor
+from modules.text_scale import estimate_x_height, load_scaled_image
+
+WORDS = "the quick brown fox jumps over a lazy dog and some more words of ordinary text".split()
+
+
+def text_page(font_size, width=2000, height=1400):
+    """Image of random words at a font size, with the x-height of that font"""
+    font = ImageFont.load_default(size=font_size)
+    image = Image.new("L", (width, height), 255)
+    draw = ImageDraw.Draw(image)
+    rng = random.Random(font_size)
+    for top in range(font_size, height - 2 * font_size, 2 * font_size):
+        line = " ".join(rng.choice(WORDS) for _ in range(width // font_size))
+        draw.text((font_size, top), line, font=font, fill=0)
+    x_box = font.getbbox("x")
+    return image, x_box[3] - x_box[1]
+
+
+class TestTextScale(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".jpg")
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_estimate_x_height(self):
+        """The x-height is recovered for small and large text"""
+        for font_size in (24, 48, 96):
+            image, x_height = text_page(font_size, width=3000, height=2000)
+            estimate = estimate_x_height(np.asarray(image))
+            self.assertAlmostEqual(estimate, x_height, delta=max(2, 0.1 * x_height), msg=f"size {font_size}")
+
+    def test_no_text(self):
+        """Blank pages and smooth gradients have no measurable text"""
+        blank = np.full((500, 500), 255, dtype=np.uint8)
+        gradient = np.tile(np.linspace(0, 255, 500).astype(np.uint8), (500, 1))
+        self.assertIsNone(estimate_x_height(blank))
+        self.assertIsNone(estimate_x_height(gradient))
+
+    def test_large_jpeg_is_decoded_small(self):
+        """JPEGs with big text come back at the target x-height, decoded in draft mode"""
+        image, x_height = text_page(100, width=4000, height=3000)
+        image.save(self.path, quality=90)
+
+        with patch.object(JpegImageFile, "draft", autospec=True, side_effect=JpegImageFile.draft) as draft:
+            scaled, scale = load_scaled_image(self.path, 20)
+
+        self.assertTrue(draft.called)
+        self.assertAlmostEqual(scale, 20 / x_height, delta=0.1 * scale)
+        self.assertEqual(scaled.mode, "L")
+        self.assertEqual(scaled.size, (round(4000 * scale), round(3000 * scale)))
+        self.assertAlmostEqual(estimate_x_height(np.asarray(scaled)), 20, delta=3)
+
+    def test_small_text_is_kept(self):
+        """Images whose text is already near the target stay at full size"""
+        image, _ = text_page(24)
+        image.save(self.path, quality=90)
+
+        scaled, scale = load_scaled_image(self.path, 20)
+
+        self.assertEqual(scale, 1.0)
+        self.assertEqual(scaled.size, image.size)
+
+    @patch('modules.ocr_extractor._tesseract_to_string', return_value="text")
+    def test_extract_from_image_downscales(self, mock_string):
+        """Tesseract gets the downscaled image and a matching DPI"""
+        image, x_height = text_page(80, width=3000, height=2000)
+        image.save(self.path, quality=90, dpi=(600, 600))
+
+        ocr = OCRExtractor(target_x_height=20, tesseract_transport="pipe")
+        self.assertEqual(ocr.extract_from_image(self.path), "text")
+
+        gray, dpi, _ = mock_string.call_args[0]
+        scale = gray.shape[1] / 3000
+        self.assertLess(scale, 0.5)
+        self.assertAlmostEqual(dpi, 600 * scale, delta=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+"""
+Test multi-frame TIFF extraction using mocks
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from modules.ocr_cache import OCRCache
+from modules.ocr_extractor import OCRExtractor
+from modules.tiff_document import TiffDocument
+
+
+def make_tiff(frames=3, dpi=(200, 200), size=(400, 500)) -> str:
+    """Write a multi-frame grayscale TIFF to a temp file and return its path"""
+    images = [Image.fromarray(np.full(size[::-1], 255 - 10 * i, dtype=np.uint8)) for i in range(frames)]
+    with tempfile.NamedTemporaryFile(suffix=".tiff", delete=False) as f:
+        path = f.name
+    images[0].save(path, save_all=True, append_images=images[1:], dpi=dpi)
+    return path
+
+
+def fake_tesseract(cmd, input, **kwargs):
+    """Stand-in for tesseract: one line per frame, naming the frame's grey level"""
+    image = Image.open(BytesIO(input))
+    texts = []
+    for n in range(getattr(image, "n_frames", 1)):
+        image.seek(n)
+        texts.append(f"Shade {np.asarray(image.convert('L'))[0, 0]}\n\f")
+    return MagicMock(returncode=0, stdout="".join(texts).encode("utf-8"), stderr=b"")
+
+
+class TestTiffPages(unittest.TestCase):
+
+    def setUp(self):
+        self.tiff_path = make_tiff()
+
+    def tearDown(self):
+        os.remove(self.tiff_path)
+
+    def test_frames_as_pages(self):
+        """Frames are indexed like pdfium pages, sized in points at their own resolution"""
+        doc = TiffDocument(self.tiff_path)
+        try:
+            self.assertEqual(len(doc), 3)
+            frame = doc[2]
+            self.assertEqual(frame.get_size(), (144.0, 180.0))
+            self.assertEqual(frame.get_textpage().get_text_range(), "")
+            bitmap = frame.render(scale=1.0)
+            self.assertEqual(bitmap.to_numpy().shape, (180, 144))
+            self.assertEqual(bitmap.to_numpy()[0, 0], 235)
+            with self.assertRaises(IndexError):
+                doc[3]
+        finally:
+            doc.close()
+
+    def test_fax_resolution_is_evened_out(self):
+        """Fine-mode fax frames (204 x 98 dpi) come out with square pixels"""
+        path = make_tiff(frames=2, dpi=(204, 98), size=(1728, 1100))
+        try:
+            doc = TiffDocument(path)
+            image = doc[0].render(scale=200 / 72).to_numpy()
+            doc.close()
+        finally:
+            os.remove(path)
+
+        self.assertEqual(image.shape, (round(1100 / 98 * 200), round(1728 / 204 * 200)))
+
+    def test_missing_resolution_uses_default(self):
+        """Frames without resolution tags (read back as 1 dpi) get the default"""
+        path = make_tiff(frames=2, dpi=(1, 1))
+        try:
+            doc = TiffDocument(path, default_dpi=200)
+            frame = doc[1]
+            doc.close()
+        finally:
+            os.remove(path)
+
+        self.assertEqual(frame.dpi, (200.0, 200.0))
+        self.assertEqual(frame.get_size(), (144.0, 180.0))
+
+    @patch('modules.ocr_extractor.subprocess.run', side_effect=fake_tesseract)
+    def test_frames_stream_in_batches(self, mock_run):
+        """Frames go through the page pipeline, batched into Tesseract runs"""
+        ocr = OCRExtractor(dpi=72, batch_size=2, tesseract_transport="pipe")
+        results = list(ocr.iter_pdf_pages(self.tiff_path))
+
+        self.assertEqual([r["text"] for r in results], ["Shade 255", "Shade 245", "Shade 235"])
+        self.assertEqual([r["source"] for r in results], ["ocr"] * 3)
+        self.assertEqual(mock_run.call_count, 2)
+        self.assertEqual(ocr.last_stats["document_pages"], 3)
+
+    @patch('modules.ocr_extractor.ProcessPoolExecutor', ThreadPoolExecutor)
+    @patch('modules.ocr_extractor.subprocess.run', side_effect=fake_tesseract)
+    def test_frames_in_parallel(self, mock_run):
+        """Frames are shared out across workers and come back in order"""
+        ocr = OCRExtractor(dpi=72, num_workers=3, tesseract_transport="pipe")
+        results = list(ocr.iter_pdf_pages(self.tiff_path, pages=[0, 2]))
+
+        self.assertEqual([r["page"] for r in results], [0, 2])
+        self.assertEqual([r["text"] for r in results], ["Shade 255", "Shade 235"])
+
+    @patch('modules.ocr_extractor.subprocess.run', side_effect=fake_tesseract)
+    def test_frames_are_cached(self, mock_run):
+        """Frames seen before come from the OCR cache"""
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = OCRCache(os.path.join(tmp, "cache.sqlite3"))
+            ocr = OCRExtractor(dpi=72, batch_size=3, tesseract_transport="pipe", cache=cache)
+            first = ocr.extract_text(self.tiff_path)
+            second = ocr.extract_text(self.tiff_path)
+            cache.close()
+
+        self.assertEqual(first, "Shade 255 Shade 245 Shade 235")
+        self.assertEqual(second, first)
+        self.assertEqual(mock_run.call_count, 1)
+        self.assertEqual(ocr.last_stats["cached_pages"], 3)
+
+    @patch('modules.ocr_extractor.subprocess.run', side_effect=fake_tesseract)
+    def test_extract_from_image_reads_every_frame(self, mock_run):
+        """extract_from_image no longer stops at the first frame"""
+        ocr = OCRExtractor(dpi=72, batch_size=3, tesseract_transport="pipe")
+        self.assertEqual(ocr.extract_from_image(self.tiff_path), "Shade 255 Shade 245 Shade 235")
+
+
+    @patch('modules.ocr_extractor.subprocess.run', side_effect=fake_tesseract)
+    def test_native_images_setting_is_ignored(self, mock_run):
+        """Frames are rendered as usual with the embedded-image shortcut on"""
+        ocr = OCRExtractor(dpi=72, batch_size=3, tesseract_transport="pipe", native_images=True)
+        results = list(ocr.iter_pdf_pages(self.tiff_path))
+
+        self.assertEqual([r["text"] for r in results], ["Shade 255", "Shade 245", "Shade 235"])
+        self.assertEqual([r["dpi"] for r in results], [72] * 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+"""
+Test columnar word-box results using mocks
+"""
+
+import unittest
+from unittest.mock import patch
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from modules.ocr_cache import OCRCache
+from modules.ocr_extractor import OCRExtractor
+from modules.word_boxes import WordBoxes
+from ocr_test_utils import make_blank_pdf
+
+
+def tesseract_data(lines, confidence=90):
+    """
+    Build image_to_data-style output
+
+    Args:
+        lines: List of (block, paragraph, line, words) tuples
+    """
+    data = {key: [] for key in [
+        "level", "block_num", "par_num", "line_num", "left", "top", "width", "height", "conf", "text"
+    ]}
+
+    def add(level, block, par, line, left, top, conf, text):
+        for key, value in zip(data, [level, block, par, line, left, top, 40, 20, conf, text]):
+            data[key].append(value)
+
+    for row, (block, par, line, words) in enumerate(lines):
+        # Line row, then one row per word
+        add(4, block, par, line, 0, row * 30, -1, "")
+        for col, word in enumerate(words):
+            add(5, block, par, line, col * 50, row * 30, confidence, word)
+    return data
+
+
+class TestWordBoxes(unittest.TestCase):
+
+    def setUp(self):
+        self.data = tesseract_data([
+            (1, 1, 1, ["Hello", "world"]),
+            (1, 1, 2, ["second", "line"]),
+            (1, 2, 1, ["new", "paragraph"]),
+            (2, 1, 1, ["  ", "block"]),
+        ])
+
+    def test_columns_and_text(self):
+        """Words share one text string and each column has one entry per word"""
+        words = WordBoxes.from_tesseract(self.data, page=3)
+
+        self.assertEqual(words.text, "Hello world second line new paragraph block")
+        self.assertEqual(len(words), 7)
+        self.assertEqual(words.words()[2], "second")
+        self.assertEqual(words.word(6), "block")
+        self.assertEqual(words.page.tolist(), [3] * 7)
+        self.assertEqual(words.block.tolist(), [1, 1, 1, 1, 1, 1, 2])
+        self.assertEqual(words.bbox.shape, (7, 4))
+        self.assertEqual(words.bbox.dtype, np.float32)
+
+    def test_lines_are_numbered_across_paragraphs(self):
+        """Line numbers run through the page even when Tesseract restarts them"""
+        words = WordBoxes.from_tesseract(self.data)
+
+        self.assertEqual(words.line.tolist(), [0, 0, 1, 1, 2, 2, 3])
+        self.assertEqual(words.lines(), ["Hello world", "second line", "new paragraph", "block"])
+
+    def test_scale_and_origin(self):
+        """Boxes are shifted by the crop origin and scaled to page units"""
+        words = WordBoxes.from_tesseract(self.data, scale=0.5, origin=(10, 100))
+
+        # "world": left 50, top 0, 40x20 pixels
+        self.assertEqual(words.bbox[1].tolist(), [30, 50, 20, 10])
+
+    def test_concat_keeps_offsets_consistent(self):
+        """Concatenated pages have valid offsets and can be split again"""
+        first = WordBoxes.from_tesseract(tesseract_data([(1, 1, 1, ["Page", "one"])]), page=0)
+        second = WordBoxes.from_tesseract(tesseract_data([(1, 1, 1, ["Page", "two"])]), page=2)
+        words = WordBoxes.concat([first, None, WordBoxes.empty(), second])
+
+        self.assertEqual(words.text, "Page one Page two")
+        self.assertEqual(words.words(), ["Page", "one", "Page", "two"])
+        self.assertEqual(words.lines(), ["Page one", "Page two"])
+        self.assertEqual(words.for_page(2).text, "Page two")
+        self.assertEqual(words.for_page(2).start.tolist(), [0, 5])
+        self.assertEqual(len(words.for_page(1)), 0)
+
+    def test_find_span(self):
+        """Character spans map back to the words that cover them"""
+        words = WordBoxes.from_tesseract(self.data)
+        start = words.text.index("line new")
+
+        self.assertEqual(words.find(start, start + len("line new")).tolist(), [3, 4])
+
+    def test_dict_round_trip(self):
+        """to_dict output rebuilds the same word boxes"""
+        words = WordBoxes.from_tesseract(self.data, page=1)
+        rebuilt = WordBoxes.from_dict(words.to_dict())
+
+        self.assertEqual(rebuilt.text, words.text)
+        np.testing.assert_array_equal(rebuilt.bbox, words.bbox)
+        np.testing.assert_array_equal(rebuilt.line, words.line)
+
+
+class TestWordBoxExtraction(unittest.TestCase):
+
+    def setUp(self):
+        self.pdf_path = make_blank_pdf(2)
+
+    def tearDown(self):
+        os.remove(self.pdf_path)
+
+    @patch('modules.ocr_extractor.pytesseract')
+    def test_pages_carry_word_boxes(self, mock_pytesseract):
+        """With word boxes on, OCR'd pages keep their positions in PDF points"""
+        mock_pytesseract.image_to_data.return_value = tesseract_data([(1, 1, 1, ["Some", "words"])])
+
+        ocr = OCRExtractor(dpi=144, word_boxes=True)
+        words = ocr.extract_word_boxes(self.pdf_path)
+
+        self.assertEqual(words.text, "Some words Some words")
+        self.assertEqual(words.page.tolist(), [0, 0, 1, 1])
+        # 144 dpi pixels are half a PDF point
+        self.assertEqual(words.bbox[1].tolist(), [25, 0, 20, 10])
+        mock_pytesseract.image_to_string.assert_not_called()
+
+    @patch('modules.ocr_extractor.pytesseract')
+    def test_word_boxes_off_by_default(self, mock_pytesseract):
+        """Page results don't carry word boxes unless asked for"""
+        mock_pytesseract.image_to_string.return_value = "Some words"
+
+        ocr = OCRExtractor()
+        result = next(ocr.iter_pdf_pages(self.pdf_path))
+
+        self.assertIsNone(result["words"])
+        with self.assertRaises(ValueError):
+            ocr.extract_word_boxes(self.pdf_path)
+
+    @patch('modules.ocr_extractor.pytesseract')
+    def test_word_boxes_survive_the_cache(self, mock_pytesseract):
+        """Cached pages come back with their word boxes"""
+        mock_pytesseract.image_to_data.return_value = tesseract_data([(1, 1, 1, ["Cached"])])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = OCRCache(os.path.join(tmp, "cache.sqlite3"))
+            ocr = OCRExtractor(word_boxes=True, cache=cache)
+            first = ocr.extract_word_boxes(self.pdf_path)
+            second = ocr.extract_word_boxes(self.pdf_path)
+            cache.close()
+
+        self.assertEqual(mock_pytesseract.image_to_data.call_count, 2)
+        self.assertEqual(ocr.last_stats["cached_pages"], 2)
+        self.assertEqual(second.text, first.text)
+        np.testing.assert_array_equal(second.bbox, first.bbox)
+
+
+if __name__ == '__main__':
+    unittest.main()